@@ -6,21 +6,31 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import io
-import re
-import requests
+import os
 import time
-from bs4 import BeautifulSoup
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
 import warnings
 warnings.filterwarnings('ignore')
 
+from consultor_uff import AjustesConsulta, CacheHTTP, HistoricoVagas, OpcoesConsulta
+from consultor_uff.consultor import MOTORES_CONSULTA, ConsultorQuadroHorariosUFFDetalhado
+from consultor_uff.excel import gerar_excel_completo
+from consultor_uff.exportacao import FORMATOS_EXPORTACAO, formato_disponivel, gerar_exportacao
+from consultor_uff.extrator_lxml import EXTRATOR_PADRAO, EXTRATORES
+from consultor_uff.filtros import IndiceResultado
+from consultor_uff.resultados import RegistrosColunares, montar_dataframe_resultado
+from consultor_uff.validacao import (
+    MAX_PERIODOS_INTERVALO, descrever_periodos, formatar_periodo, intervalo_periodos, validar_codigo_disciplina,
+    validar_departamento, validar_periodo
+)
+
+# Máximo do controle de requisições simultâneas (também o pool de conexões do consultor compartilhado)
+MAX_REQUISICOES_SIMULTANEAS = 16
+
 # ===== CONFIGURAÇÃO DA PÁGINA =====
 st.set_page_config(
     page_title="Consultor de Vagas e Excedentes UFF - Química",
@@ -301,6 +311,10 @@ if 'processando' not in st.session_state:
     st.session_state.processando = False
 if 'resultado_disponivel' not in st.session_state:
     st.session_state.resultado_disponivel = False
+if 'registros_parciais' not in st.session_state:
+    st.session_state.registros_parciais = None
+if 'consulta_interrompida' not in st.session_state:
+    st.session_state.consulta_interrompida = False
 if 'periodo_selecionado' not in st.session_state:
     st.session_state.periodo_selecionado = None
 if 'apenas_cursos_quimica' not in st.session_state:
@@ -308,795 +322,235 @@ if 'apenas_cursos_quimica' not in st.session_state:
 if 'mostrar_outros_cursos' not in st.session_state:
     st.session_state.mostrar_outros_cursos = False
 
-# ===== CLASSE DE CONSULTA UFF DETALHADA =====
-class ConsultorQuadroHorariosUFFDetalhado:
-    def __init__(self, apenas_cursos_quimica=True, mostrar_outros_cursos=False, cursos_selecionados=None):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
-        self.base_url = "https://app.uff.br/graduacao/quadrodehorarios/"
-        self.cache = {}
-        self.apenas_cursos_quimica = apenas_cursos_quimica
-        self.mostrar_outros_cursos = mostrar_outros_cursos
-        self.cursos_selecionados = cursos_selecionados or ['Química', 'Química Industrial']
-        
-        # Mapeamento de cursos expandido
-        self.ids_cursos = {
-            'Química': '28',
-            'Química Industrial': '29',
-            'Engenharia Química': '27',
-            'Farmácia': '15'
-        }
-        
-        self.cores_cursos = {
-            'Química': 'FFE6CC',
-            'Química Industrial': 'E6F3FF',
-            'Engenharia Química': 'E6FFE6',
-            'Farmácia': 'FFE6FF'
-        }
-        
-        # Códigos de cursos para filtro - inclui todos os cursos selecionados
-        self.codigos_cursos_filtro = self._gerar_codigos_filtro()
-    
-    def _gerar_codigos_filtro(self):
-        """Gera lista de códigos de curso para filtro baseado nos cursos selecionados"""
-        # Retorna apenas os códigos numéricos dos cursos selecionados
-        mapeamento = {
-            'Química': '028',
-            'Química Industrial': '029',
-            'Engenharia Química': '027',
-            'Farmácia': '015'
-        }
-        codigos = []
-        for curso in self.cursos_selecionados:
-            if curso in mapeamento:
-                codigos.append(mapeamento[curso])
-        return codigos
-    
-    def fazer_request(self, url, use_cache=True):
-        """Faz uma requisição HTTP com cache"""
-        cache_key = url
-        if use_cache and cache_key in self.cache:
-            if time.time() - self.cache[cache_key]['timestamp'] < 300:
-                return self.cache[cache_key]['response']
-        
-        try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            if use_cache:
-                self.cache[cache_key] = {
-                    'response': response,
-                    'timestamp': time.time()
-                }
-            
-            return response
-        except Exception as e:
-            st.warning(f"⚠️ Erro ao acessar {url}: {e}")
-            return None
-    
-    def construir_url_busca(self, id_curso, departamento=None, periodo='20252', codigo_disciplina=None):
-        """Constrói URL de busca para o quadro de horários"""
-        params = {
-            'utf8': '✓',
-            'q[anosemestre_eq]': periodo,
-            'q[disciplina_cod_departamento_eq]': '',
-            'button': '',
-            'q[idturno_eq]': '',
-            'q[idlocalidade_eq]': '',
-            'q[vagas_turma_curso_idcurso_eq]': id_curso,
-            'q[disciplina_disciplinas_curriculos_idcurriculo_eq]': '',
-            'q[curso_ferias_eq]': '',
-            'q[idturmamodalidade_eq]': ''
-        }
-        
-        # Se for código de disciplina específico (3 letras + 5 números)
-        if codigo_disciplina:
-            params['q[disciplina_nome_or_disciplina_codigo_cont]'] = codigo_disciplina.strip().upper()
-        elif departamento and departamento.strip() and departamento != 'TODOS':
-            params['q[disciplina_nome_or_disciplina_codigo_cont]'] = f"{departamento.strip().upper()}00"
-        else:
-            params['q[disciplina_nome_or_disciplina_codigo_cont]'] = ''
-        
-        url_parts = [f"{key}={value}" for key, value in params.items()]
-        return self.base_url + "?" + "&".join(url_parts)
-    
-    def extrair_links_turmas_pagina(self, html_content):
-        """Extrai links para páginas detalhadas das turmas"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        links = []
-        
-        tabela = soup.find('table', class_='table')
-        if tabela:
-            for link in tabela.find_all('a', href=True):
-                href = link['href']
-                if '/turmas/' in href:
-                    full_url = href if href.startswith('http') else f"https://app.uff.br{href}"
-                    links.append(full_url)
-        else:
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if '/turmas/' in href and href not in links:
-                    full_url = href if href.startswith('http') else f"https://app.uff.br{href}"
-                    links.append(full_url)
-        
-        return list(set(links))
-    
-    def navegar_paginas(self, url_inicial, nome_curso):
-        """Navega por todas as páginas de resultados"""
-        todos_links = []
-        pagina_atual = 1
-        
-        status_placeholder = st.empty()
-        
-        while True:
-            url_pagina = f"{url_inicial}&page={pagina_atual}" if pagina_atual > 1 else url_inicial
-            status_placeholder.text(f"📄 Buscando página {pagina_atual}...")
-            
-            response = self.fazer_request(url_pagina)
-            
-            if not response:
-                break
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            links_pagina = self.extrair_links_turmas_pagina(response.content)
-            
-            if not links_pagina:
-                break
-            
-            todos_links.extend(links_pagina)
-            
-            pagination = soup.find('ul', class_='pagination')
-            if not pagination:
-                break
-                
-            next_disabled = pagination.find('li', class_='next disabled')
-            if next_disabled:
-                break
-            
-            pagina_atual += 1
-            time.sleep(0.5)
-        
-        status_placeholder.empty()
-        return list(set(todos_links))
-    
-    def extrair_horarios_turma(self, soup):
-        """Extrai horários da turma"""
-        try:
-            secao_horarios = None
-            for h in soup.find_all(['h2', 'h3', 'h4', 'h5', 'strong', 'b']):
-                texto = h.get_text(strip=True).lower()
-                if 'horários' in texto and 'turma' in texto:
-                    secao_horarios = h
-                    break
-            
-            if secao_horarios:
-                proximo_elemento = secao_horarios.find_next(['table', 'div'])
-                if proximo_elemento and proximo_elemento.name == 'table':
-                    tabela_horarios = proximo_elemento
-                else:
-                    tabela_horarios = secao_horarios.find_next('table')
-                
-                if tabela_horarios:
-                    horarios = []
-                    dias_semana = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
-                    
-                    linhas = tabela_horarios.find_all('tr')
-                    if len(linhas) >= 2:
-                        linha_horarios = linhas[1]
-                        colunas = linha_horarios.find_all(['td', 'th'])
-                        
-                        for i, coluna in enumerate(colunas):
-                            if i >= len(dias_semana):
-                                break
-                            texto = coluna.get_text(strip=True)
-                            if texto and texto not in dias_semana:
-                                horarios.append(f"{dias_semana[i]}: {texto}")
-                    
-                    return ' | '.join(horarios) if horarios else 'Não informado'
-        except Exception as e:
-            pass
-        
-        return 'Não informado'
-    
-    def extrair_vagas_detalhadas(self, soup, curso_origem):
-        """Extrai vagas detalhadas da turma - CORRIGIDO PARA OUTROS CURSOS"""
-        try:
-            tabela_vagas = None
-            
-            for elemento in soup.find_all(['h2', 'h3', 'h4', 'h5', 'strong', 'b']):
-                texto = elemento.get_text(strip=True).lower()
-                if 'vagas' in texto and 'alocadas' in texto:
-                    for proximo in elemento.find_next_siblings():
-                        if proximo.name == 'table':
-                            tabela_vagas = proximo
-                            break
-                    if not tabela_vagas:
-                        tabela_vagas = elemento.find_next('table')
-                    break
-            
-            if not tabela_vagas:
-                for tabela in soup.find_all('table'):
-                    texto_tabela = tabela.get_text(strip=True).lower()
-                    if 'vagas' in texto_tabela and ('reg' in texto_tabela or 'vest' in texto_tabela):
-                        tabela_vagas = tabela
-                        break
-            
-            if not tabela_vagas:
-                return []
-            
-            vagas_encontradas = []
-            linhas = tabela_vagas.find_all('tr')
-            
-            for linha in linhas:
-                colunas = linha.find_all(['td', 'th'])
-                
-                # Verificar se é linha de dados (precisa de pelo menos 4 colunas numéricas)
-                if len(colunas) >= 4:
-                    # A primeira coluna geralmente contém "código - nome do curso"
-                    primeira_coluna = colunas[0].get_text(strip=True) if colunas else ""
-                    
-                    # Padrão esperado: "028 - Química" ou "029 - Química Industrial"
-                    match_curso = re.match(r'^(\d{3})\s*-\s*(.+)$', primeira_coluna)
-                    
-                    if match_curso:
-                        codigo_curso = match_curso.group(1)
-                        nome_curso = match_curso.group(2).strip()
-                        curso_completo = f"{codigo_curso} - {nome_curso}"
-                    else:
-                        # Tentar extrair código de 3 dígitos de outra forma
-                        codigo_match = re.search(r'\b(\d{3})\b', primeira_coluna)
-                        if codigo_match:
-                            codigo_curso = codigo_match.group(1)
-                            # Verificar se há nome após o código
-                            resto = primeira_coluna.replace(codigo_curso, '').strip()
-                            resto = re.sub(r'^[\s\-]+', '', resto).strip()
-                            if resto and not resto.isdigit():
-                                nome_curso = resto
-                                curso_completo = f"{codigo_curso} - {nome_curso}"
-                            else:
-                                # Usar mapeamento de nomes conhecidos
-                                nomes_conhecidos = {
-                                    '028': 'Química',
-                                    '029': 'Química Industrial',
-                                    '027': 'Engenharia Química',
-                                    '015': 'Farmácia',
-                                    '025': 'Física',
-                                    '020': 'Matemática',
-                                    '041': 'Engenharia de Telecomunicações',
-                                    '042': 'Engenharia de Produção',
-                                    '043': 'Engenharia Civil',
-                                    '044': 'Engenharia Mecânica',
-                                    '045': 'Engenharia Elétrica',
-                                }
-                                nome_curso = nomes_conhecidos.get(codigo_curso, f"Curso {codigo_curso}")
-                                curso_completo = f"{codigo_curso} - {nome_curso}"
-                        else:
-                            continue
-                    
-                    # Extrair números das demais colunas (vagas, inscritos, etc.)
-                    numeros = []
-                    for i, col in enumerate(colunas[1:], 1):  # Pular primeira coluna (curso)
-                        texto_col = col.get_text(strip=True)
-                        # Extrair números individuais
-                        nums = re.findall(r'\b(\d+)\b', texto_col)
-                        for n in nums:
-                            numeros.append(int(n))
-                    
-                    if len(numeros) >= 4:
-                        try:
-                            vagas_reg = numeros[0] if len(numeros) > 0 else 0
-                            vagas_vest = numeros[1] if len(numeros) > 1 else 0
-                            inscritos_reg = numeros[2] if len(numeros) > 2 else 0
-                            inscritos_vest = numeros[3] if len(numeros) > 3 else 0
-                            
-                            excedentes = 0
-                            candidatos = 0
-                            
-                            if len(numeros) >= 6:
-                                excedentes = numeros[4] if len(numeros) > 4 else 0
-                                candidatos = numeros[5] if len(numeros) > 5 else 0
-                            
-                            # Aplicar filtros - usa comparacao exata de codigos
-                            incluir_curso = False
-                            
-                            if self.mostrar_outros_cursos:
-                                incluir_curso = True
-                            elif self.apenas_cursos_quimica:
-                                # Comparacao exata: codigo do curso deve estar na lista de codigos permitidos
-                                codigo_padrao = codigo_curso.zfill(3)
-                                if codigo_padrao in self.codigos_cursos_filtro:
-                                    incluir_curso = True
-                            else:
-                                incluir_curso = True
-                            
-                            if incluir_curso:
-                                if excedentes == 0 and candidatos > 0 and vagas_reg > 0:
-                                    if candidatos > vagas_reg:
-                                        excedentes = candidatos - vagas_reg
-                                
-                                vaga_info = {
-                                    'curso': curso_completo,
-                                    'vagas_reg': vagas_reg,
-                                    'vagas_vest': vagas_vest,
-                                    'inscritos_reg': inscritos_reg,
-                                    'inscritos_vest': inscritos_vest,
-                                    'excedentes': excedentes,
-                                    'candidatos': candidatos,
-                                    'vagas_disponiveis_reg': max(0, vagas_reg - inscritos_reg),
-                                    'vagas_disponiveis_vest': max(0, vagas_vest - inscritos_vest),
-                                    'total_vagas': vagas_reg + vagas_vest,
-                                    'total_inscritos': inscritos_reg + inscritos_vest,
-                                    'total_vagas_disponiveis': max(0, (vagas_reg - inscritos_reg) + (vagas_vest - inscritos_vest))
-                                }
-                                vagas_encontradas.append(vaga_info)
-                        except Exception as e:
-                            continue
-            
-            return vagas_encontradas
-            
-        except Exception as e:
-            return []
+# ===== CONSULTOR COMPARTILHADO ENTRE SESSÕES =====
+@st.cache_resource(show_spinner=False)
+def obter_cache_paginas():
+    """Cache de páginas único por processo do servidor"""
+    return CacheHTTP()
+
+@st.cache_resource(show_spinner=False)
+def obter_historico():
+    """Histórico de consultas único por processo do servidor"""
+    return HistoricoVagas()
+
+@st.cache_resource(show_spinner=False)
+def obter_consultor(motor='sync', extrator=EXTRATOR_PADRAO):
+    """Consultor thread-safe reutilizado por todas as sessões e reruns do servidor"""
+    # Só motor e extrator criam outra instância (no máximo quatro). Os controles de concorrência
+    # chegam a cada consulta como AjustesConsulta, sem mexer nas consultas de outras sessões;
+    # o pool de conexões é dimensionado para o máximo do controle de requisições simultâneas
+    return ConsultorQuadroHorariosUFFDetalhado(
+        motor=motor,
+        extrator=extrator,
+        max_concorrencia=MAX_REQUISICOES_SIMULTANEAS,
+        cache_http=obter_cache_paginas()
+    )
+
+@st.cache_resource(show_spinner=False)
+def obter_executor_exportacao():
+    """Thread de fundo que monta as planilhas enquanto a página é desenhada"""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='exportacao_excel')
+
+def exportacao_excel(df, periodo_formatado):
+    """Future com o Excel do resultado atual; montado uma vez por resultado e reaproveitado nos reruns"""
+    # O DataFrame do resultado só é trocado por uma nova consulta, então a identidade basta como chave
+    atual = st.session_state.get('exportacao_excel')
+    if atual is None or atual[0] is not df or atual[1] != periodo_formatado:
+        atual = (df, periodo_formatado,
+                 obter_executor_exportacao().submit(gerar_excel_completo, df, periodo_formatado))
+        st.session_state.exportacao_excel = atual
+    return atual[2]
+
+def exportacao_colunar(df, formato):
+    """Bytes do resultado atual em Parquet, Arrow ou CSV; gerados uma vez por resultado e formato"""
+    atual = st.session_state.get('exportacoes_colunares')
+    if atual is None or atual[0] is not df:
+        atual = (df, {})
+        st.session_state.exportacoes_colunares = atual
+    arquivos = atual[1]
+    if formato not in arquivos:
+        arquivos[formato] = gerar_exportacao(df, formato).getvalue()
+    return arquivos[formato]
+
+class ExibidorEventos:
+    """Traduz os eventos da consulta em avisos, barras de progresso e resultados parciais do Streamlit"""
+    
+    def __init__(self, registros=None, ao_lote=None, intervalo_lote=1.5):
+        # Uma barra com texto de status por nível ('consulta', 'busca' e uma por período com vários
+        # períodos em paralelo), criada no primeiro progresso
+        self.barras = {}
+        # Registros recebidos até agora (em colunas compactas); ao_lote(registros) redesenha a prévia
+        # a cada intervalo_lote segundos
+        self.registros = registros if registros is not None else RegistrosColunares()
+        self.ao_lote = ao_lote
+        self.intervalo_lote = intervalo_lote
+        self._ultimo_lote = 0.0
+    
+    def __call__(self, evento):
+        if evento.tipo == 'registros':
+            self.registros.adicionar_varios(evento.registros)
+            if self.ao_lote and time.monotonic() - self._ultimo_lote >= self.intervalo_lote:
+                self.ao_lote(self.registros)
+                self._ultimo_lote = time.monotonic()
+        elif evento.tipo == 'info':
+            st.info(evento.mensagem)
+        elif evento.tipo == 'aviso':
+            st.warning(evento.mensagem)
+        elif evento.tipo == 'nota':
+            st.caption(evento.mensagem)
+        elif evento.tipo == 'progresso':
+            chave = (evento.nivel, evento.periodo)
+            if chave not in self.barras:
+                self.barras[chave] = (st.progress(0), st.empty())
+            progress_bar, status_text = self.barras[chave]
+            if evento.mensagem:
+                status_text.text(evento.mensagem)
+            if evento.fracao is not None:
+                progress_bar.progress(min(1.0, evento.fracao))
+        elif evento.tipo == 'fim' and (evento.nivel, evento.periodo) in self.barras:
+            progress_bar, status_text = self.barras.pop((evento.nivel, evento.periodo))
+            progress_bar.empty()
+            status_text.empty()
+
+# ===== FUNÇÕES AUXILIARES =====
+def exibir_resultados_parciais(area, registros):
+    """Prévia dos resultados enquanto a consulta ainda está em andamento"""
+    df = montar_dataframe_resultado(registros)
+    with area.container():
+        st.markdown(f"**⏳ Resultados parciais** ({len(df)} registros até agora)")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total de Turmas", len(df))
+        with col2:
+            st.metric("Turmas com Vagas", int((df['total_vagas_disponiveis'] > 0).sum()))
+        with col3:
+            st.metric("Total de Excedentes", df['excedentes'].sum())
+        st.dataframe(
+            df[['periodo', 'codigo_disciplina', 'nome_disciplina', 'turma', 'curso_vaga',
+                'vagas_disponiveis_reg', 'vagas_disponiveis_vest', 'excedentes']],
+            use_container_width=True,
+            hide_index=True,
+            height=250
+        )
+
+def montar_visualizacoes(df):
+    """Agregações e figuras das abas de visualização, calculadas de uma vez e sem elementos do Streamlit"""
+    inicio = time.perf_counter()
+    painel = {
+        'total_turmas': len(df),
+        'turmas_com_vagas': len(df[df['total_vagas_disponiveis'] > 0]),
+        'total_vagas_disp': df['total_vagas_disponiveis'].sum(),
+        'total_excedentes': df['excedentes'].sum(),
+        'fig_vagas_curso': None,
+        'depto_ranking': None,
+        'fig_departamentos': None,
+        'excedentes': None,
+    }
     
-    def extrair_dados_turma_detalhado(self, url_turma, curso_origem, periodo, departamento_busca=None):
-        """Extrai dados detalhados de uma turma específica"""
-        try:
-            response = self.fazer_request(url_turma)
-            if not response:
-                return []
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            titulo = soup.find('h1')
-            codigo_disciplina = ''
-            nome_disciplina = ''
-            turma = ''
-            departamento = ''
-            
-            if titulo:
-                texto_titulo = titulo.get_text(strip=True)
-                padroes = [
-                    r'Turma\s+(\S+)\s+de\s+(\S+)\s+-\s+(.+)',
-                    r'(\S+)\s+-\s+(.+)\s+-\s+Turma\s+(\S+)',
-                    r'(.+?)\s*-\s*Turma\s+(\S+)'
-                ]
-                
-                for padrao in padroes:
-                    match = re.search(padrao, texto_titulo)
-                    if match:
-                        if 'Turma' in padrao and 'de' in padrao:
-                            turma = match.group(1)
-                            codigo_disciplina = match.group(2)
-                            nome_disciplina = match.group(3)
-                        elif 'Turma' in padrao:
-                            codigo_disciplina = match.group(1)
-                            nome_disciplina = match.group(2)
-                            turma = match.group(3) if len(match.groups()) > 2 else ''
-                        break
-                
-                if not codigo_disciplina:
-                    partes = texto_titulo.split(' - ')
-                    if len(partes) >= 2:
-                        primeira_parte = partes[0]
-                        if 'Turma' in primeira_parte:
-                            turma_match = re.search(r'Turma\s+(\S+)', primeira_parte)
-                            if turma_match:
-                                turma = turma_match.group(1)
-                                if len(partes) > 1:
-                                    segunda_parte = partes[1]
-                                    if len(segunda_parte.split()) > 1:
-                                        partes_codigo = segunda_parte.split()
-                                        codigo_disciplina = partes_codigo[0]
-                                        nome_disciplina = ' '.join(partes_codigo[1:]) if len(partes_codigo) > 1 else segunda_parte
-                        
-                departamento = codigo_disciplina[:3] if len(codigo_disciplina) >= 3 else ''
-            
-            if departamento_busca and departamento_busca != 'TODOS' and departamento != departamento_busca:
-                return []
-            
-            horarios = self.extrair_horarios_turma(soup)
-            vagas_detalhadas = self.extrair_vagas_detalhadas(soup, curso_origem)
-            
-            if not vagas_detalhadas:
-                if self.apenas_cursos_quimica and not self.mostrar_outros_cursos:
-                    return []
-                
-                registro_basico = {
-                    'periodo': periodo,
-                    'departamento': departamento,
-                    'codigo_disciplina': codigo_disciplina,
-                    'nome_disciplina': nome_disciplina,
-                    'turma': turma,
-                    'horarios': horarios,
-                    'curso_origem_busca': curso_origem,
-                    'curso_vaga': curso_origem,
-                    'vagas_reg': 0,
-                    'vagas_vest': 0,
-                    'inscritos_reg': 0,
-                    'inscritos_vest': 0,
-                    'excedentes': 0,
-                    'candidatos': 0,
-                    'vagas_disponiveis_reg': 0,
-                    'vagas_disponiveis_vest': 0,
-                    'total_vagas': 0,
-                    'total_inscritos': 0,
-                    'total_vagas_disponiveis': 0,
-                    'url': url_turma
-                }
-                return [registro_basico]
-            
-            registros = []
-            for vaga in vagas_detalhadas:
-                registro = {
-                    'periodo': periodo,
-                    'departamento': departamento,
-                    'codigo_disciplina': codigo_disciplina,
-                    'nome_disciplina': nome_disciplina,
-                    'turma': turma,
-                    'horarios': horarios,
-                    'curso_origem_busca': curso_origem,
-                    'curso_vaga': vaga['curso'],
-                    'vagas_reg': vaga['vagas_reg'],
-                    'vagas_vest': vaga['vagas_vest'],
-                    'inscritos_reg': vaga['inscritos_reg'],
-                    'inscritos_vest': vaga['inscritos_vest'],
-                    'excedentes': vaga['excedentes'],
-                    'candidatos': vaga['candidatos'],
-                    'vagas_disponiveis_reg': vaga['vagas_disponiveis_reg'],
-                    'vagas_disponiveis_vest': vaga['vagas_disponiveis_vest'],
-                    'total_vagas': vaga['total_vagas'],
-                    'total_inscritos': vaga['total_inscritos'],
-                    'total_vagas_disponiveis': vaga['total_vagas_disponiveis'],
-                    'url': url_turma
-                }
-                registros.append(registro)
-            
-            return registros
-            
-        except Exception as e:
-            return []
-    
-    def buscar_turmas_detalhadas(self, curso_nome, periodo, departamento=None, codigo_disciplina=None):
-        """Busca turmas detalhadas com todos os dados"""
-        msg = f"🔍 Buscando turmas de {curso_nome} - Período {periodo}"
-        if codigo_disciplina:
-            msg += f" - Disciplina {codigo_disciplina}"
-        elif departamento and departamento != 'TODOS':
-            msg += f" - Depto {departamento}"
-        st.info(msg)
-        
-        id_curso = self.ids_cursos.get(curso_nome)
-        if not id_curso:
-            return []
-        
-        url_busca = self.construir_url_busca(id_curso, departamento, periodo, codigo_disciplina)
-        links_turmas = self.navegar_paginas(url_busca, curso_nome)
-        
-        if not links_turmas:
-            st.warning(f"ℹ️ Nenhuma turma encontrada para {curso_nome} no período {periodo}")
-            return []
-        
-        todas_turmas = []
-        total_turmas = len(links_turmas)
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i, link in enumerate(links_turmas):
-            if st.session_state.processando == False:
-                break
-                
-            status_text.text(f"📋 Processando turma {i+1}/{total_turmas}")
-            
-            registros = self.extrair_dados_turma_detalhado(link, curso_nome, periodo, departamento)
-            
-            for registro in registros:
-                duplicado = False
-                for existente in todas_turmas:
-                    if (existente['codigo_disciplina'] == registro['codigo_disciplina'] and
-                        existente['turma'] == registro['turma'] and
-                        existente['curso_vaga'] == registro['curso_vaga']):
-                        duplicado = True
-                        break
-                
-                if not duplicado:
-                    todas_turmas.append(registro)
-            
-            progress_bar.progress((i + 1) / total_turmas)
-            time.sleep(0.3)
-        
-        progress_bar.empty()
-        status_text.empty()
-        
-        return todas_turmas
+    vagas_curso = df.groupby('curso_vaga', observed=True).agg({
+        'vagas_disponiveis_reg': 'sum',
+        'vagas_disponiveis_vest': 'sum'
+    }).reset_index()
     
-    def consultar_vagas_completas(self, periodos, cursos, departamentos, codigo_disciplina=None):
-        """Consulta completa de vagas com todos os detalhes"""
-        todas_turmas = []
-        
-        total_consultas = len(periodos) * len(cursos) * len(departamentos)
-        consulta_atual = 0
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for periodo in periodos:
-            for curso in cursos:
-                for depto in departamentos:
-                    if st.session_state.processando == False:
-                        return todas_turmas
-                    
-                    consulta_atual += 1
-                    progresso = consulta_atual / total_consultas
-                    progress_bar.progress(progresso)
-                    
-                    status_text.text(f"🔍 {curso} | 📅 {periodo} | 🏫 {depto or 'Todos'}")
-                    
-                    turmas = self.buscar_turmas_detalhadas(curso, periodo, depto, codigo_disciplina)
-                    
-                    for turma in turmas:
-                        duplicado = False
-                        for existente in todas_turmas:
-                            if (existente['codigo_disciplina'] == turma['codigo_disciplina'] and
-                                existente['turma'] == turma['turma'] and
-                                existente['curso_vaga'] == turma['curso_vaga'] and
-                                existente['periodo'] == turma['periodo']):
-                                duplicado = True
-                                break
-                        
-                        if not duplicado:
-                            todas_turmas.append(turma)
-                    
-                    time.sleep(0.5)
-        
-        progress_bar.empty()
-        status_text.empty()
+    if not vagas_curso.empty:
+        fig = go.Figure()
         
-        return todas_turmas
-
-# ===== FUNÇÕES PARA FORMATAÇÃO EXCEL =====
-def aplicar_formatacao_excel(workbook):
-    """Aplica formatação profissional ao Excel"""
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=11)
-    border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                   top=Side(style='thin'), bottom=Side(style='thin'))
-    center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    left_align = Alignment(horizontal='left', vertical='center', wrap_text=True)
-    
-    # Cores apenas para Quimica e Quimica Industrial
-    fill_quimica = PatternFill(start_color="FFE6CC", end_color="FFE6CC", fill_type="solid")
-    fill_quimica_industrial = PatternFill(start_color="E6F3FF", end_color="E6F3FF", fill_type="solid")
-    fill_excedente = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-    font_excedente = Font(color="CC0000", bold=True)
-    
-    for sheet_name in workbook.sheetnames:
-        ws = workbook[sheet_name]
-        
-        col_widths = {
-            'A': 12, 'B': 12, 'C': 18, 'D': 50, 'E': 10, 'F': 30,
-            'G': 30, 'H': 12, 'I': 12, 'J': 12, 'K': 12, 'L': 12,
-            'M': 12, 'N': 12, 'O': 12, 'P': 12, 'Q': 12, 'R': 12,
-            'S': 12, 'T': 12, 'U': 80
-        }
-        
-        for col, width in col_widths.items():
-            ws.column_dimensions[col].width = width
+        fig.add_trace(go.Bar(
+            name='Vagas Regulares',
+            x=vagas_curso['curso_vaga'],
+            y=vagas_curso['vagas_disponiveis_reg'],
+            marker_color='#1e3a5f'
+        ))
         
-        for row in ws.iter_rows():
-            for cell in row:
-                if cell.value is not None:
-                    cell.border = border
-                    if cell.row == 1:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = center_align
-                    else:
-                        if cell.column in [1, 2, 3, 5, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20]:
-                            cell.alignment = center_align
-                        else:
-                            cell.alignment = left_align
+        fig.add_trace(go.Bar(
+            name='Vagas Vestibular',
+            x=vagas_curso['curso_vaga'],
+            y=vagas_curso['vagas_disponiveis_vest'],
+            marker_color='#4a90e2'
+        ))
         
-        # Aplicar cores apenas para Quimica (028) e Quimica Industrial (029)
-        if ws.max_row > 1:
-            for row in range(2, ws.max_row + 1):
-                curso_cell = ws.cell(row=row, column=7)
-                if curso_cell.value:
-                    curso_str = str(curso_cell.value)
-                    fill_color = None
-                    
-                    # Verifica se e exatamente Quimica (028) - nao pode ter Industrial nem Engenharia
-                    if curso_str.startswith('028') or (curso_str.endswith('Química') and 'Industrial' not in curso_str and 'Engenharia' not in curso_str):
-                        fill_color = fill_quimica
-                    # Verifica se e exatamente Quimica Industrial (029)
-                    elif curso_str.startswith('029') or 'Química Industrial' in curso_str:
-                        fill_color = fill_quimica_industrial
-                    # Demais cursos ficam sem cor (fundo branco)
-                    
-                    if fill_color:
-                        for col in range(1, ws.max_column + 1):
-                            ws.cell(row=row, column=col).fill = fill_color
-                
-                excedentes_cell = ws.cell(row=row, column=14)
-                if excedentes_cell.value and isinstance(excedentes_cell.value, (int, float)):
-                    if excedentes_cell.value > 0:
-                        excedentes_cell.fill = fill_excedente
-                        excedentes_cell.font = font_excedente
-
-def gerar_excel_completo(df, periodo_str):
-    """Gera Excel completo no formato do Colab"""
-    if df.empty:
-        return None
-    
-    wb = Workbook()
-    
-    if 'Sheet' in wb.sheetnames:
-        del wb['Sheet']
-    
-    colunas_ordem = [
-        'periodo', 'departamento', 'codigo_disciplina', 'nome_disciplina', 'turma', 'horarios',
-        'curso_vaga', 'vagas_reg', 'vagas_vest', 'inscritos_reg', 'inscritos_vest',
-        'vagas_disponiveis_reg', 'vagas_disponiveis_vest', 'excedentes', 'candidatos',
-        'total_vagas', 'total_inscritos', 'total_vagas_disponiveis',
-        'curso_origem_busca', 'url'
-    ]
-    
-    for col in colunas_ordem:
-        if col not in df.columns:
-            df[col] = ''
-    
-    df = df[colunas_ordem]
-    
-    ws_todas = wb.create_sheet('Todas as Turmas')
-    for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), 1):
-        for c_idx, value in enumerate(row, 1):
-            ws_todas.cell(row=r_idx, column=c_idx, value=value)
-    
-    df_vagas_reg = df[df['vagas_disponiveis_reg'] > 0]
-    if not df_vagas_reg.empty:
-        ws_vagas_reg = wb.create_sheet('Com Vagas Reg')
-        for r_idx, row in enumerate(dataframe_to_rows(df_vagas_reg, index=False, header=True), 1):
-            for c_idx, value in enumerate(row, 1):
-                ws_vagas_reg.cell(row=r_idx, column=c_idx, value=value)
-    
-    df_vagas_vest = df[df['vagas_disponiveis_vest'] > 0]
-    if not df_vagas_vest.empty:
-        ws_vagas_vest = wb.create_sheet('Com Vagas Vest')
-        for r_idx, row in enumerate(dataframe_to_rows(df_vagas_vest, index=False, header=True), 1):
-            for c_idx, value in enumerate(row, 1):
-                ws_vagas_vest.cell(row=r_idx, column=c_idx, value=value)
+        fig.update_layout(
+            barmode='stack',
+            height=400,
+            title="Vagas Disponíveis por Tipo e Curso",
+            xaxis_title="Curso",
+            yaxis_title="Vagas Disponíveis",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        painel['fig_vagas_curso'] = fig
+    
+    depto_dist = df.groupby('departamento', observed=True).agg({
+        'codigo_disciplina': 'count',
+        'total_vagas_disponiveis': 'sum',
+        'excedentes': 'sum'
+    }).reset_index()
+    depto_dist.columns = ['Departamento', 'Número de Turmas', 'Vagas Disponíveis', 'Excedentes']
+    
+    if not depto_dist.empty:
+        fig = px.treemap(
+            depto_dist,
+            path=['Departamento'],
+            values='Vagas Disponíveis',
+            color='Excedentes',
+            color_continuous_scale='Reds',
+            title='Vagas Disponíveis por Departamento'
+        )
+        fig.update_layout(height=500)
+        painel['fig_departamentos'] = fig
+        painel['depto_ranking'] = depto_dist.sort_values('Excedentes', ascending=False)
     
     df_excedentes = df[df['excedentes'] > 0]
-    if not df_excedentes.empty:
-        ws_excedentes = wb.create_sheet('Com Excedentes')
-        for r_idx, row in enumerate(dataframe_to_rows(df_excedentes, index=False, header=True), 1):
-            for c_idx, value in enumerate(row, 1):
-                ws_excedentes.cell(row=r_idx, column=c_idx, value=value)
     
-    if not df.empty:
-        ws_depto = wb.create_sheet('Por Departamento')
-        
-        grupos = df.groupby(['periodo', 'departamento'])
-        
-        headers = [
-            'Período', 'Departamento', 'Código', 'Disciplina', 'Turma',
-            'Vagas Reg', 'Vagas Vest', 'Inscritos Reg', 'Inscritos Vest',
-            'Vagas Disp Reg', 'Vagas Disp Vest', 'Total Vagas', 'Total Inscritos', 'Total Vagas Disp'
-        ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws_depto.cell(row=1, column=col, value=header)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.font = Font(color="FFFFFF", bold=True)
-            cell.alignment = Alignment(horizontal='center')
+    if not df_excedentes.empty:
+        excedentes_curso = df_excedentes.groupby('curso_vaga', observed=True).agg({
+            'excedentes': 'sum',
+            'codigo_disciplina': 'count'
+        }).reset_index()
+        excedentes_curso.columns = ['Curso', 'Total Excedentes', 'Número de Turmas']
+        excedentes_curso = excedentes_curso.sort_values('Total Excedentes', ascending=False)
         
-        linha_atual = 2
+        fig = px.bar(
+            excedentes_curso,
+            x='Curso',
+            y='Total Excedentes',
+            color='Total Excedentes',
+            color_continuous_scale='Reds',
+            title='Total de Excedentes por Curso'
+        )
+        fig.update_layout(height=400)
         
-        for (periodo, departamento), grupo in grupos:
-            grupo = grupo.sort_values(['codigo_disciplina', 'turma'])
-            
-            for _, linha in grupo.iterrows():
-                dados = [
-                    periodo, departamento,
-                    linha['codigo_disciplina'], linha['nome_disciplina'], linha['turma'],
-                    linha['vagas_reg'], linha['vagas_vest'],
-                    linha['inscritos_reg'], linha['inscritos_vest'],
-                    linha['vagas_disponiveis_reg'], linha['vagas_disponiveis_vest'],
-                    linha['total_vagas'], linha['total_inscritos'], linha['total_vagas_disponiveis']
-                ]
-                
-                for col, valor in enumerate(dados, 1):
-                    ws_depto.cell(row=linha_atual, column=col, value=valor)
-                
-                linha_atual += 1
-    
-    ws_stats = wb.create_sheet('Estatísticas')
+        painel['excedentes'] = {
+            'turmas': len(df_excedentes),
+            'total': df_excedentes['excedentes'].sum(),
+            'cursos': len(df_excedentes['curso_vaga'].unique()),
+            'maior': df_excedentes['excedentes'].max(),
+            'tabela': df_excedentes.sort_values('excedentes', ascending=False)[[
+                'codigo_disciplina', 'nome_disciplina', 'turma', 'curso_vaga',
+                'vagas_reg', 'candidatos', 'excedentes', 'inscritos_reg'
+            ]],
+            'por_curso': excedentes_curso,
+            'fig': fig,
+        }
     
-    stats_data = []
-    for periodo in df['periodo'].unique():
-        df_periodo = df[df['periodo'] == periodo]
-        
-        for curso in df_periodo['curso_vaga'].unique():
-            df_curso = df_periodo[df_periodo['curso_vaga'] == curso]
-            
-            total_excedentes = df_curso['excedentes'].sum()
-            
-            stats_data.append({
-                'Período': periodo,
-                'Curso': curso,
-                'Total Turmas': len(df_curso),
-                'Turmas com Vagas Reg': len(df_curso[df_curso['vagas_disponiveis_reg'] > 0]),
-                'Turmas com Vagas Vest': len(df_curso[df_curso['vagas_disponiveis_vest'] > 0]),
-                'Turmas com Excedentes': len(df_curso[df_curso['excedentes'] > 0]),
-                'Total Vagas Reg': df_curso['vagas_reg'].sum(),
-                'Total Vagas Vest': df_curso['vagas_vest'].sum(),
-                'Total Inscritos Reg': df_curso['inscritos_reg'].sum(),
-                'Total Inscritos Vest': df_curso['inscritos_vest'].sum(),
-                'Total Excedentes': total_excedentes,
-                'Total Vagas Disp Reg': df_curso['vagas_disponiveis_reg'].sum(),
-                'Total Vagas Disp Vest': df_curso['vagas_disponiveis_vest'].sum(),
-                'Taxa Ocupação Reg (%)': round((df_curso['inscritos_reg'].sum() / df_curso['vagas_reg'].sum() * 100), 2) if df_curso['vagas_reg'].sum() > 0 else 0,
-                'Taxa Ocupação Vest (%)': round((df_curso['inscritos_vest'].sum() / df_curso['vagas_vest'].sum() * 100), 2) if df_curso['vagas_vest'].sum() > 0 else 0
-            })
-    
-    if stats_data:
-        stats_df = pd.DataFrame(stats_data)
-        for r_idx, row in enumerate(dataframe_to_rows(stats_df, index=False, header=True), 1):
-            for c_idx, value in enumerate(row, 1):
-                ws_stats.cell(row=r_idx, column=c_idx, value=value)
-    
-    aplicar_formatacao_excel(wb)
-    
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    return output
+    painel['tempo_montagem'] = time.perf_counter() - inicio
+    return painel
 
-# ===== FUNÇÕES AUXILIARES =====
-def formatar_periodo(periodo):
-    """Formata período para exibição"""
-    if '.' in periodo:
-        return periodo
-    elif len(periodo) == 5:
-        return f"{periodo[:4]}.{periodo[4]}"
-    return periodo
+def obter_visualizacoes(df):
+    """Painel do resultado atual e se veio do cache; montado uma vez por resultado e reaproveitado nos reruns"""
+    atual = st.session_state.get('painel_visualizacoes')
+    if atual is not None and atual[0] is df:
+        return atual[1], True
+    painel = montar_visualizacoes(df)
+    st.session_state.painel_visualizacoes = (df, painel)
+    return painel, False
 
-def validar_periodo(periodo):
-    """Valida formato do período"""
-    if '.' in periodo:
-        partes = periodo.split('.')
-        if len(partes) == 2 and partes[0].isdigit() and partes[1].isdigit():
-            ano = int(partes[0])
-            semestre = int(partes[1])
-            if 2000 <= ano <= 2100 and semestre in [1, 2]:
-                return True
-    return False
-
-def validar_departamento(depto):
-    """Valida formato do departamento"""
-    if depto == 'TODOS' or depto == '':
-        return True
-    if len(depto) == 3 and depto.isalpha():
-        return True
-    return False
-
-def validar_codigo_disciplina(codigo):
-    """Valida formato do código de disciplina (3 letras + 5 números)"""
-    if not codigo:
-        return False
-    codigo = codigo.strip().upper()
-    # Padrão: 3 letras seguidas de 5 números (ex: GQI00061)
-    padrao = r'^[A-Z]{3}\d{5}$'
-    return bool(re.match(padrao, codigo))
+def obter_indice(df):
+    """Índices de filtro e ordenação do resultado atual, montados uma vez por resultado"""
+    atual = st.session_state.get('indice_resultado')
+    if atual is None or atual.df is not df:
+        atual = IndiceResultado(df)
+        st.session_state.indice_resultado = atual
+    return atual
 
 def criar_visualizacoes(df):
     """Cria visualizações gráficas dos dados"""
@@ -1104,92 +558,44 @@ def criar_visualizacoes(df):
         st.info("📭 Nenhum dado disponível para visualização")
         return
     
+    inicio = time.perf_counter()
+    painel, reaproveitado = obter_visualizacoes(df)
+    
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Visão Geral", "📈 Distribuição", "🏫 Análise Detalhada", "⚠️ Excedentes"])
     
     with tab1:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_turmas = len(df)
-            st.metric("Total de Turmas", total_turmas)
+            st.metric("Total de Turmas", painel['total_turmas'])
         
         with col2:
-            turmas_com_vagas = len(df[df['total_vagas_disponiveis'] > 0])
-            st.metric("Turmas com Vagas", turmas_com_vagas)
+            st.metric("Turmas com Vagas", painel['turmas_com_vagas'])
         
         with col3:
-            total_vagas_disp = df['total_vagas_disponiveis'].sum()
-            st.metric("Vagas Disponíveis", total_vagas_disp)
+            st.metric("Vagas Disponíveis", painel['total_vagas_disp'])
         
         with col4:
-            total_excedentes = df['excedentes'].sum()
-            st.metric("Total de Excedentes", total_excedentes, delta=None)
+            st.metric("Total de Excedentes", painel['total_excedentes'], delta=None)
         
         st.subheader("📊 Vagas Disponíveis por Curso")
         
-        vagas_curso = df.groupby('curso_vaga').agg({
-            'vagas_disponiveis_reg': 'sum',
-            'vagas_disponiveis_vest': 'sum'
-        }).reset_index()
-        
-        if not vagas_curso.empty:
-            fig = go.Figure()
-            
-            fig.add_trace(go.Bar(
-                name='Vagas Regulares',
-                x=vagas_curso['curso_vaga'],
-                y=vagas_curso['vagas_disponiveis_reg'],
-                marker_color='#1e3a5f'
-            ))
-            
-            fig.add_trace(go.Bar(
-                name='Vagas Vestibular',
-                x=vagas_curso['curso_vaga'],
-                y=vagas_curso['vagas_disponiveis_vest'],
-                marker_color='#4a90e2'
-            ))
-            
-            fig.update_layout(
-                barmode='stack',
-                height=400,
-                title="Vagas Disponíveis por Tipo e Curso",
-                xaxis_title="Curso",
-                yaxis_title="Vagas Disponíveis",
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if painel['fig_vagas_curso'] is not None:
+            st.plotly_chart(painel['fig_vagas_curso'], use_container_width=True)
     
     with tab2:
         st.subheader("🏫 Distribuição por Departamento")
         
-        depto_dist = df.groupby('departamento').agg({
-            'codigo_disciplina': 'count',
-            'total_vagas_disponiveis': 'sum',
-            'excedentes': 'sum'
-        }).reset_index()
-        depto_dist.columns = ['Departamento', 'Número de Turmas', 'Vagas Disponíveis', 'Excedentes']
-        
-        if not depto_dist.empty:
+        if painel['fig_departamentos'] is not None:
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = px.treemap(
-                    depto_dist,
-                    path=['Departamento'],
-                    values='Vagas Disponíveis',
-                    color='Excedentes',
-                    color_continuous_scale='Reds',
-                    title='Vagas Disponíveis por Departamento'
-                )
-                fig.update_layout(height=500)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(painel['fig_departamentos'], use_container_width=True)
             
             with col2:
                 st.write("**Ranking de Departamentos:**")
-                depto_ranking = depto_dist.sort_values('Excedentes', ascending=False)
                 st.dataframe(
-                    depto_ranking,
+                    painel['depto_ranking'],
                     column_config={
                         "Departamento": st.column_config.TextColumn("Depto"),
                         "Número de Turmas": st.column_config.NumberColumn("Turmas"),
@@ -1219,27 +625,27 @@ def criar_visualizacoes(df):
                 key="analise_ordenacao"
             )
         
-        if curso_analise != 'Todos':
-            df_analise = df[df['curso_vaga'] == curso_analise].copy()
-        else:
-            df_analise = df.copy()
-        
-        if ordenacao == 'Mais vagas disponíveis':
-            df_analise = df_analise.sort_values('total_vagas_disponiveis', ascending=False)
-        elif ordenacao == 'Mais inscritos':
-            df_analise = df_analise.sort_values('total_inscritos', ascending=False)
-        elif ordenacao == 'Mais excedentes':
-            df_analise = df_analise.sort_values('excedentes', ascending=False)
-        else:
-            df_analise = df_analise.sort_values(['codigo_disciplina', 'turma'])
+        # Ordenações prontas no índice do resultado: só as 20 primeiras linhas do curso são lidas
+        indice = obter_indice(df)
+        chaves_ordenacao = {
+            'Mais vagas disponíveis': 'vagas_disponiveis',
+            'Mais inscritos': 'inscritos',
+            'Mais excedentes': 'excedentes',
+            'Código da disciplina': 'codigo',
+        }
+        posicoes_analise = indice.ordenadas(
+            chaves_ordenacao[ordenacao],
+            indice.posicoes(curso=None if curso_analise == 'Todos' else curso_analise),
+            limite=20
+        )
         
         st.dataframe(
-            df_analise[[
+            indice.linhas(posicoes_analise, [
                 'codigo_disciplina', 'nome_disciplina', 'turma', 'horarios',
                 'vagas_reg', 'inscritos_reg', 'vagas_disponiveis_reg',
                 'vagas_vest', 'inscritos_vest', 'vagas_disponiveis_vest',
                 'excedentes', 'candidatos', 'total_vagas_disponiveis'
-            ]].head(20),
+            ]),
             column_config={
                 "codigo_disciplina": "Código",
                 "nome_disciplina": "Disciplina",
@@ -1262,34 +668,26 @@ def criar_visualizacoes(df):
     with tab4:
         st.subheader("⚠️ Análise de Excedentes")
         
-        df_excedentes = df[df['excedentes'] > 0].copy()
+        excedentes = painel['excedentes']
         
-        if not df_excedentes.empty:
-            st.warning(f"⚠️ **Atenção:** Foram encontradas {len(df_excedentes)} turmas com excedentes!")
+        if excedentes is not None:
+            st.warning(f"⚠️ **Atenção:** Foram encontradas {excedentes['turmas']} turmas com excedentes!")
             
             col_ex1, col_ex2, col_ex3 = st.columns(3)
             
             with col_ex1:
-                total_excedentes = df_excedentes['excedentes'].sum()
-                st.metric("Total de Excedentes", total_excedentes)
+                st.metric("Total de Excedentes", excedentes['total'])
             
             with col_ex2:
-                cursos_com_excedentes = len(df_excedentes['curso_vaga'].unique())
-                st.metric("Cursos com Excedentes", cursos_com_excedentes)
+                st.metric("Cursos com Excedentes", excedentes['cursos'])
             
             with col_ex3:
-                maior_excedente = df_excedentes['excedentes'].max()
-                st.metric("Maior Excedente", maior_excedente)
+                st.metric("Maior Excedente", excedentes['maior'])
             
             st.subheader("📋 Turmas com Excedentes")
             
-            df_excedentes_ordenado = df_excedentes.sort_values('excedentes', ascending=False)
-            
             st.dataframe(
-                df_excedentes_ordenado[[
-                    'codigo_disciplina', 'nome_disciplina', 'turma', 'curso_vaga',
-                    'vagas_reg', 'candidatos', 'excedentes', 'inscritos_reg'
-                ]],
+                excedentes['tabela'],
                 column_config={
                     "codigo_disciplina": "Código",
                     "nome_disciplina": "Disciplina",
@@ -1306,30 +704,14 @@ def criar_visualizacoes(df):
             
             st.subheader("📊 Excedentes por Curso")
             
-            excedentes_curso = df_excedentes.groupby('curso_vaga').agg({
-                'excedentes': 'sum',
-                'codigo_disciplina': 'count'
-            }).reset_index()
-            excedentes_curso.columns = ['Curso', 'Total Excedentes', 'Número de Turmas']
-            excedentes_curso = excedentes_curso.sort_values('Total Excedentes', ascending=False)
-            
             col_exc1, col_exc2 = st.columns(2)
             
             with col_exc1:
-                fig = px.bar(
-                    excedentes_curso,
-                    x='Curso',
-                    y='Total Excedentes',
-                    color='Total Excedentes',
-                    color_continuous_scale='Reds',
-                    title='Total de Excedentes por Curso'
-                )
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(excedentes['fig'], use_container_width=True)
             
             with col_exc2:
                 st.dataframe(
-                    excedentes_curso,
+                    excedentes['por_curso'],
                     column_config={
                         "Curso": st.column_config.TextColumn("Curso"),
                         "Total Excedentes": st.column_config.NumberColumn("Excedentes"),
@@ -1340,6 +722,101 @@ def criar_visualizacoes(df):
                 )
         else:
             st.success("✅ Nenhuma turma com excedentes encontrada!")
+    
+    # Instrumentação: montagem = custo que antes se repetia a cada rerun; desenho = custo deste rerun
+    if st.session_state.get('mostrar_tempos'):
+        st.caption(
+            f"⏱️ Visualizações: montagem de agregações e figuras {painel['tempo_montagem'] * 1000:.0f} ms "
+            f"({'reaproveitada do cache neste rerun' if reaproveitado else 'feita neste rerun'}) · "
+            f"rerun atual {(time.perf_counter() - inicio) * 1000:.0f} ms"
+        )
+
+def obter_opcoes_turmas(df):
+    """Turmas do resultado atual e seus rótulos para o seletor do histórico, montados uma vez por resultado"""
+    atual = st.session_state.get('opcoes_historico_turma')
+    if atual is None or atual[0] is not df:
+        turmas = df[['periodo', 'codigo_disciplina', 'nome_disciplina', 'turma']].drop_duplicates()
+        opcoes_turmas = list(turmas.itertuples(index=False, name=None))
+        rotulos = {t: f"{formatar_periodo(t[0])} | {t[1]} - {t[2]} | Turma {t[3]}" for t in opcoes_turmas}
+        atual = (df, opcoes_turmas, rotulos)
+        st.session_state.opcoes_historico_turma = atual
+    return atual[1], atual[2]
+
+def exibir_historico_turma(df, historico):
+    """Evolução de vagas, inscritos e excedentes de uma turma ao longo das consultas registradas"""
+    opcoes_turmas, rotulos = obter_opcoes_turmas(df)
+    if not opcoes_turmas:
+        return
+    
+    escolha = st.selectbox(
+        "Turma:",
+        options=opcoes_turmas,
+        format_func=rotulos.get,
+        key="historico_turma"
+    )
+    periodo, codigo_disciplina, _, turma = escolha
+    
+    serie = pd.DataFrame(historico.serie_turma(
+        periodo, codigo_disciplina, turma,
+        campos=['inscritos_reg', 'vagas_disponiveis_reg', 'excedentes']
+    ))
+    if serie.empty:
+        st.info("ℹ️ Nenhuma consulta registrada para esta turma ainda")
+        return
+    
+    serie['registrado_em'] = pd.to_datetime(serie['registrado_em'], unit='s')
+    serie = serie.melt(
+        id_vars=['registrado_em', 'curso_vaga'],
+        value_vars=['inscritos_reg', 'vagas_disponiveis_reg', 'excedentes'],
+        var_name='Indicador',
+        value_name='Valor'
+    )
+    fig = px.line(
+        serie,
+        x='registrado_em',
+        y='Valor',
+        color='curso_vaga',
+        line_dash='Indicador',
+        markers=True,
+        title=f'Evolução de {codigo_disciplina} - Turma {turma}'
+    )
+    fig.update_layout(height=400, xaxis_title='Consulta', legend_title='Curso / Indicador')
+    st.plotly_chart(fig, use_container_width=True)
+
+def carregar_resultado_coletor(historico):
+    """Carrega na sessão o último resultado gravado pelo coletor agendado para a tarefa escolhida"""
+    tarefas = {}
+    for consulta in historico.consultas(limite=500):
+        parametros = consulta['parametros']
+        # Coletas vazias gravadas por versões antigas do coletor não escondem a última com dados
+        if parametros.get('origem') == 'coletor' and consulta['total_registros'] > 0:
+            tarefas.setdefault(parametros.get('tarefa'), consulta)
+    
+    if not tarefas:
+        st.info("ℹ️ Nenhum resultado do coletor agendado ainda")
+        return
+    
+    tarefa = st.selectbox(
+        "Tarefa do coletor:",
+        options=list(tarefas),
+        format_func=lambda nome: (
+            f"{nome} - {datetime.fromtimestamp(tarefas[nome]['registrado_em']).strftime('%d/%m %H:%M')}"
+        ),
+        key="tarefa_coletor"
+    )
+    consulta = tarefas[tarefa]
+    
+    if st.session_state.get('consulta_carregada') != consulta['id']:
+        dados = historico.registros_da_consulta(consulta['id'])
+        st.session_state.dados_turmas = montar_dataframe_resultado(dados) if dados else None
+        st.session_state.resultado_disponivel = bool(dados)
+        st.session_state.consulta_carregada = consulta['id']
+        # O resultado do coletor substitui o de uma consulta ao vivo interrompida
+        st.session_state.registros_parciais = None
+        st.session_state.consulta_interrompida = False
+    
+    st.caption(f"📦 {consulta['total_registros']} registros de "
+               f"{datetime.fromtimestamp(consulta['registrado_em']).strftime('%d/%m/%Y %H:%M')}")
 
 # ===== INTERFACE PRINCIPAL =====
 st.markdown("""
@@ -1359,6 +836,21 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
     
+    # === SEÇÃO: FONTE DOS DADOS ===
+    fonte_dados = st.radio(
+        "🗄️ Fonte dos dados:",
+        options=['Consulta ao vivo', 'Coletor agendado'],
+        horizontal=True,
+        help="O coletor agendado (coletor_agendado.py) consulta o quadro em segundo plano; "
+             "este modo só carrega o último resultado gravado",
+        key="fonte_dados"
+    )
+    
+    if fonte_dados == 'Coletor agendado':
+        carregar_resultado_coletor(obter_historico())
+    
+    st.markdown("---")
+    
     # === SEÇÃO: PERÍODO ===
     st.subheader("📅 Período Letivo")
     
@@ -1379,11 +871,33 @@ with st.sidebar:
             st.error("❌ Formato inválido")
             periodos_formatados = []
     
-    adicionar_periodo = st.checkbox("Adicionar outro período", key="adicionar_periodo")
-    if adicionar_periodo:
+    modo_periodos = st.radio(
+        "Períodos da consulta:",
+        options=['Só este período', 'Adicionar outro período', 'Intervalo de períodos'],
+        help="Com vários períodos, cada um é consultado em paralelo (mesmo limite de acesso ao app.uff.br)",
+        key="modo_periodos"
+    )
+    if modo_periodos == 'Adicionar outro período':
         periodo2 = st.text_input("Segundo período:", value="2025.1", key="periodo2")
         if periodo2 and validar_periodo(periodo2):
             periodos_formatados.append(periodo2.replace('.', ''))
+    elif modo_periodos == 'Intervalo de períodos' and periodos_formatados:
+        periodo_final = st.text_input(
+            "Até o período:",
+            value="2022.1",
+            help="Consulta todos os semestres entre os dois períodos, inclusive",
+            key="periodo_final"
+        )
+        intervalo = intervalo_periodos(periodo_input, periodo_final)
+        if not intervalo:
+            st.error("❌ Formato inválido")
+            periodos_formatados = []
+        elif len(intervalo) > MAX_PERIODOS_INTERVALO:
+            st.error(f"❌ Intervalo com {len(intervalo)} períodos (máximo {MAX_PERIODOS_INTERVALO})")
+            periodos_formatados = []
+        else:
+            periodos_formatados = [periodo.replace('.', '') for periodo in intervalo]
+            st.success(f"✅ {descrever_periodos(intervalo)} ({len(intervalo)} períodos)")
     
     st.markdown("---")
     
@@ -1487,6 +1001,65 @@ with st.sidebar:
         )
         
         st.session_state.mostrar_outros_cursos = mostrar_outros_cursos_checkbox
+        
+        atualizacao_incremental = st.checkbox(
+            "Atualização incremental",
+            value=False,
+            help="Revalida as páginas de turma e só reanalisa as que mudaram desde a última consulta",
+            key="atualizacao_incremental"
+        )
+        
+        motor_consulta = st.selectbox(
+            "Motor de consulta",
+            options=list(MOTORES_CONSULTA),
+            format_func=MOTORES_CONSULTA.get,
+            help="O motor assíncrono baixa páginas e turmas como corrotinas sobre um único cliente HTTP",
+            key="motor_consulta"
+        )
+        
+        max_concorrencia = st.slider(
+            "Requisições simultâneas",
+            min_value=1,
+            max_value=MAX_REQUISICOES_SIMULTANEAS,
+            value=6,
+            help="Número máximo de turmas baixadas em paralelo (a taxa de acesso ao app.uff.br continua limitada)",
+            key="max_concorrencia"
+        )
+        
+        periodos_paralelos = st.slider(
+            "Períodos em paralelo",
+            min_value=1,
+            max_value=8,
+            value=4,
+            help="Períodos consultados ao mesmo tempo; todos dividem as requisições simultâneas e o cache",
+            key="periodos_paralelos"
+        )
+        
+        extrator_turmas = st.selectbox(
+            "Extrator das páginas de turma",
+            options=list(EXTRATORES),
+            index=list(EXTRATORES).index(EXTRATOR_PADRAO),
+            format_func=EXTRATORES.get,
+            help="Os dois extratores produzem os mesmos registros; o lxml é mais rápido",
+            key="extrator_turmas"
+        )
+        
+        processos_analise = st.slider(
+            "Processos de análise",
+            min_value=0,
+            max_value=os.cpu_count() or 1,
+            value=0,
+            help="Analisa o HTML das páginas em processos separados enquanto as threads só baixam; "
+                 "0 analisa nas próprias threads de download",
+            key="processos_analise"
+        )
+        
+        st.checkbox(
+            "Mostrar tempos de renderização",
+            value=False,
+            help="Exibe abaixo dos gráficos o tempo de montagem das agregações e figuras e o do rerun atual",
+            key="mostrar_tempos"
+        )
     
     st.markdown("---")
     
@@ -1508,6 +1081,13 @@ with st.sidebar:
             st.session_state.processando = False
             st.session_state.resultado_disponivel = False
             st.session_state.dados_turmas = None
+            st.session_state.registros_parciais = None
+            st.session_state.consulta_interrompida = False
+            st.session_state.pop('exportacao_excel', None)
+            st.session_state.pop('exportacoes_colunares', None)
+            st.session_state.pop('painel_visualizacoes', None)
+            st.session_state.pop('indice_resultado', None)
+            st.session_state.pop('opcoes_historico_turma', None)
             st.rerun()
     
     st.markdown("---")
@@ -1523,17 +1103,35 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+# Consulta interrompida por um clique (ex.: Parar) durante a execução: o que já chegou vira o resultado
+if st.session_state.processando and not btn_consultar:
+    st.session_state.processando = False
+    if st.session_state.registros_parciais:
+        st.session_state.dados_turmas = montar_dataframe_resultado(st.session_state.registros_parciais)
+        st.session_state.resultado_disponivel = True
+        st.session_state.consulta_interrompida = True
+    st.session_state.registros_parciais = None
+
 # Área principal - Processamento
 if btn_consultar and periodos_formatados and cursos_selecionados:
     st.session_state.processando = True
     st.session_state.resultado_disponivel = False
+    st.session_state.consulta_interrompida = False
+    # Acumulador compartilhado com o exibidor de eventos: sobrevive ao rerun se a consulta for interrompida
+    st.session_state.registros_parciais = RegistrosColunares()
     
     with st.spinner("🔄 Inicializando consulta..."):
         try:
-            consultor = ConsultorQuadroHorariosUFFDetalhado(
+            consultor = obter_consultor(motor=motor_consulta, extrator=extrator_turmas)
+            ajustes = AjustesConsulta(
+                max_concorrencia=max_concorrencia,
+                periodos_paralelos=periodos_paralelos,
+                processos_analise=processos_analise
+            )
+            opcoes = OpcoesConsulta(
+                cursos_selecionados=cursos_selecionados,
                 apenas_cursos_quimica=st.session_state.apenas_cursos_quimica,
-                mostrar_outros_cursos=st.session_state.mostrar_outros_cursos,
-                cursos_selecionados=cursos_selecionados
+                mostrar_outros_cursos=st.session_state.mostrar_outros_cursos
             )
             
             deptos_consulta = []
@@ -1549,7 +1147,7 @@ if btn_consultar and periodos_formatados and cursos_selecionados:
             # Mostrar configuração da consulta
             config_msg = f"""
             **🎯 Consulta Configurada:**
-            - 📅 Períodos: {', '.join([formatar_periodo(p) for p in periodos_formatados])}
+            - 📅 Períodos: {descrever_periodos(periodos_formatados)}
             - 🎓 Cursos: {', '.join(cursos_selecionados)}
             - 🏫 Departamentos: {', '.join([d if d else 'Todos' for d in departamentos_selecionados])}
             """
@@ -1557,25 +1155,39 @@ if btn_consultar and periodos_formatados and cursos_selecionados:
                 config_msg += f"\n- 📚 Disciplina específica: {codigo_disciplina_valido}"
             
             st.info(config_msg)
+            st.button("⏹️ Parar consulta", key="btn_parar",
+                      help="Interrompe a consulta mantendo os resultados já recebidos")
+            area_parcial = st.empty()
             
             dados = consultor.consultar_vagas_completas(
                 periodos=periodos_formatados,
                 cursos=cursos_selecionados,
                 departamentos=deptos_consulta,
-                codigo_disciplina=codigo_disciplina_valido
+                codigo_disciplina=codigo_disciplina_valido,
+                opcoes=opcoes,
+                incremental=atualizacao_incremental,
+                ao_evento=ExibidorEventos(
+                    registros=st.session_state.registros_parciais,
+                    ao_lote=lambda registros: exibir_resultados_parciais(area_parcial, registros)
+                ),
+                deve_continuar=lambda: st.session_state.processando != False,
+                ajustes=ajustes
             )
             
+            area_parcial.empty()
+            st.session_state.registros_parciais = None
+            
             if dados:
-                df_resultado = pd.DataFrame(dados)
-                
-                df_resultado['excedentes'] = pd.to_numeric(df_resultado['excedentes'], errors='coerce').fillna(0)
-                df_resultado['candidatos'] = pd.to_numeric(df_resultado['candidatos'], errors='coerce').fillna(0)
-                df_resultado['vagas_reg'] = pd.to_numeric(df_resultado['vagas_reg'], errors='coerce').fillna(0)
+                df_resultado = montar_dataframe_resultado(dados)
                 
-                for idx, row in df_resultado.iterrows():
-                    if row['excedentes'] == 0 and row['candidatos'] > 0 and row['vagas_reg'] > 0:
-                        if row['candidatos'] > row['vagas_reg']:
-                            df_resultado.at[idx, 'excedentes'] = row['candidatos'] - row['vagas_reg']
+                # Só consultas concluídas entram no histórico (interrompidas ficam incompletas)
+                if st.session_state.processando != False:
+                    obter_historico().registrar(dados, parametros={
+                        'periodos': periodos_formatados,
+                        'cursos': cursos_selecionados,
+                        'departamentos': deptos_consulta,
+                        'codigo_disciplina': codigo_disciplina_valido,
+                    })
                 
                 st.session_state.dados_turmas = df_resultado
                 st.session_state.resultado_disponivel = True
@@ -1610,10 +1222,14 @@ if st.session_state.resultado_disponivel and st.session_state.dados_turmas is no
     st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
     st.markdown('<p class="section-header">Resultados da Consulta</p>', unsafe_allow_html=True)
     
-    if periodos_formatados:
-        periodo_formatado = formatar_periodo(periodos_formatados[0])
-    else:
-        periodo_formatado = "N/A"
+    if st.session_state.consulta_interrompida:
+        st.warning(f"⏹️ Consulta interrompida: resultado parcial com {len(df)} registros "
+                   f"(não registrado no histórico)")
+    
+    periodo_formatado = descrever_periodos(sorted(df['periodo'].dropna().unique()))
+    
+    # Começa a montar o Excel antes das visualizações; filtros e reruns reaproveitam o arquivo pronto
+    excel_futuro = exportacao_excel(df, periodo_formatado)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -1634,18 +1250,22 @@ if st.session_state.resultado_disponivel and st.session_state.dados_turmas is no
     # Visualizações
     criar_visualizacoes(df)
     
-    # Exportacao - APENAS EXCEL
+    with st.expander("🕒 Evolução Histórica da Turma"):
+        exibir_historico_turma(df, obter_historico())
+    
+    # Exportacao - Excel e formatos colunares
     st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
     st.markdown('<p class="section-header">Exportar Resultados</p>', unsafe_allow_html=True)
     
     col_exp1, col_exp2, col_exp3 = st.columns([1, 2, 1])
     
     with col_exp2:
-        excel_buffer = gerar_excel_completo(df, periodo_formatado)
+        with st.spinner("Preparando Excel..."):
+            excel_buffer = excel_futuro.result()
         if excel_buffer:
             st.download_button(
                 label="📊 Baixar Excel Completo",
-                data=excel_buffer,
+                data=excel_buffer.getvalue(),
                 file_name=f"vagas_uff_detalhado_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True,
@@ -1653,6 +1273,25 @@ if st.session_state.resultado_disponivel and st.session_state.dados_turmas is no
             )
         else:
             st.warning("⚠️ Nenhum dado para exportar")
+        
+        # Formatos colunares para pandas/DuckDB: mesmas colunas da planilha, gerados em milissegundos
+        st.caption("Dados brutos para análise (mesmas colunas da aba 'Todas as Turmas'):")
+        rotulos_formatos = {'parquet': "🗜️ Parquet", 'arrow': "🏹 Arrow IPC", 'csv': "📄 CSV"}
+        for coluna, formato in zip(st.columns(len(rotulos_formatos)), rotulos_formatos):
+            extensao, mime = FORMATOS_EXPORTACAO[formato]
+            with coluna:
+                if not formato_disponivel(formato):
+                    st.button(rotulos_formatos[formato], disabled=True, use_container_width=True,
+                              help="Requer o pacote pyarrow (pip install pyarrow)", key=f"btn_download_{formato}")
+                    continue
+                st.download_button(
+                    label=rotulos_formatos[formato],
+                    data=exportacao_colunar(df, formato),
+                    file_name=f"vagas_uff_detalhado_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extensao}",
+                    mime=mime,
+                    use_container_width=True,
+                    key=f"btn_download_{formato}"
+                )
     
     # Tabela interativa completa
     st.markdown('<div class="custom-divider"></div>', unsafe_allow_html=True)
@@ -1681,27 +1320,22 @@ if st.session_state.resultado_disponivel and st.session_state.dados_turmas is no
             key="filtro_vagas_tabela"
         )
     
-    df_filtrado = df.copy()
-    
-    if filtro_curso != 'Todos':
-        df_filtrado = df_filtrado[df_filtrado['curso_vaga'] == filtro_curso]
-    
-    if filtro_depto != 'Todos':
-        df_filtrado = df_filtrado[df_filtrado['departamento'] == filtro_depto]
-    
-    if filtro_vagas == 'Com vagas disponíveis':
-        df_filtrado = df_filtrado[df_filtrado['total_vagas_disponiveis'] > 0]
-    elif filtro_vagas == 'Sem vagas':
-        df_filtrado = df_filtrado[df_filtrado['total_vagas_disponiveis'] == 0]
-    elif filtro_vagas == 'Com excedentes':
-        df_filtrado = df_filtrado[df_filtrado['excedentes'] > 0]
+    # Filtros como interseção das posições pré-calculadas no índice do resultado, sem copiar o DataFrame
+    indice = obter_indice(df)
+    filtros_vagas = {'Com vagas disponíveis': 'com_vagas', 'Sem vagas': 'sem_vagas', 'Com excedentes': 'com_excedentes'}
+    posicoes_filtradas = indice.posicoes(
+        curso=None if filtro_curso == 'Todos' else filtro_curso,
+        departamento=None if filtro_depto == 'Todos' else filtro_depto,
+        vagas=filtros_vagas.get(filtro_vagas)
+    )
+    total_filtrado = len(df) if posicoes_filtradas is None else len(posicoes_filtradas)
     
     st.dataframe(
-        df_filtrado[[
+        indice.linhas(posicoes_filtradas, [
             'periodo', 'departamento', 'codigo_disciplina', 'nome_disciplina', 
             'turma', 'curso_vaga', 'vagas_reg', 'inscritos_reg', 'vagas_disponiveis_reg',
             'vagas_vest', 'inscritos_vest', 'vagas_disponiveis_vest', 'excedentes', 'candidatos', 'total_vagas_disponiveis'
-        ]],
+        ]),
         column_config={
             "periodo": "Período",
             "departamento": "Depto",
@@ -1724,7 +1358,7 @@ if st.session_state.resultado_disponivel and st.session_state.dados_turmas is no
         height=400
     )
     
-    st.info(f"Mostrando {len(df_filtrado)} de {len(df)} registros")
+    st.info(f"Mostrando {total_filtrado} de {len(df)} registros")
 
 # Pagina inicial
 elif not st.session_state.processando:
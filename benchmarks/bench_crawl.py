@@ -0,0 +1,188 @@
+# ==============================================
+# BENCHMARK DE COLETA PONTA A PONTA
+# Roda consultar_vagas_completas contra o servidor falso e reporta
+# páginas/s, turmas/s, latência p50/p95 das requisições e pico de RSS.
+# Cada motor roda em um processo próprio para isolar o pico de memória.
+#
+# Uso: python benchmarks/bench_crawl.py [--motores sync async] [--turmas 120] [--latencia 0.05] [--incremental]
+#      python benchmarks/bench_crawl.py --periodos 20241 20242 20251 20252 --periodos-paralelos 1
+#      python benchmarks/bench_crawl.py --cursos 4 --turmas 1000 --cache-quente --processos 4
+# ==============================================
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from servidor_falso import argumentos_servidor, criar_servidor
+
+CURSOS = ['Química', 'Química Industrial', 'Engenharia Química', 'Farmácia']
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def pico_rss_mb():
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+class Medicoes:
+    """Latência e contagem das requisições, alimentadas por hooks do requests ou trace do aiohttp"""
+
+    def __init__(self):
+        self.latencias = []
+        self.paginas = 0
+        self.turmas = 0
+        self.erros = 0
+        self._lock = threading.Lock()
+
+    def registrar(self, url, status, segundos):
+        with self._lock:
+            self.latencias.append(segundos)
+            self.paginas += 1
+            if '/turmas/' in str(url):
+                self.turmas += 1
+            if status >= 400:
+                self.erros += 1
+
+    def instrumentar(self, consultor):
+        def ao_responder(resposta, *args, **kwargs):
+            self.registrar(resposta.url, resposta.status_code, resposta.elapsed.total_seconds())
+
+        consultor.session.hooks['response'].append(ao_responder)
+
+        try:
+            import aiohttp
+        except ImportError:
+            return
+
+        async def ao_iniciar(sessao, contexto, params):
+            contexto.inicio = time.perf_counter()
+
+        async def ao_terminar(sessao, contexto, params):
+            self.registrar(params.url, params.response.status, time.perf_counter() - contexto.inicio)
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(ao_iniciar)
+        trace.on_request_end.append(ao_terminar)
+        consultor.trace_configs_async.append(trace)
+
+
+def executar_coleta(args):
+    """Processo filho: uma coleta a frio com o motor pedido, resultado em JSON na saída padrão"""
+    logging.disable(logging.WARNING)
+    from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+
+    consultor = ConsultorQuadroHorariosUFFDetalhado(
+        base_url=args.base_url,
+        motor=args.executar,
+        extrator=args.extrator,
+        max_concorrencia=args.concorrencia,
+        requisicoes_por_segundo=args.taxa,
+        cache_http=CacheHTTP(':memory:'),
+        periodos_paralelos=args.periodos_paralelos,
+        processos_analise=args.processos,
+    )
+    opcoes = OpcoesConsulta(cursos_selecionados=CURSOS, mostrar_outros_cursos=True)
+    medicoes = Medicoes()
+    medicoes.instrumentar(consultor)
+
+    if args.incremental or args.cache_quente:
+        # Coleta a frio que preenche cache e análises (e inicia os processos de análise);
+        # só a atualização ou a coleta seguinte é medida
+        consultor.consultar_vagas_completas(args.periodos, CURSOS[:args.cursos], [None], opcoes=opcoes,
+                                            incremental=args.incremental)
+        medicoes = Medicoes()
+        consultor.session.hooks['response'].clear()
+        consultor.trace_configs_async.clear()
+        medicoes.instrumentar(consultor)
+
+    inicio = time.perf_counter()
+    inicio_cpu = time.process_time()
+    registros = consultor.consultar_vagas_completas(args.periodos, CURSOS[:args.cursos], [None], opcoes=opcoes,
+                                                    incremental=args.incremental)
+    duracao = time.perf_counter() - inicio
+    duracao_cpu = time.process_time() - inicio_cpu
+
+    consultor.encerrar_pool_analise()
+
+    print(json.dumps({
+        'motor': args.executar,
+        'segundos': duracao,
+        'cpu_s': duracao_cpu,
+        'registros': len(registros),
+        'paginas': medicoes.paginas,
+        'turmas': medicoes.turmas,
+        'erros': medicoes.erros,
+        'p50_ms': percentil(medicoes.latencias, 50) * 1e3,
+        'p95_ms': percentil(medicoes.latencias, 95) * 1e3,
+        'pico_rss_mb': pico_rss_mb(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de coleta contra o servidor falso do quadro de horários')
+    parser.add_argument('--motores', nargs='+', default=['sync', 'async'], choices=['sync', 'async'])
+    parser.add_argument('--extrator', default='bs4', choices=['bs4', 'lxml'])
+    parser.add_argument('--concorrencia', type=int, default=6)
+    parser.add_argument('--taxa', type=float, default=50.0, help='requisições por segundo permitidas pelo limitador')
+    parser.add_argument('--periodos', nargs='+', default=['20252'])
+    parser.add_argument('--periodos-paralelos', type=int, default=4,
+                        help='períodos consultados ao mesmo tempo pelo motor síncrono (1 = um após o outro)')
+    parser.add_argument('--cursos', type=int, default=2, choices=range(1, len(CURSOS) + 1),
+                        help='quantos cursos consultar (sobrepostos pelo servidor)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='mede a atualização incremental de um período já coletado')
+    parser.add_argument('--cache-quente', action='store_true',
+                        help='mede uma segunda coleta, com todas as páginas ainda frescas no cache')
+    parser.add_argument('--processos', type=int, default=0,
+                        help='processos de análise das páginas de turma (0 = nas threads de download)')
+    argumentos_servidor(parser)
+    parser.add_argument('--executar', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        executar_coleta(args)
+        return
+
+    servidor = criar_servidor(args).iniciar_em_thread()
+    argv_filho = sys.argv[1:]
+    print(f"{'motor':>6} {'tempo (s)':>10} {'CPU (s)':>8} {'páginas/s':>10} {'turmas/s':>9} {'p50 (ms)':>9} "
+          f"{'p95 (ms)':>9} {'erros':>6} {'registros':>10} {'registros/s':>12} {'RSS (MB)':>9}")
+    try:
+        for motor in args.motores:
+            saida = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), *argv_filho,
+                 '--executar', motor, '--base-url', servidor.base_url],
+                capture_output=True, text=True, check=True, cwd=RAIZ
+            ).stdout
+            r = json.loads(saida.strip().splitlines()[-1])
+            print(f"{r['motor']:>6} {r['segundos']:10.2f} {r['cpu_s']:8.2f} {r['paginas'] / r['segundos']:10.1f} "
+                  f"{r['turmas'] / r['segundos']:9.1f} {r['p50_ms']:9.1f} {r['p95_ms']:9.1f} "
+                  f"{r['erros']:6d} {r['registros']:10d} {r['registros'] / r['segundos']:12.1f} "
+                  f"{r['pico_rss_mb']:9.1f}")
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    print(f"servidor: {servidor.contadores}")
+
+
+if __name__ == '__main__':
+    main()
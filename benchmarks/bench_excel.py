@@ -0,0 +1,171 @@
+# ==============================================
+# BENCHMARK - EXPORTAÇÃO EXCEL
+# Compara gerar_excel_completo célula a célula (Workbook normal +
+# aplicar_formatacao_excel) com o modo streaming (write-only): tempo, pico
+# de RSS e tamanho do arquivo. Cada medição roda em um processo próprio.
+# --verificar confere valores e formatação célula a célula entre os modos.
+#
+# Uso: python benchmarks/bench_excel.py [--linhas 10000 100000] [--modos celulas streaming] [--verificar]
+# ==============================================
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CURSOS_VAGAS = ['028 - Química', '029 - Química Industrial', '027 - Engenharia Química', '015 - Farmácia',
+                '025 - Física', '020 - Matemática']
+DEPARTAMENTOS = ['GQI', 'GQO', 'GQA', 'GFQ', 'GMA', 'GFI']
+MODOS = {'celulas': False, 'streaming': True}
+
+
+def gerar_registros(quantidade, semente=42):
+    """Registros sintéticos no formato de montar_registros"""
+    aleatorio = random.Random(semente)
+    registros = []
+    for i in range(quantidade):
+        departamento = DEPARTAMENTOS[i % len(DEPARTAMENTOS)]
+        vagas_reg, vagas_vest = aleatorio.randint(0, 40), aleatorio.randint(0, 40)
+        inscritos_reg, inscritos_vest = aleatorio.randint(0, 45), aleatorio.randint(0, 45)
+        registros.append({
+            'periodo': f"202{5 + i % 2}{1 + i // 2 % 2}",
+            'departamento': departamento,
+            'codigo_disciplina': f"{departamento}00{i // 24 % 1000:03d}",
+            'nome_disciplina': f"Disciplina {i // 24 % 1000:03d}",
+            'turma': f"{'ABC'[i % 3]}1",
+            'horarios': 'Segunda: 07:00-09:00 | Quarta: 07:00-09:00' if i % 2 else 'Não informado',
+            'curso_origem_busca': 'Química',
+            'curso_vaga': CURSOS_VAGAS[i // 4 % len(CURSOS_VAGAS)],
+            'vagas_reg': vagas_reg,
+            'vagas_vest': vagas_vest,
+            'inscritos_reg': inscritos_reg,
+            'inscritos_vest': inscritos_vest,
+            'excedentes': aleatorio.choice([0, 0, 0, aleatorio.randint(1, 10)]),
+            'candidatos': aleatorio.randint(0, 60),
+            'vagas_disponiveis_reg': max(0, vagas_reg - inscritos_reg),
+            'vagas_disponiveis_vest': max(0, vagas_vest - inscritos_vest),
+            'total_vagas': vagas_reg + vagas_vest,
+            'total_inscritos': inscritos_reg + inscritos_vest,
+            'total_vagas_disponiveis': max(0, vagas_reg + vagas_vest - inscritos_reg - inscritos_vest),
+            'url': f"https://app.uff.br/graduacao/quadrodehorarios/turmas/{100000 + i}",
+        })
+    return registros
+
+
+def pico_rss_mb():
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def executar_medicao(modo, linhas, saida=None):
+    """Processo filho: gera a planilha uma vez e imprime as medições em JSON"""
+    from consultor_uff.excel import gerar_excel_completo
+    from consultor_uff.resultados import montar_dataframe_resultado
+
+    df = montar_dataframe_resultado(gerar_registros(linhas))
+    rss_antes = pico_rss_mb()
+
+    inicio = time.perf_counter()
+    buffer = gerar_excel_completo(df, '2026.1', streaming=MODOS[modo])
+    duracao = time.perf_counter() - inicio
+
+    conteudo = buffer.getvalue()
+    if saida:
+        with open(saida, 'wb') as arquivo:
+            arquivo.write(conteudo)
+    print(json.dumps({
+        'modo': modo,
+        'linhas': linhas,
+        'segundos': duracao,
+        'pico_rss_mb': pico_rss_mb(),
+        'rss_dados_mb': rss_antes,
+        'tamanho_mb': len(conteudo) / (1024 * 1024),
+    }))
+
+
+def formatacao(celula):
+    return (
+        celula.fill.fill_type, celula.fill.fgColor.rgb if celula.fill.fill_type else None,
+        celula.font.b, celula.font.color.rgb if celula.font.color else None, celula.font.sz,
+        celula.border.left.style, celula.border.bottom.style,
+        celula.alignment.horizontal, celula.alignment.vertical, celula.alignment.wrap_text,
+    )
+
+
+def comparar_planilhas(caminho_a, caminho_b):
+    """Lista de diferenças de abas, larguras, valores e formatação entre dois arquivos"""
+    from openpyxl import load_workbook
+
+    a, b = load_workbook(caminho_a), load_workbook(caminho_b)
+    if a.sheetnames != b.sheetnames:
+        return [f"abas: {a.sheetnames} != {b.sheetnames}"]
+
+    diferencas = []
+    for nome in a.sheetnames:
+        ws_a, ws_b = a[nome], b[nome]
+        for coluna, dimensao in ws_a.column_dimensions.items():
+            if dimensao.width != ws_b.column_dimensions[coluna].width:
+                diferencas.append(f"{nome}!{coluna}: largura {dimensao.width} != {ws_b.column_dimensions[coluna].width}")
+        linhas_b = ws_b.iter_rows()
+        for linha_a in ws_a.iter_rows():
+            linha_b = next(linhas_b, ())
+            for celula_a, celula_b in zip(linha_a, linha_b):
+                if celula_a.value != celula_b.value or formatacao(celula_a) != formatacao(celula_b):
+                    diferencas.append(f"{nome}!{celula_a.coordinate}: {celula_a.value!r} != {celula_b.value!r}")
+        if (ws_a.max_row, ws_a.max_column) != (ws_b.max_row, ws_b.max_column):
+            diferencas.append(f"{nome}: dimensões {ws_a.dimensions} != {ws_b.dimensions}")
+    return diferencas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da exportação Excel (célula a célula x streaming)')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--modos', nargs='+', default=list(MODOS), choices=list(MODOS))
+    parser.add_argument('--verificar', type=int, nargs='?', const=2000, metavar='LINHAS',
+                        help='compara valores e formatação dos dois modos (padrão: 2000 linhas)')
+    parser.add_argument('--executar', choices=list(MODOS), help=argparse.SUPPRESS)
+    parser.add_argument('--saida', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        executar_medicao(args.executar, args.linhas[0], args.saida)
+        return
+
+    def medir(modo, linhas, saida=None):
+        comando = [sys.executable, os.path.abspath(__file__), '--executar', modo, '--linhas', str(linhas)]
+        if saida:
+            comando += ['--saida', saida]
+        resultado = subprocess.run(comando, capture_output=True, text=True, check=True).stdout
+        return json.loads(resultado.strip().splitlines()[-1])
+
+    if args.verificar:
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as pasta:
+            caminhos = {modo: os.path.join(pasta, f"{modo}.xlsx") for modo in MODOS}
+            for modo, caminho in caminhos.items():
+                medir(modo, args.verificar, caminho)
+            diferencas = comparar_planilhas(caminhos['celulas'], caminhos['streaming'])
+        print(f"verificação ({args.verificar} linhas): "
+              f"{'planilhas equivalentes' if not diferencas else f'{len(diferencas)} diferenças'}")
+        for diferenca in diferencas[:20]:
+            print(f"  {diferenca}")
+
+    print(f"{'linhas':>8} {'modo':>10} {'tempo (s)':>10} {'linhas/s':>10} {'RSS pico (MB)':>14} "
+          f"{'RSS dados (MB)':>15} {'arquivo (MB)':>13}")
+    for linhas in args.linhas:
+        for modo in args.modos:
+            r = medir(modo, linhas)
+            print(f"{linhas:8d} {modo:>10} {r['segundos']:10.2f} {linhas / r['segundos']:10.0f} "
+                  f"{r['pico_rss_mb']:14.1f} {r['rss_dados_mb']:15.1f} {r['tamanho_mb']:13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# ==============================================
+# BENCHMARK - FORMATOS DE EXPORTAÇÃO
+# Tempo e tamanho do resultado em Parquet, Arrow IPC e CSV comparados com a
+# planilha Excel (modo streaming), a partir do mesmo DataFrame.
+#
+# Uso: python benchmarks/bench_exportacao.py [--linhas 10000 100000] [--excel-ate 10000]
+# ==============================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_excel import gerar_registros
+from consultor_uff.excel import gerar_excel_completo
+from consultor_uff.exportacao import FORMATOS_EXPORTACAO, formato_disponivel, gerar_exportacao
+from consultor_uff.resultados import montar_dataframe_resultado
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    buffer = funcao()
+    return time.perf_counter() - inicio, len(buffer.getvalue()) / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos formatos de exportação')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--excel-ate', type=int, default=10000,
+                        help='maior quantidade de linhas em que a planilha Excel também é medida')
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'formato':>8} {'tempo (ms)':>11} {'arquivo (MB)':>13}")
+    for linhas in args.linhas:
+        df = montar_dataframe_resultado(gerar_registros(linhas))
+        medicoes = [(formato, lambda formato=formato: gerar_exportacao(df, formato))
+                    for formato in FORMATOS_EXPORTACAO if formato_disponivel(formato)]
+        if linhas <= args.excel_ate:
+            medicoes.append(('xlsx', lambda: gerar_excel_completo(df, '2026.1')))
+
+        for formato, funcao in medicoes:
+            duracao, tamanho = medir(funcao)
+            print(f"{linhas:8d} {formato:>8} {duracao * 1000:11.1f} {tamanho:13.2f}")
+
+    indisponiveis = [formato for formato in FORMATOS_EXPORTACAO if not formato_disponivel(formato)]
+    if indisponiveis:
+        print(f"\nnão medidos (pyarrow ausente): {', '.join(indisponiveis)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# ==============================================
+# MICRO-BENCHMARK - EXTRAÇÃO DAS PÁGINAS DE TURMA
+# Compara o extrator BeautifulSoup (referência) com o extrator lxml:
+# os registros montados precisam ser idênticos em todo o corpus.
+#
+# Uso: python benchmarks/bench_extrator.py [--paginas 200] [--corpus pasta_com_html]
+# ==============================================
+
+import argparse
+import glob
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.WARNING)
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta, montar_registros
+
+CURSOS_VAGAS = [
+    '028 - Química', '029 - Química Industrial', '027 - Engenharia Química', '015 - Farmácia',
+    '025 - Física', '043', '020 -', '312 - Ciência da Computação',
+]
+TITULOS = [
+    'Turma {turma} de {codigo} - {nome}',
+    '{codigo} - {nome} - Turma {turma}',
+    '{codigo} {nome} - Turma {turma}',
+    'Turma {turma} - {codigo} {nome}',
+]
+
+
+def gerar_pagina(i, aleatorio):
+    """Página de turma sintética no layout do quadro de horários, com menus, scripts e rodapé"""
+    codigo = f"{aleatorio.choice(['GQI', 'GQO', 'GFQ', 'GQA', 'GMA'])}{i:05d}"
+    titulo = aleatorio.choice(TITULOS).format(turma=f"{'ABC'[i % 3]}{i % 4}", codigo=codigo,
+                                              nome=f"Química Geral {i}")
+    menu = ''.join(f'<li class="nav-item"><a class="nav-link" href="/menu/{k}">Item {k}</a></li>'
+                   for k in range(60))
+    horarios = ''.join(f'<td>{"08:00-10:00" if aleatorio.random() < 0.4 else ""}</td>' for _ in range(6))
+    linhas = []
+    for curso in aleatorio.sample(CURSOS_VAGAS, aleatorio.randint(0, 5)):
+        numeros = [aleatorio.randint(0, 60) for _ in range(6)]
+        celulas = ''.join(f'<td> {n} </td>' for n in numeros[:aleatorio.choice([4, 6, 6])])
+        linhas.append(f'<tr><td>{curso}</td>{celulas}</tr>')
+
+    # Parte das páginas sem título "Vagas alocadas": cai na busca por tabela com "vagas" e "reg"
+    cabecalho_vagas = '<h4><strong>Vagas Alocadas</strong></h4>' if i % 5 else '<p>Distribuição</p>'
+    return f"""<!DOCTYPE html>
+<html lang="pt-br"><head><meta charset="utf-8"><title>Quadro de Horários</title>
+<script>var dados = {{"vagas": "reg"}};</script><style>h1 {{ color: #333; }}</style></head>
+<body><nav><ul class="navbar-nav">{menu}</ul></nav>
+<div class="container"><h1>{titulo}</h1>
+<!-- turma {i} -->
+<div class="card"><h5 class="card-title">Horários da Turma</h5>
+<table class="table"><tr><th>Segunda</th><th>Terça</th><th>Quarta</th><th>Quinta</th><th>Sexta</th><th>Sábado</th></tr>
+<tr>{horarios}</tr></table></div>
+<div class="card">{cabecalho_vagas}
+<table class="table table-striped"><thead><tr><th>Curso</th><th>Vagas Reg.</th><th>Vagas Vest.</th>
+<th>Inscritos Reg.</th><th>Inscritos Vest.</th><th>Excedentes</th><th>Candidatos</th></tr></thead>
+<tbody>{''.join(linhas)}</tbody></table></div>
+<div class="card"><b>Docentes</b><table><tr><td>Prof. {i}</td></tr></table></div>
+</div><footer>{'<p>Universidade Federal Fluminense</p>' * 20}</footer></body></html>""".encode('utf-8')
+
+
+def carregar_corpus(args):
+    if args.corpus:
+        paginas = []
+        for caminho in sorted(glob.glob(os.path.join(args.corpus, '*.htm*'))):
+            with open(caminho, 'rb') as arquivo:
+                paginas.append(arquivo.read())
+        return paginas
+    aleatorio = random.Random(42)
+    return [gerar_pagina(i, aleatorio) for i in range(args.paginas)]
+
+
+def extrair_registros(consultor, paginas, opcoes):
+    registros = []
+    for i, pagina in enumerate(paginas):
+        ficha = consultor.analisar_pagina_turma(pagina, opcoes)
+        registros.append(montar_registros(ficha, f"turma-{i}", 'Química', '20261', None, opcoes))
+    return registros
+
+
+def medir(consultor, paginas, opcoes, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = extrair_registros(consultor, paginas, opcoes)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos extratores de páginas de turma')
+    parser.add_argument('--paginas', type=int, default=200, help='tamanho do corpus sintético')
+    parser.add_argument('--corpus', help='pasta com páginas de turma salvas (.html) no lugar do corpus sintético')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    paginas = carregar_corpus(args)
+    if not paginas:
+        parser.error('corpus vazio')
+
+    cache = CacheHTTP(':memory:')
+    consultores = {
+        nome: ConsultorQuadroHorariosUFFDetalhado(extrator=nome, cache_http=cache)
+        for nome in ('bs4', 'lxml')
+    }
+    combinacoes_opcoes = [
+        OpcoesConsulta(),
+        OpcoesConsulta(cursos_selecionados=('Química', 'Farmácia'), mostrar_outros_cursos=True),
+        OpcoesConsulta(apenas_cursos_quimica=False),
+    ]
+
+    for opcoes in combinacoes_opcoes:
+        tempos = {}
+        resultados = {}
+        for nome, consultor in consultores.items():
+            tempos[nome], resultados[nome] = medir(consultor, paginas, opcoes, args.repeticoes)
+        assert resultados['bs4'] == resultados['lxml'], "extratores produziram registros diferentes"
+
+        total_registros = sum(len(r) for r in resultados['bs4'])
+        print(f"{len(paginas)} páginas, {total_registros} registros ({opcoes})")
+        for nome, tempo in tempos.items():
+            print(f"  {nome:>5}: {tempo / len(paginas) * 1e3:8.3f} ms/página")
+        print(f"  ganho: {tempos['bs4'] / tempos['lxml']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
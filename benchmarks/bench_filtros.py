@@ -0,0 +1,83 @@
+# ==============================================
+# MICRO-BENCHMARK - FILTROS DA TABELA E ORDENAÇÕES DA ANÁLISE
+# Compara os filtros por máscara sobre uma cópia do DataFrame (e o sort
+# completo da análise detalhada) com o IndiceResultado, por interação.
+#
+# Uso: python benchmarks/bench_filtros.py [--linhas 10000 100000]
+# ==============================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_excel import gerar_registros
+from consultor_uff.filtros import IndiceResultado
+from consultor_uff.resultados import montar_dataframe_resultado
+
+COLUNAS_TABELA = [
+    'periodo', 'departamento', 'codigo_disciplina', 'nome_disciplina', 'turma', 'curso_vaga',
+    'vagas_reg', 'inscritos_reg', 'vagas_disponiveis_reg', 'vagas_vest', 'inscritos_vest',
+    'vagas_disponiveis_vest', 'excedentes', 'candidatos', 'total_vagas_disponiveis'
+]
+
+
+def filtrar_mascaras(df, curso, departamento):
+    """Filtro original da tabela completa: cópia e máscaras sucessivas"""
+    df_filtrado = df.copy()
+    df_filtrado = df_filtrado[df_filtrado['curso_vaga'] == curso]
+    df_filtrado = df_filtrado[df_filtrado['departamento'] == departamento]
+    df_filtrado = df_filtrado[df_filtrado['excedentes'] > 0]
+    return df_filtrado[COLUNAS_TABELA]
+
+
+def filtrar_indice(indice, curso, departamento):
+    return indice.linhas(indice.posicoes(curso=curso, departamento=departamento, vagas='com_excedentes'),
+                         COLUNAS_TABELA)
+
+
+def ordenar_copia(df, curso):
+    """Análise detalhada original: cópia do curso, sort completo e 20 primeiras linhas"""
+    return df[df['curso_vaga'] == curso].copy().sort_values('total_inscritos', ascending=False).head(20)
+
+
+def ordenar_indice(indice, curso):
+    return indice.linhas(indice.ordenadas('inscritos', indice.posicoes(curso=curso), limite=20))
+
+
+def medir_ms(funcao, *argumentos, repeticoes=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(*argumentos)
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos filtros e ordenações das tabelas do app')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'índice (ms)':>12} {'filtro máscaras':>16} {'filtro índice':>14} "
+          f"{'ordenação cópia':>16} {'ordenação índice':>17}")
+    for linhas in args.linhas:
+        df = montar_dataframe_resultado(gerar_registros(linhas))
+        curso, departamento = df['curso_vaga'].iloc[0], df['departamento'].iloc[0]
+
+        inicio = time.perf_counter()
+        indice = IndiceResultado(df)
+        montagem_ms = (time.perf_counter() - inicio) * 1000
+
+        print(f"{linhas:8d} {montagem_ms:12.1f} "
+              f"{medir_ms(filtrar_mascaras, df, curso, departamento):16.2f} "
+              f"{medir_ms(filtrar_indice, indice, curso, departamento):14.2f} "
+              f"{medir_ms(ordenar_copia, df, curso):16.2f} "
+              f"{medir_ms(ordenar_indice, indice, curso):17.2f}")
+
+    print("\níndice: montagem única por resultado; demais colunas: ms por interação")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# ==============================================
+# BENCHMARK - MEMÓRIA DO RESULTADO
+# Compara o DataFrame montado de uma lista de dicts (colunas object/str e
+# int64) com o RegistrosColunares (int32 e categorias): memória por 10 mil
+# registros do acumulador durante a consulta e do DataFrame guardado na sessão.
+#
+# Uso: python benchmarks/bench_memoria.py [--linhas 10000 100000]
+# ==============================================
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from bench_excel import gerar_registros
+from consultor_uff.resultados import COLUNAS_CONTAGEM, RegistrosColunares, montar_dataframe_resultado
+from consultor_uff.turma import calcular_colunas_derivadas
+
+
+def dataframe_de_dicts(registros):
+    """Montagem anterior: pd.DataFrame(dicts) e colunas derivadas em int64"""
+    df = pd.DataFrame(registros)
+    contagens = {
+        coluna: pd.to_numeric(df[coluna], errors='coerce').fillna(0).astype('int64')
+        for coluna in COLUNAS_CONTAGEM
+    }
+    return df.assign(**{**contagens, **calcular_colunas_derivadas(**contagens)})
+
+
+def registros_consulta(linhas):
+    """Registros sintéticos com a repetição de uma consulta real: a ficha de uma turma gera uma linha
+    por curso com as mesmas strings (URL, horários, curso da vaga); período e curso de origem são
+    os mesmos objetos em toda a consulta, e as demais strings são novas a cada página"""
+    globais = {}
+    por_turma = {}
+    registros = []
+    for registro in gerar_registros(linhas):
+        chave_turma = (registro['codigo_disciplina'], registro['turma'])
+        registro['url'] = f"https://app.uff.br/graduacao/quadrodehorarios/turmas/{chave_turma[0]}{chave_turma[1]}"
+        textos = por_turma.setdefault(chave_turma, {})
+        registros.append({
+            chave: (globais if chave in ('periodo', 'curso_origem_busca') else textos).setdefault(valor, valor)
+            if isinstance(valor, str) else valor
+            for chave, valor in registro.items()
+        })
+    return registros
+
+
+def medir_retido(funcao):
+    """(resultado, MB retidos pelo resultado) de funcao()"""
+    tracemalloc.start()
+    resultado = funcao()
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, atual / 2 ** 20
+
+
+def cronometrar(funcao, argumento):
+    inicio = time.perf_counter()
+    funcao(argumento)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memória do acumulador e do DataFrame de resultados')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'montagem':>10} {'acumulador (MB/10k)':>20} {'DataFrame (MB/10k)':>19} "
+          f"{'deep (MB/10k)':>14} {'tempo (s)':>10}")
+    for linhas in args.linhas:
+        por_10k = 10000 / linhas
+
+        # Os registros são gerados dentro da medição: o que sobra é só o que o resultado mantém vivo
+        _, lista_mb = medir_retido(lambda: registros_consulta(linhas))
+        _, colunas_mb = medir_retido(lambda: RegistrosColunares(registros_consulta(linhas)))
+
+        registros = registros_consulta(linhas)
+        for montagem, funcao, acumulador_mb in (
+            ('dicts', dataframe_de_dicts, lista_mb),
+            ('colunar', montar_dataframe_resultado, colunas_mb),
+        ):
+            df, df_mb = medir_retido(lambda: funcao(registros_consulta(linhas)))
+            deep_mb = df.memory_usage(deep=True).sum() / 2 ** 20
+            duracao = cronometrar(funcao, registros)
+            print(f"{linhas:8d} {montagem:>10} {acumulador_mb * por_10k:20.2f} {df_mb * por_10k:19.2f} "
+                  f"{deep_mb * por_10k:14.2f} {duracao:10.3f}")
+            del df
+
+    print("\nacumulador: memória retida pelos registros durante a consulta (lista de dicts x RegistrosColunares)")
+    print("DataFrame: memória retida pelo resultado guardado em st.session_state.dados_turmas")
+    print("deep: DataFrame.memory_usage(deep=True), que conta cada string de novo em cada linha")
+    print("tempo: montagem do DataFrame a partir dos dicts")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# ==============================================
+# MICRO-BENCHMARK - DEDUPLICAÇÃO DE REGISTROS
+# Compara a varredura aninhada original com o RegistrosTurmas indexado
+#
+# Uso: python benchmarks/bench_registros.py [--max 100000]
+# ==============================================
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from consultor_uff.registros import RegistrosTurmas
+
+CURSOS = ['028 - Química', '029 - Química Industrial', '027 - Engenharia Química', '015 - Farmácia']
+
+
+def gerar_registros(quantidade, taxa_duplicados=0.2, semente=42):
+    """Gera registros sintéticos com uma fração de chaves repetidas"""
+    aleatorio = random.Random(semente)
+    unicos = max(1, int(quantidade * (1 - taxa_duplicados)))
+    registros = []
+    for i in range(quantidade):
+        n = i if i < unicos else aleatorio.randrange(unicos)
+        registros.append({
+            'periodo': '2026' + str(1 + n % 2),
+            'codigo_disciplina': f"GQI{n // 8:05d}",
+            'turma': f"A{n % 2}",
+            'curso_vaga': CURSOS[(n // 2) % len(CURSOS)],
+            'vagas_reg': n % 40,
+        })
+    return registros
+
+
+def deduplicar_varredura(registros):
+    """Deduplicação original: compara cada registro novo com todos os anteriores"""
+    todas_turmas = []
+    for turma in registros:
+        duplicado = False
+        for existente in todas_turmas:
+            if (existente['codigo_disciplina'] == turma['codigo_disciplina'] and
+                existente['turma'] == turma['turma'] and
+                existente['curso_vaga'] == turma['curso_vaga'] and
+                existente['periodo'] == turma['periodo']):
+                duplicado = True
+                break
+        if not duplicado:
+            todas_turmas.append(turma)
+    return todas_turmas
+
+
+def deduplicar_indexado(registros):
+    return RegistrosTurmas(registros).como_lista()
+
+
+def medir(funcao, registros):
+    inicio = time.perf_counter()
+    resultado = funcao(registros)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de deduplicação de registros de turmas')
+    parser.add_argument('--max', type=int, default=100000, help='maior quantidade de registros testada')
+    parser.add_argument('--max-varredura', type=int, default=10000,
+                        help='limite para a varredura quadrática (acima disso só o indexado roda)')
+    args = parser.parse_args()
+
+    tamanhos = [n for n in (1000, 2000, 5000, 10000, 20000, 50000, 100000) if n <= args.max]
+    print(f"{'registros':>10} {'varredura (s)':>14} {'indexado (s)':>13} {'µs/registro':>12}")
+    for n in tamanhos:
+        registros = gerar_registros(n)
+        t_idx, r_idx = medir(deduplicar_indexado, registros)
+        if n <= args.max_varredura:
+            t_var, r_var = medir(deduplicar_varredura, registros)
+            assert r_var == r_idx, "resultados divergentes"
+            varredura = f"{t_var:14.4f}"
+        else:
+            varredura = f"{'-':>14}"
+        print(f"{n:>10} {varredura} {t_idx:13.4f} {t_idx / n * 1e6:12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+# ==============================================
+# SERVIDOR FALSO DO QUADRO DE HORÁRIOS
+# Imita as páginas de busca (table.table + ul.pagination) e as páginas
+# /turmas/<id> (Horários da turma + Vagas alocadas) do app.uff.br, com
+# tamanho, latência, jitter e taxa de erros configuráveis.
+#
+# Uso: python benchmarks/servidor_falso.py [--porta 8765] [--turmas 120] [--latencia 0.05]
+#      CONSULTOR_UFF_BASE_URL=http://127.0.0.1:8765/graduacao/quadrodehorarios/ streamlit run app_consultor_vagas.py
+# ==============================================
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CAMINHO_QUADRO = '/graduacao/quadrodehorarios/'
+DEPARTAMENTOS = ['GQI', 'GQO', 'GQA', 'GFQ', 'GMA', 'GFI']
+CURSOS_VAGAS = {
+    '28': '028 - Química',
+    '29': '029 - Química Industrial',
+    '27': '027 - Engenharia Química',
+    '15': '015 - Farmácia',
+}
+OUTROS_CURSOS = ['025 - Física', '020 - Matemática', '043 - Engenharia Civil']
+DIAS = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
+
+
+class QuadroFalso:
+    """Catálogo determinístico de turmas: quais turmas cada busca lista e o conteúdo de cada página"""
+
+    def __init__(self, turmas_por_busca=120, por_pagina=20, sobreposicao=0.5, semente=42):
+        self.turmas_por_busca = turmas_por_busca
+        self.por_pagina = por_pagina
+        # Fração das turmas de um período listada por todos os cursos (turmas compartilhadas)
+        self.sobreposicao = sobreposicao
+        self.semente = semente
+
+    def turmas_da_busca(self, id_curso, periodo, filtro=''):
+        """IDs das turmas listadas para curso × período, restritos ao departamento do filtro"""
+        compartilhadas = int(self.turmas_por_busca * self.sobreposicao)
+        ids = [f"{periodo}{k:05d}" for k in range(compartilhadas)]
+        base_curso = 10000 + int(id_curso or 0) * 1000
+        ids += [f"{periodo}{base_curso + k:05d}" for k in range(self.turmas_por_busca - compartilhadas)]
+
+        # Busca por departamento ("GQI00") ou por código de disciplina ("GQI00061")
+        filtro = (filtro or '').strip().upper()
+        if filtro:
+            ids = [i for i in ids if filtro in self._codigo_disciplina(i)]
+        return ids
+
+    def _aleatorio(self, *partes):
+        return random.Random(f"{self.semente}:{':'.join(map(str, partes))}")
+
+    def _codigo_disciplina(self, id_turma):
+        numero = int(id_turma[-5:])
+        return f"{DEPARTAMENTOS[numero % len(DEPARTAMENTOS)]}00{numero // len(DEPARTAMENTOS) % 1000:03d}"
+
+    def pagina_listagem(self, id_curso, periodo, filtro, pagina):
+        ids = self.turmas_da_busca(id_curso, periodo, filtro)
+        total_paginas = max(1, -(-len(ids) // self.por_pagina))
+        pagina = max(1, pagina)
+        trecho = ids[(pagina - 1) * self.por_pagina:pagina * self.por_pagina]
+
+        linhas = ''.join(
+            f'<tr><td>{self._codigo_disciplina(i)}</td>'
+            f'<td><a href="{CAMINHO_QUADRO}turmas/{i}">Turma {i}</a></td></tr>'
+            for i in trecho
+        )
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Quadro de Horários</title></head><body>'
+            '<div class="container"><table class="table table-striped">'
+            f'<thead><tr><th>Disciplina</th><th>Turma</th></tr></thead><tbody>{linhas}</tbody></table>'
+            f'{self._paginacao(pagina, total_paginas)}</div></body></html>'
+        )
+
+    @staticmethod
+    def _paginacao(pagina, total_paginas):
+        """Paginação no formato do will_paginate: janela de páginas, reticências e li.next"""
+        if total_paginas <= 1:
+            return ''
+        visiveis = sorted({1, 2, total_paginas - 1, total_paginas} |
+                          set(range(max(1, pagina - 2), min(total_paginas, pagina + 2) + 1)))
+        itens = []
+        anterior = None
+        for numero in visiveis:
+            if numero < 1 or numero > total_paginas:
+                continue
+            if anterior and numero - anterior > 1:
+                itens.append('<li class="disabled"><a href="#">&hellip;</a></li>')
+            classe = ' class="active"' if numero == pagina else ''
+            itens.append(f'<li{classe}><a href="?page={numero}">{numero}</a></li>')
+            anterior = numero
+        if pagina >= total_paginas:
+            proxima = '<li class="next disabled"><a href="#">Próxima &rarr;</a></li>'
+        else:
+            proxima = f'<li class="next"><a rel="next" href="?page={pagina + 1}">Próxima &rarr;</a></li>'
+        return f'<ul class="pagination">{"".join(itens)}{proxima}</ul>'
+
+    def pagina_turma(self, id_turma):
+        aleatorio = self._aleatorio('turma', id_turma)
+        codigo = self._codigo_disciplina(id_turma)
+        horarios = ''.join(
+            f'<td>{aleatorio.choice(["07:00-09:00", "09:00-11:00", "14:00-16:00"]) if aleatorio.random() < 0.3 else ""}</td>'
+            for _ in DIAS
+        )
+        cursos = aleatorio.sample(list(CURSOS_VAGAS.values()), aleatorio.randint(1, 3))
+        cursos += aleatorio.sample(OUTROS_CURSOS, aleatorio.randint(0, 2))
+        vagas = ''.join(
+            f'<tr><td>{curso}</td>' + ''.join(f'<td>{aleatorio.randint(0, 40)}</td>' for _ in range(6)) + '</tr>'
+            for curso in cursos
+        )
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Turma</title></head><body>'
+            f'<div class="container"><h1>Turma {"ABC"[int(id_turma) % 3]}1 de {codigo} - Disciplina {codigo[-3:]}</h1>'
+            '<h3>Horários da turma</h3><table class="table">'
+            f'<tr>{"".join(f"<th>{dia}</th>" for dia in DIAS)}</tr><tr>{horarios}</tr></table>'
+            '<h3>Vagas alocadas</h3><table class="table"><tr><th>Curso</th><th>Vagas Reg.</th>'
+            '<th>Vagas Vest.</th><th>Inscritos Reg.</th><th>Inscritos Vest.</th><th>Excedentes</th>'
+            f'<th>Candidatos</th></tr>{vagas}</table></div></body></html>'
+        )
+
+
+class ManipuladorQuadro(BaseHTTPRequestHandler):
+    """Responde buscas e turmas do QuadroFalso do servidor, com ETag e GET condicional"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        servidor = self.server
+        servidor.contar('requisicoes')
+        atraso = servidor.latencia + servidor.aleatorio.uniform(-servidor.jitter, servidor.jitter)
+        time.sleep(max(0.0, atraso))
+
+        if servidor.aleatorio.random() < servidor.taxa_erro:
+            servidor.contar('erros')
+            self._responder(503, b'Servico temporariamente indisponivel')
+            return
+
+        url = urlparse(self.path)
+        if url.path.startswith(CAMINHO_QUADRO + 'turmas/'):
+            servidor.contar('turmas')
+            corpo = servidor.quadro.pagina_turma(url.path.rsplit('/', 1)[-1])
+        elif url.path.rstrip('/') == CAMINHO_QUADRO.rstrip('/'):
+            servidor.contar('listagens')
+            consulta = parse_qs(url.query)
+            corpo = servidor.quadro.pagina_listagem(
+                consulta.get('q[vagas_turma_curso_idcurso_eq]', [''])[0],
+                consulta.get('q[anosemestre_eq]', ['20252'])[0],
+                consulta.get('q[disciplina_nome_or_disciplina_codigo_cont]', [''])[0],
+                int(consulta.get('page', ['1'])[0] or 1)
+            )
+        else:
+            self._responder(404, b'Not Found')
+            return
+
+        corpo = corpo.encode('utf-8')
+        etag = 'W/"%s"' % hashlib.md5(corpo).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            servidor.contar('nao_modificadas')
+            self._responder(304, b'', {'ETag': etag})
+            return
+        self._responder(200, corpo, {'ETag': etag, 'Content-Type': 'text/html; charset=utf-8'})
+
+    def _responder(self, status, corpo, cabecalhos=None):
+        self.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        if corpo:
+            self.wfile.write(corpo)
+
+
+class ServidorQuadroFalso(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, porta=0, quadro=None, latencia=0.05, jitter=0.02, taxa_erro=0.0, semente=42):
+        super().__init__(('127.0.0.1', porta), ManipuladorQuadro)
+        self.quadro = quadro or QuadroFalso(semente=semente)
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_erro = taxa_erro
+        self.aleatorio = random.Random(semente)
+        self.contadores = {'requisicoes': 0, 'listagens': 0, 'turmas': 0, 'erros': 0, 'nao_modificadas': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}{CAMINHO_QUADRO}"
+
+    def contar(self, nome):
+        with self._lock:
+            self.contadores[nome] += 1
+
+    def iniciar_em_thread(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def argumentos_servidor(parser):
+    """Opções do servidor falso, compartilhadas com o benchmark de coleta"""
+    parser.add_argument('--turmas', type=int, default=120, help='turmas listadas por busca (curso × período)')
+    parser.add_argument('--por-pagina', type=int, default=20, help='turmas por página de resultados')
+    parser.add_argument('--sobreposicao', type=float, default=0.5,
+                        help='fração das turmas listada por todos os cursos')
+    parser.add_argument('--latencia', type=float, default=0.05, help='latência média por resposta (s)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='variação uniforme da latência (± s)')
+    parser.add_argument('--taxa-erro', type=float, default=0.0, help='fração de respostas 503')
+    parser.add_argument('--semente', type=int, default=42)
+
+
+def criar_servidor(args, porta=0):
+    quadro = QuadroFalso(args.turmas, args.por_pagina, args.sobreposicao, args.semente)
+    return ServidorQuadroFalso(porta, quadro, args.latencia, args.jitter, args.taxa_erro, args.semente)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local que imita o quadro de horários da UFF')
+    parser.add_argument('--porta', type=int, default=8765)
+    argumentos_servidor(parser)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args, args.porta)
+    print(servidor.base_url, flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
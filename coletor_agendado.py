@@ -0,0 +1,179 @@
+# ==============================================
+# COLETOR AGENDADO - CONSULTOR DE VAGAS UFF
+# Processo independente da interface: executa as consultas configuradas
+# (períodos × cursos × departamentos) em intervalos e grava cada resultado
+# no histórico, de onde o app carrega o último sem esperar o app.uff.br.
+#
+# Uso: python coletor_agendado.py --config coletor.json [--uma-vez]
+# ==============================================
+
+import argparse
+import json
+import logging
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, HistoricoVagas, OpcoesConsulta
+
+logger = logging.getLogger('coletor_agendado')
+
+EXEMPLO_CONFIGURACAO = {
+    'motor': 'sync',
+    'extrator': 'lxml',
+    'max_concorrencia': 6,
+    'requisicoes_por_segundo': 4.0,
+    'periodos_paralelos': 4,
+    'processos_analise': 0,
+    'timeout_tarefa': 60,
+    'tarefas': [
+        {
+            'nome': 'quimica-2026.1',
+            'periodos': ['20261'],
+            'cursos': ['Química', 'Química Industrial'],
+            'departamentos': ['TODOS'],
+            'intervalo_minutos': 30,
+        },
+    ],
+}
+
+
+@dataclass
+class TarefaColeta:
+    """Uma consulta configurada e seu intervalo de repetição"""
+    nome: str
+    periodos: list
+    cursos: list
+    departamentos: list = field(default_factory=lambda: ['TODOS'])
+    codigo_disciplina: str = None
+    intervalo_minutos: float = 30
+    apenas_cursos_quimica: bool = True
+    mostrar_outros_cursos: bool = False
+    incremental: bool = True
+
+    @property
+    def opcoes(self):
+        return OpcoesConsulta(
+            cursos_selecionados=self.cursos,
+            apenas_cursos_quimica=self.apenas_cursos_quimica,
+            mostrar_outros_cursos=self.mostrar_outros_cursos
+        )
+
+    @property
+    def departamentos_consulta(self):
+        """Departamentos no formato de consultar_vagas_completas ('TODOS' vira None)"""
+        return [None if depto in (None, 'TODOS') else depto for depto in self.departamentos] or [None]
+
+
+class ColetorAgendado:
+    """Executa as tarefas quando vencem e grava os resultados no histórico"""
+
+    def __init__(self, consultor, historico, tarefas):
+        self.consultor = consultor
+        self.historico = historico
+        self.tarefas = tarefas
+        self.proximas = {tarefa.nome: 0.0 for tarefa in tarefas}
+        self.parar = threading.Event()
+
+    def executar_tarefa(self, tarefa):
+        inicio = time.time()
+        logger.info("Iniciando %s", tarefa.nome)
+        dados = self.consultor.consultar_vagas_completas(
+            tarefa.periodos, tarefa.cursos, tarefa.departamentos_consulta, tarefa.codigo_disciplina,
+            opcoes=tarefa.opcoes,
+            incremental=tarefa.incremental,
+            deve_continuar=lambda: not self.parar.is_set()
+        )
+        if self.parar.is_set():
+            logger.warning("%s interrompida; resultado parcial descartado", tarefa.nome)
+            return
+        if not dados:
+            # Uma coleta vazia (servidor fora do ar, período ainda sem turmas) não esconde a última boa
+            logger.warning("%s não retornou registros; nada gravado no histórico", tarefa.nome)
+            return
+
+        consulta_id = self.historico.registrar(dados, parametros={
+            'origem': 'coletor',
+            'tarefa': tarefa.nome,
+            'periodos': tarefa.periodos,
+            'cursos': tarefa.cursos,
+            'departamentos': tarefa.departamentos_consulta,
+            'codigo_disciplina': tarefa.codigo_disciplina,
+        })
+        logger.info("%s concluída: %d registros em %.1f s (consulta %d)",
+                    tarefa.nome, len(dados), time.time() - inicio, consulta_id)
+
+    def rodar(self, uma_vez=False):
+        while not self.parar.is_set():
+            for tarefa in self.tarefas:
+                if self.parar.is_set():
+                    break
+                if self.proximas[tarefa.nome] > time.time():
+                    continue
+                try:
+                    self.executar_tarefa(tarefa)
+                except Exception:
+                    logger.exception("Falha na tarefa %s", tarefa.nome)
+                self.proximas[tarefa.nome] = time.time() + tarefa.intervalo_minutos * 60
+
+            if uma_vez:
+                break
+            espera = min(self.proximas.values()) - time.time()
+            self.parar.wait(max(1.0, espera))
+
+
+def carregar_configuracao(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        configuracao = json.load(arquivo)
+    tarefas = [TarefaColeta(**tarefa) for tarefa in configuracao.pop('tarefas', [])]
+    if not tarefas:
+        raise ValueError(f"Nenhuma tarefa configurada em {caminho}")
+    return configuracao, tarefas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coleta agendada de vagas do quadro de horários da UFF')
+    parser.add_argument('--config', help='arquivo JSON com as tarefas de coleta')
+    parser.add_argument('--uma-vez', action='store_true', help='executa cada tarefa uma vez e sai')
+    parser.add_argument('--historico', help='banco do histórico (padrão: CONSULTOR_UFF_HISTORICO)')
+    parser.add_argument('--exemplo', action='store_true', help='mostra um arquivo de configuração de exemplo')
+    args = parser.parse_args()
+
+    if args.exemplo:
+        print(json.dumps(EXEMPLO_CONFIGURACAO, ensure_ascii=False, indent=2))
+        return
+    if not args.config:
+        parser.error('--config é obrigatório')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    configuracao, tarefas = carregar_configuracao(args.config)
+
+    consultor = ConsultorQuadroHorariosUFFDetalhado(
+        motor=configuracao.get('motor', 'sync'),
+        extrator=configuracao.get('extrator'),
+        max_concorrencia=configuracao.get('max_concorrencia', 6),
+        requisicoes_por_segundo=configuracao.get('requisicoes_por_segundo', 4.0),
+        periodos_paralelos=configuracao.get('periodos_paralelos', 4),
+        processos_analise=configuracao.get('processos_analise', 0),
+        timeout_tarefa=configuracao.get('timeout_tarefa', 60),
+        base_url=configuracao.get('base_url'),
+        cache_http=CacheHTTP()
+    )
+    coletor = ColetorAgendado(consultor, HistoricoVagas(args.historico), tarefas)
+
+    def encerrar(sinal, quadro):
+        logger.info("Encerrando após a tarefa atual")
+        # Interrompe também a consulta em andamento, que verifica deve_continuar entre turmas
+        coletor.parar.set()
+
+    signal.signal(signal.SIGTERM, encerrar)
+    signal.signal(signal.SIGINT, encerrar)
+    try:
+        coletor.rodar(uma_vez=args.uma_vez)
+    finally:
+        consultor.encerrar_pool_analise()
+
+
+if __name__ == '__main__':
+    main()
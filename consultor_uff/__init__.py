@@ -0,0 +1,32 @@
+# ==============================================
+# CONSULTOR DE VAGAS UFF - COMPONENTES DE SUPORTE
+# Consultor, CLI e módulos independentes da interface Streamlit
+# ==============================================
+
+from consultor_uff.cache_http import CacheHTTP, EntradaCache
+from consultor_uff.consultor import MOTORES_CONSULTA, ConsultorQuadroHorariosUFFDetalhado
+from consultor_uff.eventos import EventoConsulta
+from consultor_uff.historico import HistoricoVagas
+from consultor_uff.limitador import LimitadorTaxa, obter_limitador
+from consultor_uff.opcoes import CODIGOS_CURSOS, AjustesConsulta, OpcoesConsulta
+from consultor_uff.registros import RegistrosTurmas, chave_registro
+from consultor_uff.turma import FichaTurma, MapaTurmasConsulta, montar_registros
+
+__all__ = [
+    'CODIGOS_CURSOS',
+    'MOTORES_CONSULTA',
+    'AjustesConsulta',
+    'CacheHTTP',
+    'ConsultorQuadroHorariosUFFDetalhado',
+    'EntradaCache',
+    'EventoConsulta',
+    'FichaTurma',
+    'HistoricoVagas',
+    'LimitadorTaxa',
+    'MapaTurmasConsulta',
+    'OpcoesConsulta',
+    'RegistrosTurmas',
+    'chave_registro',
+    'montar_registros',
+    'obter_limitador',
+]
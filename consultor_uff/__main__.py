@@ -0,0 +1,5 @@
+import sys
+
+from consultor_uff.cli import main
+
+sys.exit(main())
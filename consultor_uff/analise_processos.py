@@ -0,0 +1,59 @@
+# ===== ANÁLISE DO HTML EM PROCESSOS =====
+# Modo pipeline do consultor: as threads de E/S (ou corrotinas) baixam as
+# páginas e entregam os bytes a um pool de processos, que analisa o HTML fora
+# do GIL do processo principal e devolve só o resultado compacto: a ficha da
+# turma como tupla e, das páginas de resultados, os links e a paginação.
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from consultor_uff.turma import ficha_de_tupla
+
+# Consultor de cada processo do pool, criado uma única vez pelo inicializador
+_analisador = None
+
+
+def _inicializar_processo(extrator, base_url):
+    global _analisador
+    # Ctrl+C chega a todo o grupo de processos; quem decide parar a consulta é o processo principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from consultor_uff.cache_http import CacheHTTP
+    from consultor_uff.consultor import ConsultorQuadroHorariosUFFDetalhado
+
+    _analisador = ConsultorQuadroHorariosUFFDetalhado(extrator=extrator, base_url=base_url,
+                                                      cache_http=CacheHTTP(':memory:'))
+
+
+def analisar_turma_compacta(html_content, opcoes):
+    """Executada no processo do pool: ficha da página como tupla; None se a página for inválida"""
+    ficha = _analisador.analisar_pagina_turma(html_content, opcoes)
+    return None if ficha is None else ficha.como_tupla()
+
+
+def analisar_listagem(html_content):
+    """Executada no processo do pool: (links das turmas, tem próxima página, última página anunciada)"""
+    return _analisador.analisar_pagina_listagem(html_content)
+
+
+def criar_pool_analise(processos, extrator, base_url):
+    """Pool de processos de análise com o extrator e o endereço (para os links) do consultor
+
+    Os processos são iniciados com 'spawn': um fork do app copiaria locks presos pelas threads
+    de download e do Streamlit.
+    """
+    return ProcessPoolExecutor(
+        max_workers=processos,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_inicializar_processo,
+        initargs=(extrator, base_url)
+    )
+
+
+def analisar_no_pool(pool, html_content, opcoes):
+    """FichaTurma da página analisada em um processo do pool (bloqueia só a thread que chama)"""
+    return ficha_de_tupla(pool.submit(analisar_turma_compacta, html_content, opcoes).result())
+
+
+def analisar_listagem_no_pool(pool, html_content):
+    """analisar_pagina_listagem executada em um processo do pool"""
+    return pool.submit(analisar_listagem, html_content).result()
@@ -0,0 +1,208 @@
+# ===== CACHE HTTP PERSISTENTE =====
+# Guarda corpo, cabeçalhos, horário da coleta e validadores (ETag/Last-Modified)
+# de cada URL em SQLite, sobrevivendo entre consultas e reinícios do app.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_CACHE_PADRAO = os.environ.get(
+    'CONSULTOR_UFF_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'consultor_uff', 'paginas.sqlite3')
+)
+# Páginas e análises sem uso há mais que isso saem do banco (turmas de períodos antigos etc.)
+IDADE_MAXIMA_PADRAO = 7 * 24 * 3600
+
+
+@dataclass
+class EntradaCache:
+    """Página guardada no cache, com os validadores para revalidação condicional"""
+    url: str
+    conteudo: bytes
+    cabecalhos: dict = field(default_factory=dict)
+    obtido_em: float = 0.0
+    etag: str = None
+    last_modified: str = None
+    status_code: int = 200
+
+    @property
+    def content(self):
+        """Compatível com requests.Response.content"""
+        return self.conteudo
+
+    def cabecalhos_condicionais(self):
+        """Cabeçalhos para um GET condicional a partir dos validadores guardados"""
+        cabecalhos = {}
+        if self.etag:
+            cabecalhos['If-None-Match'] = self.etag
+        if self.last_modified:
+            cabecalhos['If-Modified-Since'] = self.last_modified
+        return cabecalhos
+
+
+class CacheHTTP:
+    """Cache de páginas em SQLite com TTL por classe de URL (listagem ou turma)
+
+    Vagas e inscritos mudam durante a inscrição, então a página de turma também expira em
+    5 minutos; depois disso é revalidada com GET condicional (ETag/Last-Modified), que custa
+    um 304 sem corpo quando nada mudou. Entradas mais velhas que idade_maxima são podadas.
+    """
+
+    def __init__(self, caminho=None, ttl_listagem=300, ttl_turma=300, idade_maxima=IDADE_MAXIMA_PADRAO):
+        self.caminho = caminho or CAMINHO_CACHE_PADRAO
+        self.ttls = {
+            'listagem': ttl_listagem,
+            'turma': ttl_turma,
+        }
+        self.idade_maxima = idade_maxima
+        self._lock = threading.Lock()
+        self._conexao = self._conectar()
+        self.podar()
+
+    def _conectar(self):
+        """Abre o banco do cache, caindo para memória se o disco não estiver disponível"""
+        try:
+            if self.caminho != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+            conexao = sqlite3.connect(self.caminho, check_same_thread=False, timeout=30)
+            if self.caminho != ':memory:':
+                conexao.execute('PRAGMA journal_mode=WAL')
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Cache persistente indisponível em %s (%s); usando memória", self.caminho, e)
+            self.caminho = ':memory:'
+            conexao = sqlite3.connect(':memory:', check_same_thread=False)
+
+        conexao.execute('''
+            CREATE TABLE IF NOT EXISTS paginas (
+                url TEXT PRIMARY KEY,
+                conteudo BLOB NOT NULL,
+                cabecalhos TEXT NOT NULL,
+                obtido_em REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        ''')
+        # Análise guardada de cada página de turma, para reaproveitar quando a impressão não muda
+        conexao.execute('''
+            CREATE TABLE IF NOT EXISTS analises (
+                url TEXT PRIMARY KEY,
+                impressao TEXT NOT NULL,
+                dados TEXT NOT NULL,
+                atualizado_em REAL NOT NULL
+            )
+        ''')
+        conexao.commit()
+        return conexao
+
+    @staticmethod
+    def classificar(url):
+        """Classe da URL para escolha do TTL"""
+        return 'turma' if '/turmas/' in url else 'listagem'
+
+    def ttl_para(self, url):
+        return self.ttls[self.classificar(url)]
+
+    def esta_fresca(self, entrada):
+        """Indica se a entrada ainda vale sem consultar o servidor"""
+        return time.time() - entrada.obtido_em < self.ttl_para(entrada.url)
+
+    def obter(self, url):
+        """Retorna a entrada guardada para a URL, fresca ou não"""
+        with self._lock:
+            linha = self._conexao.execute(
+                'SELECT conteudo, cabecalhos, obtido_em, etag, last_modified FROM paginas WHERE url = ?',
+                (url,)
+            ).fetchone()
+        if not linha:
+            return None
+        conteudo, cabecalhos, obtido_em, etag, last_modified = linha
+        return EntradaCache(url, conteudo, json.loads(cabecalhos), obtido_em, etag, last_modified)
+
+    def salvar(self, url, conteudo, cabecalhos):
+        """Guarda uma resposta 200 com seus validadores"""
+        cabecalhos = dict(cabecalhos or {})
+        entrada = EntradaCache(
+            url=url,
+            conteudo=conteudo,
+            cabecalhos=cabecalhos,
+            obtido_em=time.time(),
+            etag=_cabecalho(cabecalhos, 'ETag'),
+            last_modified=_cabecalho(cabecalhos, 'Last-Modified'),
+        )
+        with self._lock:
+            self._conexao.execute(
+                'INSERT OR REPLACE INTO paginas (url, conteudo, cabecalhos, obtido_em, etag, last_modified) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, entrada.conteudo, json.dumps(cabecalhos), entrada.obtido_em,
+                 entrada.etag, entrada.last_modified)
+            )
+            self._conexao.commit()
+        return entrada
+
+    def renovar(self, entrada, cabecalhos=None):
+        """Marca a entrada como recém-validada após um 304 Not Modified"""
+        cabecalhos = dict(cabecalhos or {})
+        entrada.obtido_em = time.time()
+        entrada.etag = _cabecalho(cabecalhos, 'ETag') or entrada.etag
+        entrada.last_modified = _cabecalho(cabecalhos, 'Last-Modified') or entrada.last_modified
+        with self._lock:
+            self._conexao.execute(
+                'UPDATE paginas SET obtido_em = ?, etag = ?, last_modified = ? WHERE url = ?',
+                (entrada.obtido_em, entrada.etag, entrada.last_modified, entrada.url)
+            )
+            self._conexao.commit()
+        return entrada
+
+    def obter_analise(self, url):
+        """Retorna (impressao, dados) da última análise guardada para a URL, ou None"""
+        with self._lock:
+            linha = self._conexao.execute(
+                'SELECT impressao, dados FROM analises WHERE url = ?', (url,)
+            ).fetchone()
+        if not linha:
+            return None
+        return linha[0], json.loads(linha[1])
+
+    def salvar_analise(self, url, impressao, dados):
+        """Guarda a análise de uma página junto com a impressão do conteúdo analisado"""
+        with self._lock:
+            self._conexao.execute(
+                'INSERT OR REPLACE INTO analises (url, impressao, dados, atualizado_em) VALUES (?, ?, ?, ?)',
+                (url, impressao, json.dumps(dados, ensure_ascii=False), time.time())
+            )
+            self._conexao.commit()
+
+    def podar(self, idade_maxima=None):
+        """Remove páginas e análises não atualizadas há mais de idade_maxima segundos; retorna quantas"""
+        idade_maxima = self.idade_maxima if idade_maxima is None else idade_maxima
+        if not idade_maxima:
+            return 0
+        limite = time.time() - idade_maxima
+        with self._lock:
+            paginas = self._conexao.execute('DELETE FROM paginas WHERE obtido_em < ?', (limite,)).rowcount
+            analises = self._conexao.execute('DELETE FROM analises WHERE atualizado_em < ?', (limite,)).rowcount
+            self._conexao.commit()
+        if paginas or analises:
+            logger.info("Cache podado: %d páginas e %d análises com mais de %ds", paginas, analises, idade_maxima)
+        return paginas + analises
+
+    def limpar(self):
+        """Remove todas as páginas e análises guardadas"""
+        with self._lock:
+            self._conexao.execute('DELETE FROM paginas')
+            self._conexao.execute('DELETE FROM analises')
+            self._conexao.commit()
+
+
+def _cabecalho(cabecalhos, nome):
+    """Busca um cabeçalho sem diferenciar maiúsculas de minúsculas"""
+    nome = nome.lower()
+    for chave, valor in cabecalhos.items():
+        if chave.lower() == nome:
+            return valor
+    return None
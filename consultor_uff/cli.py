@@ -0,0 +1,270 @@
+# ===== LINHA DE COMANDO =====
+# Executa uma consulta sem a interface e grava os registros em JSON Lines ou
+# CSV (saída padrão ou arquivo, à medida que as turmas chegam), na planilha
+# Excel do app ou em Parquet/Arrow IPC. Progresso e avisos vão para a saída de
+# erro, para uso em cron e testes de desempenho.
+#
+# Uso: python -m consultor_uff 2026.1 --cursos Química --formato csv > vagas.csv
+#      python -m consultor_uff 2022.1-2026.1 --formato parquet --saida vagas.parquet
+import argparse
+import contextlib
+import csv
+import json
+import os
+import signal
+import sys
+import threading
+
+from consultor_uff.cache_http import CacheHTTP
+from consultor_uff.consultor import MOTORES_CONSULTA, ConsultorQuadroHorariosUFFDetalhado
+from consultor_uff.extrator_lxml import EXTRATOR_PADRAO, EXTRATORES
+from consultor_uff.opcoes import CODIGOS_CURSOS, OpcoesConsulta
+from consultor_uff.registros import CAMPOS_REGISTRO
+from consultor_uff.validacao import (
+    MAX_PERIODOS_INTERVALO, descrever_periodos, formatar_periodo, intervalo_periodos, validar_codigo_disciplina,
+    validar_departamento, validar_periodo
+)
+
+FORMATOS_SAIDA = ('jsonl', 'csv', 'xlsx', 'parquet', 'arrow')
+FORMATOS_BINARIOS = ('xlsx', 'parquet', 'arrow')
+
+
+class EscritorJSONL:
+    """Um registro JSON por linha, gravado assim que a turma chega"""
+    incremental = True
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+
+    def escrever(self, registros):
+        for registro in registros:
+            self.arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self.arquivo.flush()
+
+    def fechar(self):
+        pass
+
+
+class EscritorCSV:
+    """CSV com cabeçalho nas colunas de montar_registros, gravado assim que a turma chega"""
+    incremental = True
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_REGISTRO, extrasaction='ignore')
+        self.escritor.writeheader()
+
+    def escrever(self, registros):
+        self.escritor.writerows(registros)
+        self.arquivo.flush()
+
+    def fechar(self):
+        pass
+
+
+class EscritorExcel:
+    """Grava a planilha completa do app com o resultado final da consulta"""
+    incremental = False
+
+    def __init__(self, arquivo, periodo_str):
+        self.arquivo = arquivo
+        self.periodo_str = periodo_str
+        self.registros = []
+
+    def escrever(self, registros):
+        self.registros.extend(registros)
+
+    def fechar(self):
+        # pandas e openpyxl só são carregados quando a planilha é pedida
+        from consultor_uff.excel import gerar_excel_completo
+        from consultor_uff.resultados import montar_dataframe_resultado
+
+        if not self.registros:
+            return
+        self.arquivo.write(gerar_excel_completo(montar_dataframe_resultado(self.registros), self.periodo_str)
+                           .getvalue())
+        self.arquivo.flush()
+
+
+class EscritorColunar:
+    """Grava o resultado final em Parquet ou Arrow IPC, nas colunas da planilha"""
+    incremental = False
+
+    def __init__(self, arquivo, formato):
+        self.arquivo = arquivo
+        self.formato = formato
+        self.registros = []
+
+    def escrever(self, registros):
+        self.registros.extend(registros)
+
+    def fechar(self):
+        from consultor_uff.exportacao import gerar_exportacao
+        from consultor_uff.resultados import montar_dataframe_resultado
+
+        if not self.registros:
+            return
+        self.arquivo.write(gerar_exportacao(montar_dataframe_resultado(self.registros), self.formato).getvalue())
+        self.arquivo.flush()
+
+
+def normalizar_periodo(periodo):
+    """'2025.2' ou '20252' -> '20252'; None se inválido"""
+    periodo = periodo.strip()
+    if validar_periodo(formatar_periodo(periodo)):
+        return formatar_periodo(periodo).replace('.', '')
+    return None
+
+
+def expandir_periodos(argumento):
+    """'2025.2' -> ['20252']; '2022.1-2026.1' -> todos os períodos do intervalo; None se inválido"""
+    inicio, separador, fim = argumento.partition('-')
+    if not separador:
+        periodo = normalizar_periodo(argumento)
+        return [periodo] if periodo else None
+    intervalo = intervalo_periodos(formatar_periodo(inicio.strip()), formatar_periodo(fim.strip()))
+    return [periodo.replace('.', '') for periodo in intervalo] or None
+
+
+def abrir_saida(caminho, binario=False):
+    """Arquivo de saída; '-' é a saída padrão, que não é fechada ao final"""
+    if caminho == '-':
+        return contextlib.nullcontext(sys.stdout.buffer if binario else sys.stdout)
+    if binario:
+        return open(caminho, 'wb')
+    return open(caminho, 'w', encoding='utf-8', newline='')
+
+
+def criar_escritor(formato, arquivo, periodo_str):
+    if formato == 'jsonl':
+        return EscritorJSONL(arquivo)
+    if formato == 'csv':
+        return EscritorCSV(arquivo)
+    if formato == 'xlsx':
+        return EscritorExcel(arquivo, periodo_str)
+    return EscritorColunar(arquivo, formato)
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m consultor_uff',
+        description='Consulta vagas e excedentes no quadro de horários da UFF sem a interface'
+    )
+    parser.add_argument('periodos', nargs='+',
+                        help='períodos no formato AAAA.S (ex.: 2025.2) ou intervalos INÍCIO-FIM (ex.: 2022.1-2026.1)')
+    parser.add_argument('--cursos', nargs='+', default=['Química', 'Química Industrial'],
+                        choices=list(CODIGOS_CURSOS), metavar='CURSO',
+                        help=f"cursos da busca ({', '.join(CODIGOS_CURSOS)})")
+    parser.add_argument('--departamentos', nargs='+', default=['TODOS'], metavar='SIGLA',
+                        help='siglas de departamento (ex.: GQI) ou TODOS')
+    parser.add_argument('--disciplina', help='código completo de uma disciplina (ex.: GQI00061)')
+    parser.add_argument('--outros-cursos', action='store_true',
+                        help='inclui vagas de cursos fora da seleção')
+    parser.add_argument('--formato', choices=FORMATOS_SAIDA, default='jsonl')
+    parser.add_argument('--saida', default='-', help='arquivo de saída (padrão: saída padrão)')
+    parser.add_argument('--motor', choices=list(MOTORES_CONSULTA), default='sync')
+    parser.add_argument('--extrator', choices=list(EXTRATORES), default=EXTRATOR_PADRAO)
+    parser.add_argument('--concorrencia', type=int, default=6, help='requisições simultâneas')
+    parser.add_argument('--taxa', type=float, default=4.0, help='requisições por segundo ao servidor')
+    parser.add_argument('--periodos-paralelos', type=int, default=4,
+                        help='períodos consultados ao mesmo tempo, com a mesma concorrência e taxa')
+    parser.add_argument('--processos', type=int, default=0,
+                        help='processos que analisam o HTML baixado (0 = nas próprias threads de download)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='revalida as turmas e só reanalisa as que mudaram')
+    parser.add_argument('--cache', help='banco do cache de páginas (padrão: CONSULTOR_UFF_CACHE)')
+    parser.add_argument('--sem-cache', action='store_true', help='não reaproveita páginas de execuções anteriores')
+    parser.add_argument('--base-url', help='endereço do quadro de horários (padrão: CONSULTOR_UFF_BASE_URL)')
+    parser.add_argument('-q', '--silencioso', action='store_true', help='não mostra progresso nem avisos')
+    return parser
+
+
+def exibir_evento(evento):
+    """Eventos da consulta como linhas na saída de erro"""
+    if evento.tipo in ('info', 'aviso', 'nota') or (evento.tipo == 'progresso' and evento.nivel == 'consulta'
+                                                    and evento.mensagem):
+        print(evento.mensagem, file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    periodos = []
+    for argumento in args.periodos:
+        expandidos = expandir_periodos(argumento)
+        if expandidos is None:
+            parser.error(f"período inválido: {argumento} (use AAAA.S ou AAAA.S-AAAA.S)")
+        if len(expandidos) > MAX_PERIODOS_INTERVALO:
+            parser.error(f"intervalo com {len(expandidos)} períodos: {argumento} (máximo {MAX_PERIODOS_INTERVALO})")
+        periodos.extend(periodo for periodo in expandidos if periodo not in periodos)
+    departamentos = [depto.strip().upper() for depto in args.departamentos]
+    invalidos = [depto for depto in departamentos if not validar_departamento(depto)]
+    if invalidos:
+        parser.error(f"departamento inválido: {invalidos[0]} (use a sigla de 3 letras ou TODOS)")
+    if args.disciplina and not validar_codigo_disciplina(args.disciplina):
+        parser.error(f"código de disciplina inválido: {args.disciplina} (ex.: GQI00061)")
+    if args.formato in FORMATOS_BINARIOS and args.saida == '-' and sys.stdout.isatty():
+        parser.error(f"informe --saida para gravar o arquivo {args.formato}")
+    if args.formato in ('parquet', 'arrow'):
+        from consultor_uff.exportacao import formato_disponivel
+
+        if not formato_disponivel(args.formato):
+            parser.error(f"o formato {args.formato} requer o pacote 'pyarrow' (pip install pyarrow)")
+
+    consultor = ConsultorQuadroHorariosUFFDetalhado(
+        motor=args.motor,
+        extrator=args.extrator,
+        max_concorrencia=args.concorrencia,
+        requisicoes_por_segundo=args.taxa,
+        periodos_paralelos=args.periodos_paralelos,
+        processos_analise=args.processos,
+        base_url=args.base_url,
+        cache_http=CacheHTTP(':memory:' if args.sem_cache else args.cache)
+    )
+    opcoes = OpcoesConsulta(cursos_selecionados=args.cursos, mostrar_outros_cursos=args.outros_cursos)
+
+    # Ctrl+C/SIGTERM interrompem a consulta, mas o que já foi coletado ainda é gravado; os
+    # tratadores anteriores voltam ao final, para quem chama main() de dentro de outro programa
+    interrompido = threading.Event()
+    tratadores_anteriores = {
+        sinal: signal.signal(sinal, lambda numero, quadro: interrompido.set())
+        for sinal in (signal.SIGINT, signal.SIGTERM)
+    }
+
+    try:
+        with abrir_saida(args.saida, binario=args.formato in FORMATOS_BINARIOS) as arquivo:
+            escritor = criar_escritor(args.formato, arquivo, descrever_periodos(periodos))
+
+            def ao_evento(evento):
+                if evento.tipo == 'registros':
+                    if escritor.incremental:
+                        escritor.escrever(evento.registros)
+                elif not args.silencioso:
+                    exibir_evento(evento)
+
+            dados = consultor.consultar_vagas_completas(
+                periodos, args.cursos,
+                [None if depto == 'TODOS' else depto for depto in departamentos] or [None],
+                codigo_disciplina=args.disciplina.strip().upper() if args.disciplina else None,
+                opcoes=opcoes,
+                incremental=args.incremental,
+                ao_evento=ao_evento,
+                deve_continuar=lambda: not interrompido.is_set()
+            )
+            if not escritor.incremental:
+                escritor.escrever(dados)
+            escritor.fechar()
+    except BrokenPipeError:
+        # Quem lia a saída padrão fechou antes do fim (ex.: `| head`); descarta o restante
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        consultor.encerrar_pool_analise()
+        for sinal, tratador in tratadores_anteriores.items():
+            signal.signal(sinal, tratador)
+
+    if not args.silencioso:
+        print(f"{len(dados)} registros{' (consulta interrompida)' if interrompido.is_set() else ''}",
+              file=sys.stderr)
+    return 130 if interrompido.is_set() else 0
@@ -0,0 +1,737 @@
+# ===== CONSULTOR DO QUADRO DE HORÁRIOS =====
+# Raspagem das buscas e páginas de turma do app.uff.br, sem dependência da
+# interface: progresso e avisos saem pelo callback ao_evento e a interrupção
+# é pedida por deve_continuar(). Usado pelo app, pelo coletor e pela CLI.
+import copy
+import logging
+import os
+import queue
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+
+from consultor_uff.analise_processos import analisar_listagem_no_pool, analisar_no_pool, criar_pool_analise
+from consultor_uff.cache_http import CacheHTTP
+from consultor_uff.eventos import emissor, entregar_sem_repeticao, registrar_evento_no_log
+from consultor_uff.extrator_lxml import EXTRATOR_PADRAO, EXTRATORES, analisar_turma_lxml
+from consultor_uff.limitador import obter_limitador
+from consultor_uff.motor_async import MotorAsync
+from consultor_uff.opcoes import OPCOES_SEM_FILTRO, AjustesConsulta, OpcoesConsulta
+from consultor_uff.paginacao import paginas_a_agendar, url_pagina
+from consultor_uff.registros import RegistrosTurmas
+from consultor_uff.turma import (
+    DIAS_SEMANA, FichaTurma, MapaTurmasConsulta, formatar_horarios, impressao_pagina, interpretar_linha_vagas,
+    interpretar_titulo, montar_registros
+)
+from consultor_uff.validacao import formatar_periodo
+
+logger = logging.getLogger(__name__)
+
+MOTORES_CONSULTA = {
+    'sync': 'Síncrono (threads)',
+    'async': 'Assíncrono (asyncio)',
+}
+
+# Endereço do quadro de horários; pode apontar para um servidor local em benchmarks e testes
+URL_QUADRO_PADRAO = os.environ.get('CONSULTOR_UFF_BASE_URL', 'https://app.uff.br/graduacao/quadrodehorarios/')
+
+RE_PARAMETRO_PAGINA = re.compile(r'[?&]page=(\d+)')
+
+# Das páginas de resultados só interessam a tabela de turmas, a paginação (ul)
+# e os links avulsos usados quando a tabela não existe
+ESTRUTURA_LISTAGEM = SoupStrainer(['table', 'ul', 'a'])
+
+
+class ConsultorQuadroHorariosUFFDetalhado:
+    def __init__(self, apenas_cursos_quimica=True, mostrar_outros_cursos=False, cursos_selecionados=None,
+                 max_concorrencia=6, requisicoes_por_segundo=4.0, motor='sync', timeout_tarefa=60,
+                 cache_http=None, ttl_listagem=300, ttl_turma=300, extrator=None,
+                 base_url=None, periodos_paralelos=4, processos_analise=0):
+        if motor not in MOTORES_CONSULTA:
+            raise ValueError(f"Motor de consulta desconhecido: {motor}")
+        extrator = extrator or EXTRATOR_PADRAO
+        if extrator not in EXTRATORES:
+            raise ValueError(f"Extrator de turmas desconhecido: {extrator}")
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        })
+
+        self.base_url = base_url or URL_QUADRO_PADRAO
+        # Cache persistente de páginas (SQLite), revalidado com GET condicional
+        self.cache = cache_http or CacheHTTP(ttl_listagem=ttl_listagem, ttl_turma=ttl_turma)
+        self._avisos_thread = threading.local()
+
+        # Taxa de requisições compartilhada por host; a concorrência vem dos ajustes de cada consulta
+        self.limitador = obter_limitador(urlparse(self.base_url).netloc, taxa=requisicoes_por_segundo)
+
+        # Motor 'async' usa corrotinas sobre um cliente aiohttp; 'sync' usa requests.Session + threads
+        self.motor = motor
+        # aiohttp.TraceConfig extras repassados ao motor assíncrono (instrumentação de latência)
+        self.trace_configs_async = []
+
+        # Extrator das páginas de turma: 'bs4' (referência) ou 'lxml' (XPath compilado), para testes A/B
+        self.extrator = extrator
+
+        # Modo pipeline: com processos_analise > 0 as threads só baixam as páginas e a análise do HTML
+        # (turmas e listagens) roda em um pool de processos, criado no primeiro uso, sem disputar o GIL.
+        # Um pool por número de processos, compartilhado com as consultas de com_ajustes
+        self._pools_analise = {}
+        self._pool_analise_lock = threading.Lock()
+
+        # Concorrência, paralelismo e prazos padrão; consultas com outros valores usam com_ajustes
+        self._aplicar_ajustes(AjustesConsulta(max_concorrencia, periodos_paralelos, processos_analise,
+                                              timeout_tarefa))
+        # O pool de conexões é da sessão compartilhada: dimensionado pelos ajustes do construtor
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concorrencia)
+        self.session.mount('https://', adaptador)
+        self.session.mount('http://', adaptador)
+
+        # Filtros padrão; cada chamada pode passar suas próprias OpcoesConsulta
+        self.opcoes_padrao = OpcoesConsulta(
+            cursos_selecionados=cursos_selecionados or ['Química', 'Química Industrial'],
+            apenas_cursos_quimica=apenas_cursos_quimica,
+            mostrar_outros_cursos=mostrar_outros_cursos
+        )
+
+        # Mapeamento de cursos expandido
+        self.ids_cursos = {
+            'Química': '28',
+            'Química Industrial': '29',
+            'Engenharia Química': '27',
+            'Farmácia': '15'
+        }
+
+        self.cores_cursos = {
+            'Química': 'FFE6CC',
+            'Química Industrial': 'E6F3FF',
+            'Engenharia Química': 'E6FFE6',
+            'Farmácia': 'FFE6FF'
+        }
+
+    def _avisar(self, mensagem):
+        """Registra o aviso no log ou guarda para a thread principal, se chamado de um worker"""
+        pendentes = getattr(self._avisos_thread, 'pendentes', None)
+        if pendentes is not None:
+            pendentes.append(mensagem)
+        else:
+            logger.warning(mensagem)
+
+    def fazer_request(self, url, use_cache=True, revalidar=False):
+        """Faz uma requisição HTTP com cache persistente e revalidação condicional"""
+        entrada = self.cache.obter(url) if use_cache else None
+        # revalidar ignora o TTL, mas ainda usa GET condicional (304 não traz o corpo de novo)
+        if entrada and not revalidar and self.cache.esta_fresca(entrada):
+            return entrada
+
+        try:
+            self.limitador.adquirir()
+            cabecalhos = entrada.cabecalhos_condicionais() if entrada else {}
+            with self._requisicoes:
+                response = self.session.get(url, timeout=30, headers=cabecalhos)
+
+            if entrada and response.status_code == 304:
+                return self.cache.renovar(entrada, response.headers)
+
+            response.raise_for_status()
+
+            if use_cache:
+                self.cache.salvar(url, response.content, response.headers)
+
+            return response
+        except Exception as e:
+            self._avisar(f"⚠️ Erro ao acessar {url}: {e}")
+            return None
+
+    def construir_url_busca(self, id_curso, departamento=None, periodo='20252', codigo_disciplina=None):
+        """Constrói URL de busca para o quadro de horários"""
+        params = {
+            'utf8': '✓',
+            'q[anosemestre_eq]': periodo,
+            'q[disciplina_cod_departamento_eq]': '',
+            'button': '',
+            'q[idturno_eq]': '',
+            'q[idlocalidade_eq]': '',
+            'q[vagas_turma_curso_idcurso_eq]': id_curso,
+            'q[disciplina_disciplinas_curriculos_idcurriculo_eq]': '',
+            'q[curso_ferias_eq]': '',
+            'q[idturmamodalidade_eq]': ''
+        }
+
+        # Se for código de disciplina específico (3 letras + 5 números)
+        if codigo_disciplina:
+            params['q[disciplina_nome_or_disciplina_codigo_cont]'] = codigo_disciplina.strip().upper()
+        elif departamento and departamento.strip() and departamento != 'TODOS':
+            params['q[disciplina_nome_or_disciplina_codigo_cont]'] = f"{departamento.strip().upper()}00"
+        else:
+            params['q[disciplina_nome_or_disciplina_codigo_cont]'] = ''
+
+        url_parts = [f"{key}={value}" for key, value in params.items()]
+        return self.base_url + "?" + "&".join(url_parts)
+
+    def _soup_listagem(self, html_content):
+        """Analisa a página de resultados uma única vez, materializando só tabelas, listas e links"""
+        return BeautifulSoup(html_content, 'lxml', parse_only=ESTRUTURA_LISTAGEM)
+
+    def _links_turmas(self, soup):
+        """Links para páginas detalhadas das turmas em uma página de resultados já analisada"""
+        links = []
+
+        tabela = soup.find('table', class_='table')
+        if tabela:
+            for link in tabela.find_all('a', href=True):
+                href = link['href']
+                if '/turmas/' in href:
+                    full_url = urljoin(self.base_url, href)
+                    links.append(full_url)
+        else:
+            for link in soup.find_all('a', href=True):
+                href = link['href']
+                if '/turmas/' in href and href not in links:
+                    full_url = urljoin(self.base_url, href)
+                    links.append(full_url)
+
+        return list(set(links))
+
+    def extrair_links_turmas_pagina(self, html_content):
+        """Extrai links para páginas detalhadas das turmas"""
+        return self._links_turmas(self._soup_listagem(html_content))
+
+    def analisar_pagina_listagem(self, html_content):
+        """Extrai links das turmas, se existe próxima página e o número da última página anunciada"""
+        if self.processos_analise:
+            return analisar_listagem_no_pool(self._obter_pool_analise(), html_content)
+        soup = self._soup_listagem(html_content)
+        links_pagina = self._links_turmas(soup)
+
+        pagination = soup.find('ul', class_='pagination')
+        if not pagination:
+            return links_pagina, False, None
+
+        next_disabled = pagination.find('li', class_='next disabled')
+        return links_pagina, not next_disabled, self._ultima_pagina(pagination)
+
+    def _ultima_pagina(self, pagination):
+        """Maior número de página citado na paginação (texto ou parâmetro page= dos links); None se não houver"""
+        numeros = []
+        for link in pagination.find_all('a'):
+            texto = link.get_text(strip=True)
+            if texto.isdigit():
+                numeros.append(int(texto))
+            match = RE_PARAMETRO_PAGINA.search(link.get('href', ''))
+            if match:
+                numeros.append(int(match.group(1)))
+        return max(numeros) if numeros else None
+
+    def _buscar_pagina_listagem(self, url_inicial, numero):
+        """Baixa e analisa uma página de resultados em thread do pool, devolvendo os avisos gerados"""
+        self._avisos_thread.pendentes = []
+        try:
+            response = self.fazer_request(url_pagina(url_inicial, numero))
+            if not response:
+                return ([], False, None), self._avisos_thread.pendentes
+            return self.analisar_pagina_listagem(response.content), self._avisos_thread.pendentes
+        finally:
+            self._avisos_thread.pendentes = None
+
+    def extrair_horarios_turma(self, soup):
+        """Extrai horários da turma"""
+        try:
+            secao_horarios = None
+            for h in soup.find_all(['h2', 'h3', 'h4', 'h5', 'strong', 'b']):
+                texto = h.get_text(strip=True).lower()
+                if 'horários' in texto and 'turma' in texto:
+                    secao_horarios = h
+                    break
+
+            if secao_horarios:
+                proximo_elemento = secao_horarios.find_next(['table', 'div'])
+                if proximo_elemento and proximo_elemento.name == 'table':
+                    tabela_horarios = proximo_elemento
+                else:
+                    tabela_horarios = secao_horarios.find_next('table')
+
+                if tabela_horarios:
+                    textos_colunas = []
+
+                    linhas = tabela_horarios.find_all('tr')
+                    if len(linhas) >= 2:
+                        colunas = linhas[1].find_all(['td', 'th'])
+                        textos_colunas = [coluna.get_text(strip=True) for coluna in colunas[:len(DIAS_SEMANA)]]
+
+                    return formatar_horarios(textos_colunas)
+        except Exception as e:
+            pass
+
+        return 'Não informado'
+
+    def extrair_vagas_detalhadas(self, soup, curso_origem, opcoes=None):
+        """Extrai vagas detalhadas da turma - CORRIGIDO PARA OUTROS CURSOS"""
+        opcoes = opcoes or self.opcoes_padrao
+        try:
+            tabela_vagas = None
+
+            for elemento in soup.find_all(['h2', 'h3', 'h4', 'h5', 'strong', 'b']):
+                texto = elemento.get_text(strip=True).lower()
+                if 'vagas' in texto and 'alocadas' in texto:
+                    for proximo in elemento.find_next_siblings():
+                        if proximo.name == 'table':
+                            tabela_vagas = proximo
+                            break
+                    if not tabela_vagas:
+                        tabela_vagas = elemento.find_next('table')
+                    break
+
+            if not tabela_vagas:
+                for tabela in soup.find_all('table'):
+                    texto_tabela = tabela.get_text(strip=True).lower()
+                    if 'vagas' in texto_tabela and ('reg' in texto_tabela or 'vest' in texto_tabela):
+                        tabela_vagas = tabela
+                        break
+
+            if not tabela_vagas:
+                return []
+
+            vagas_encontradas = []
+
+            for linha in tabela_vagas.find_all('tr'):
+                colunas = linha.find_all(['td', 'th'])
+
+                # Verificar se é linha de dados (precisa de pelo menos 4 colunas numéricas)
+                if len(colunas) >= 4:
+                    vaga_info = interpretar_linha_vagas([col.get_text(strip=True) for col in colunas], opcoes)
+                    if vaga_info:
+                        vagas_encontradas.append(vaga_info)
+
+            return vagas_encontradas
+
+        except Exception as e:
+            return []
+
+    def extrair_dados_turma_detalhado(self, url_turma, curso_origem, periodo, departamento_busca=None, opcoes=None):
+        """Extrai dados detalhados de uma turma específica"""
+        response = self.fazer_request(url_turma)
+        if not response:
+            return []
+
+        return self.processar_pagina_turma(response.content, url_turma, curso_origem, periodo,
+                                           departamento_busca, opcoes)
+
+    def processar_pagina_turma(self, html_content, url_turma, curso_origem, periodo, departamento_busca=None,
+                               opcoes=None):
+        """Monta os registros de uma turma a partir do HTML já baixado"""
+        opcoes = opcoes or self.opcoes_padrao
+        ficha = self.analisar_pagina_turma(html_content, opcoes)
+        return montar_registros(ficha, url_turma, curso_origem, periodo, departamento_busca, opcoes)
+
+    def _obter_pool_analise(self):
+        """Pool de processos de análise, criado no primeiro uso e compartilhado pelas consultas"""
+        with self._pool_analise_lock:
+            pool = self._pools_analise.get(self.processos_analise)
+            if pool is None:
+                pool = criar_pool_analise(self.processos_analise, self.extrator, self.base_url)
+                self._pools_analise[self.processos_analise] = pool
+            return pool
+
+    def _aplicar_ajustes(self, ajustes):
+        self.ajustes = ajustes
+        self.max_concorrencia = ajustes.max_concorrencia
+        self.periodos_paralelos = ajustes.periodos_paralelos
+        self.processos_analise = ajustes.processos_analise
+        self.timeout_tarefa = ajustes.timeout_tarefa
+        # Períodos consultados em paralelo dividem o mesmo limite de requisições simultâneas
+        self._requisicoes = threading.BoundedSemaphore(self.max_concorrencia)
+
+    def com_ajustes(self, ajustes):
+        """Consultor para consultas com outros AjustesConsulta, sem alterar este
+
+        Compartilha sessão HTTP, cache, limitador do host e pools de análise; o semáforo de
+        requisições simultâneas e os demais ajustes são só dele. Consultas em andamento neste
+        consultor ou em outra cópia não são afetadas.
+        """
+        if ajustes == self.ajustes:
+            return self
+        consultor = copy.copy(self)
+        consultor._aplicar_ajustes(ajustes)
+        return consultor
+
+    def encerrar_pool_analise(self):
+        """Encerra os processos de análise do modo pipeline (recriados se o consultor voltar a ser usado)"""
+        with self._pool_analise_lock:
+            pools = list(self._pools_analise.values())
+            self._pools_analise.clear()
+        for pool in pools:
+            pool.shutdown(cancel_futures=True)
+
+    def analisar_pagina_turma(self, html_content, opcoes=None):
+        """Extrai a ficha da turma (título, horários e vagas) do HTML; None se a página for inválida"""
+        opcoes = opcoes or self.opcoes_padrao
+        if self.processos_analise:
+            return analisar_no_pool(self._obter_pool_analise(), html_content, opcoes)
+        if self.extrator == 'lxml':
+            return analisar_turma_lxml(html_content, opcoes)
+
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+
+            titulo = soup.find('h1')
+            codigo_disciplina = nome_disciplina = turma = departamento = ''
+
+            if titulo:
+                codigo_disciplina, nome_disciplina, turma, departamento = interpretar_titulo(
+                    titulo.get_text(strip=True)
+                )
+
+            return FichaTurma(
+                codigo_disciplina=codigo_disciplina,
+                nome_disciplina=nome_disciplina,
+                turma=turma,
+                departamento=departamento,
+                horarios=self.extrair_horarios_turma(soup),
+                vagas=self.extrair_vagas_detalhadas(soup, None, opcoes)
+            )
+
+        except Exception as e:
+            return None
+
+    def _baixar_e_analisar(self, url_turma, opcoes, mapa_turmas=None):
+        """Baixa e analisa a página de uma turma"""
+        incremental = mapa_turmas is not None and mapa_turmas.incremental
+        response = self.fazer_request(url_turma, revalidar=incremental)
+        if not response:
+            return None
+        if incremental:
+            return self.analisar_pagina_turma_incremental(url_turma, response.content, opcoes, mapa_turmas)
+        return self.analisar_pagina_turma(response.content, opcoes)
+
+    def analisar_pagina_turma_incremental(self, url_turma, html_content, opcoes, mapa_turmas):
+        """Reaproveita a ficha guardada se a impressão da página não mudou; senão analisa e guarda"""
+        impressao = impressao_pagina(html_content)
+        guardada = self.cache.obter_analise(url_turma)
+        anterior = guardada[0] if guardada else None
+        mapa_turmas.registrar_impressao(anterior, impressao)
+
+        if anterior == impressao:
+            ficha = FichaTurma(**guardada[1])
+        else:
+            # Guarda a ficha sem filtro de curso para servir a qualquer combinação de opções
+            ficha = self.analisar_pagina_turma(html_content, OPCOES_SEM_FILTRO)
+            if ficha is None:
+                return None
+            self.cache.salvar_analise(url_turma, impressao, ficha.como_dict())
+
+        return ficha.filtrada(opcoes)
+
+    def buscar_turmas_detalhadas(self, curso_nome, periodo, departamento=None, codigo_disciplina=None, opcoes=None,
+                                 mapa_turmas=None, ao_evento=None, deve_continuar=None):
+        """Busca turmas detalhadas com todos os dados"""
+        mapa_turmas = mapa_turmas or MapaTurmasConsulta()
+        emitir = emissor(ao_evento)
+        deve_continuar = deve_continuar or (lambda: True)
+        msg = f"🔍 Buscando turmas de {curso_nome} - Período {periodo}"
+        if codigo_disciplina:
+            msg += f" - Disciplina {codigo_disciplina}"
+        elif departamento and departamento != 'TODOS':
+            msg += f" - Depto {departamento}"
+        emitir('info', msg)
+
+        id_curso = self.ids_cursos.get(curso_nome)
+        if not id_curso:
+            return []
+
+        url_busca = self.construir_url_busca(id_curso, departamento, periodo, codigo_disciplina)
+
+        todas_turmas = RegistrosTurmas()
+
+        emitir('progresso', fracao=0, nivel='busca')
+
+        # Resultados guardados pela ordem de descoberta do link para preservar a ordem da deduplicação
+        resultados = []
+        links_vistos = set()
+        concluidas = 0
+        maior_pagina = 1
+        cancelado = False
+
+        # Páginas de resultados e turmas dividem o mesmo pool: as turmas da primeira
+        # página começam enquanto as demais páginas ainda estão sendo baixadas. No modo pipeline,
+        # threads extras esperam pelos processos de análise; os downloads continuam limitados
+        # a max_concorrencia pelo semáforo de fazer_request
+        executor = ThreadPoolExecutor(max_workers=self.max_concorrencia + self.processos_analise)
+        try:
+            pendentes = {executor.submit(self._buscar_pagina_listagem, url_busca, 1): ('pagina', 1)}
+
+            while pendentes and not cancelado:
+                feitos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in feitos:
+                    tipo, valor = pendentes.pop(futuro)
+
+                    if tipo == 'pagina':
+                        (links_pagina, tem_proxima, total_paginas), avisos = futuro.result()
+                        for aviso in avisos:
+                            emitir('aviso', aviso)
+
+                        for numero in paginas_a_agendar(valor, maior_pagina, bool(links_pagina), tem_proxima,
+                                                        total_paginas):
+                            pendentes[executor.submit(self._buscar_pagina_listagem, url_busca, numero)] = (
+                                'pagina', numero
+                            )
+                            maior_pagina = numero
+
+                        for link in links_pagina:
+                            if link in links_vistos:
+                                continue
+                            links_vistos.add(link)
+                            resultados.append(None)
+                            futuro_turma = executor.submit(self._extrair_turma_worker, link, curso_nome, periodo,
+                                                           departamento, opcoes, mapa_turmas)
+                            pendentes[futuro_turma] = ('turma', len(resultados) - 1)
+
+                        emitir('progresso', f"📄 Página {valor} lida - {len(resultados)} turmas encontradas",
+                               nivel='busca')
+                        continue
+
+                    registros, avisos = futuro.result()
+                    resultados[valor] = registros
+                    for aviso in avisos:
+                        emitir('aviso', aviso)
+                    if registros:
+                        emitir('registros', registros=registros)
+
+                    concluidas += 1
+                    emitir('progresso', f"📋 Processando turma {concluidas}/{len(resultados)}",
+                           concluidas / len(resultados), nivel='busca')
+
+                    if not deve_continuar():
+                        cancelado = True
+                        break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        emitir('fim', nivel='busca')
+
+        if not resultados and not cancelado:
+            emitir('aviso', f"ℹ️ Nenhuma turma encontrada para {curso_nome} no período {periodo}")
+            return []
+
+        for registros in resultados:
+            if registros:
+                todas_turmas.adicionar_varios(registros)
+
+        return todas_turmas.como_lista()
+
+    def _extrair_turma_worker(self, link, curso_nome, periodo, departamento, opcoes, mapa_turmas):
+        """Executa a extração de uma turma em thread do pool, devolvendo os avisos gerados"""
+        self._avisos_thread.pendentes = []
+        try:
+            ficha = mapa_turmas.obter(link, curso_nome,
+                                      lambda url: self._baixar_e_analisar(url, opcoes, mapa_turmas))
+            registros = montar_registros(ficha, link, curso_nome, periodo, departamento, opcoes)
+            return registros, self._avisos_thread.pendentes
+        finally:
+            self._avisos_thread.pendentes = None
+
+    def consultar_vagas_completas(self, periodos, cursos, departamentos, codigo_disciplina=None, opcoes=None,
+                                  incremental=False, ao_evento=None, deve_continuar=None, ajustes=None):
+        """Consulta completa de vagas com todos os detalhes
+
+        ao_evento recebe EventoConsulta de progresso, avisos e lotes de registros à medida que as
+        turmas chegam (padrão: log); se deve_continuar() ficar falso, a consulta para e devolve
+        os registros coletados até ali. ajustes (AjustesConsulta) substitui, só nesta consulta,
+        os do construtor.
+        """
+        if ajustes is not None and ajustes != self.ajustes:
+            return self.com_ajustes(ajustes).consultar_vagas_completas(
+                periodos, cursos, departamentos, codigo_disciplina, opcoes, incremental, ao_evento, deve_continuar
+            )
+        opcoes = opcoes or self.opcoes_padrao
+        ao_evento = entregar_sem_repeticao(ao_evento)
+        # O cache vive tanto quanto o app/coletor: a poda a cada consulta impede que cresça sem limite
+        self.cache.podar()
+        if self.motor == 'async':
+            return self._consultar_vagas_async(periodos, cursos, departamentos, codigo_disciplina, opcoes,
+                                               incremental, ao_evento, deve_continuar)
+        if len(periodos) > 1 and self.periodos_paralelos > 1:
+            return self._consultar_periodos_paralelos(periodos, cursos, departamentos, codigo_disciplina, opcoes,
+                                                      incremental, ao_evento, deve_continuar)
+
+        emitir = emissor(ao_evento)
+        deve_continuar = deve_continuar or (lambda: True)
+        todas_turmas = RegistrosTurmas()
+        mapa_turmas = MapaTurmasConsulta(incremental=incremental)
+
+        total_consultas = len(periodos) * len(cursos) * len(departamentos)
+        consulta_atual = 0
+
+        emitir('progresso', fracao=0)
+
+        for periodo in periodos:
+            for curso in cursos:
+                for depto in departamentos:
+                    if not deve_continuar():
+                        emitir('fim')
+                        return todas_turmas.como_lista()
+
+                    consulta_atual += 1
+                    emitir('progresso', f"🔍 {curso} | 📅 {periodo} | 🏫 {depto or 'Todos'}",
+                           consulta_atual / total_consultas)
+
+                    turmas = self.buscar_turmas_detalhadas(curso, periodo, depto, codigo_disciplina, opcoes,
+                                                           mapa_turmas, ao_evento, deve_continuar)
+                    todas_turmas.adicionar_varios(turmas)
+
+        emitir('fim')
+        self._informar_reaproveitamento(mapa_turmas, emitir)
+
+        return todas_turmas.como_lista()
+
+    def _consultar_periodos_paralelos(self, periodos, cursos, departamentos, codigo_disciplina, opcoes,
+                                      incremental, ao_evento, deve_continuar):
+        """Consulta cada período em uma thread, com limitador, cache e mapa de turmas compartilhados
+
+        Os eventos das threads passam por uma fila e são entregues a ao_evento nesta thread (o app só
+        desenha na thread do script), que também é a única a chamar deve_continuar. O resultado segue
+        a ordem de periodos, com os registros de cada período juntos.
+        """
+        entregar = ao_evento or registrar_evento_no_log
+        emitir = emissor(entregar)
+        deve_continuar = deve_continuar or (lambda: True)
+        mapa_turmas = MapaTurmasConsulta(incremental=incremental)
+        fila = queue.Queue()
+        interromper = threading.Event()
+        fracoes = dict.fromkeys(periodos, 0.0)
+        concluidos = 0
+
+        emitir('progresso', f"📅 {len(periodos)} períodos em paralelo", 0)
+
+        executor = ThreadPoolExecutor(max_workers=min(self.periodos_paralelos, len(periodos)))
+        try:
+            futuros = [
+                executor.submit(self._consultar_periodo, periodo, cursos, departamentos, codigo_disciplina, opcoes,
+                                mapa_turmas, fila.put, lambda: not interromper.is_set())
+                for periodo in periodos
+            ]
+
+            while True:
+                try:
+                    evento = fila.get(timeout=0.1)
+                except queue.Empty:
+                    # Cada thread termina depois de pôr seus últimos eventos na fila
+                    if all(futuro.done() for futuro in futuros):
+                        break
+                else:
+                    entregar(evento)
+                    # Andamento da consulta: média das frações dos períodos
+                    if evento.nivel == 'periodo' and evento.tipo == 'fim':
+                        fracoes[evento.periodo] = 1.0
+                        concluidos += 1
+                        emitir('progresso', f"📅 {concluidos}/{len(periodos)} períodos concluídos",
+                               sum(fracoes.values()) / len(periodos))
+                    elif evento.nivel == 'periodo' and evento.tipo == 'progresso' and evento.fracao is not None:
+                        fracoes[evento.periodo] = evento.fracao
+                        emitir('progresso', fracao=sum(fracoes.values()) / len(periodos))
+
+                if not interromper.is_set() and not deve_continuar():
+                    interromper.set()
+
+            resultados = [futuro.result() for futuro in futuros]
+        finally:
+            interromper.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        todas_turmas = RegistrosTurmas()
+        for turmas in resultados:
+            todas_turmas.adicionar_varios(turmas)
+
+        emitir('fim')
+        self._informar_reaproveitamento(mapa_turmas, emitir)
+
+        return todas_turmas.como_lista()
+
+    def _consultar_periodo(self, periodo, cursos, departamentos, codigo_disciplina, opcoes, mapa_turmas,
+                           ao_evento, deve_continuar):
+        """Buscas curso × departamento de um período, em thread do pool de períodos
+
+        Os eventos saem marcados com o período; o andamento de cada busca entra na fração do
+        período em vez de ocupar uma barra própria.
+        """
+        combinacoes = [(curso, depto) for curso in cursos for depto in departamentos]
+        rotulo = formatar_periodo(periodo)
+        atual = {'indice': 0}
+
+        def repassar(evento):
+            if evento.nivel == 'busca':
+                if evento.tipo == 'fim':
+                    return
+                if evento.tipo == 'progresso':
+                    evento = replace(
+                        evento,
+                        nivel='periodo',
+                        mensagem=f"📅 {rotulo} · {evento.mensagem}" if evento.mensagem else '',
+                        fracao=None if evento.fracao is None else (atual['indice'] + evento.fracao) / len(combinacoes)
+                    )
+            ao_evento(replace(evento, periodo=periodo))
+
+        emitir = emissor(repassar)
+        turmas_periodo = RegistrosTurmas()
+        for indice, (curso, depto) in enumerate(combinacoes):
+            if not deve_continuar():
+                break
+            atual['indice'] = indice
+            emitir('progresso', f"📅 {rotulo} | 🔍 {curso} | 🏫 {depto or 'Todos'}", indice / len(combinacoes),
+                   nivel='periodo')
+            turmas_periodo.adicionar_varios(self.buscar_turmas_detalhadas(curso, periodo, depto, codigo_disciplina,
+                                                                          opcoes, mapa_turmas, repassar,
+                                                                          deve_continuar))
+
+        emitir('fim', nivel='periodo')
+        return turmas_periodo.como_lista()
+
+    def _informar_reaproveitamento(self, mapa_turmas, emitir):
+        """Informa quantos downloads de turma foram evitados por cursos que listam a mesma turma"""
+        if mapa_turmas.incremental:
+            emitir(
+                'info',
+                f"🔄 {mapa_turmas.alteradas} turmas mudaram desde a última atualização "
+                f"({mapa_turmas.novas} novas, {mapa_turmas.inalteradas} reaproveitadas sem reanálise)"
+            )
+
+        if mapa_turmas.reaproveitadas:
+            emitir(
+                'nota',
+                f"♻️ {mapa_turmas.reaproveitadas} downloads de turma economizados "
+                f"({mapa_turmas.buscas} páginas de turma baixadas e analisadas uma única vez)"
+            )
+
+    def _consultar_vagas_async(self, periodos, cursos, departamentos, codigo_disciplina=None, opcoes=None,
+                               incremental=False, ao_evento=None, deve_continuar=None):
+        """Executa a consulta completa pelo motor assíncrono"""
+        emitir = emissor(ao_evento)
+        emitir('progresso', fracao=0)
+
+        motor = MotorAsync(self, max_concorrencia=self.max_concorrencia, timeout_tarefa=self.timeout_tarefa,
+                           trace_configs=self.trace_configs_async)
+        mapa_turmas = MapaTurmasConsulta(incremental=incremental)
+        try:
+            return motor.consultar_vagas_completas(
+                periodos, cursos, departamentos, codigo_disciplina,
+                opcoes=opcoes,
+                mapa_turmas=mapa_turmas,
+                ao_evento=ao_evento,
+                deve_continuar=deve_continuar
+            )
+        finally:
+            emitir('fim')
+            self._informar_reaproveitamento(mapa_turmas, emitir)
@@ -0,0 +1,101 @@
+# ===== EVENTOS DA CONSULTA =====
+# O consultor não conhece a interface: informa progresso, avisos e resumos por
+# um callback `ao_evento(evento)`. O app traduz os eventos em elementos do
+# Streamlit; a linha de comando e o coletor, em log.
+import logging
+from dataclasses import dataclass, replace
+
+from consultor_uff.registros import RegistrosTurmas
+
+logger = logging.getLogger('consultor_uff')
+
+# info: mensagem de destaque; aviso: problema não fatal; nota: resumo discreto;
+# progresso: andamento (mensagem e/ou fração 0..1); fim: encerra o progresso do nível;
+# registros: lote de registros de turma recém-chegados, antes do fim da consulta
+TIPOS_EVENTO = ('info', 'aviso', 'nota', 'progresso', 'fim', 'registros')
+# 'consulta' acompanha a consulta inteira; 'periodo', cada período de uma consulta com vários
+# períodos em paralelo; 'busca', cada curso × período × departamento
+NIVEIS_EVENTO = ('consulta', 'periodo', 'busca')
+
+
+@dataclass(frozen=True)
+class EventoConsulta:
+    """Um acontecimento da consulta, entregue ao callback ao_evento"""
+    tipo: str
+    mensagem: str = ''
+    fracao: float = None
+    nivel: str = 'consulta'
+    registros: tuple = ()
+    periodo: str = ''
+
+
+def registrar_evento_no_log(evento):
+    """Destino padrão dos eventos quando nenhum callback é informado"""
+    if evento.tipo == 'aviso':
+        logger.warning(evento.mensagem)
+    elif evento.tipo in ('info', 'nota'):
+        logger.info(evento.mensagem)
+    elif evento.mensagem:
+        logger.debug(evento.mensagem)
+
+
+def emissor(ao_evento=None):
+    """Função emitir(tipo, mensagem, fracao, nivel, registros, periodo) que entrega EventoConsulta ao callback"""
+    ao_evento = ao_evento or registrar_evento_no_log
+
+    def emitir(tipo, mensagem='', fracao=None, nivel='consulta', registros=(), periodo=''):
+        ao_evento(EventoConsulta(tipo, mensagem, fracao, nivel, tuple(registros), periodo))
+
+    return emitir
+
+
+def entregar_sem_repeticao(ao_evento=None):
+    """Repassa os eventos a ao_evento, tirando dos lotes os registros já entregues na consulta
+
+    Entre registros repetidos vale o primeiro entregue. Os motores entregam os lotes de cada
+    período na ordem das buscas (curso × departamento), a mesma da deduplicação do resultado
+    final, então os registros parciais são os do resultado final (ex.: mesmo curso_origem_busca).
+    """
+    if ao_evento is None:
+        return None
+    entregues = RegistrosTurmas()
+
+    def repassar(evento):
+        if evento.tipo != 'registros':
+            ao_evento(evento)
+            return
+        novos = tuple(registro for registro in evento.registros if entregues.adicionar(registro))
+        if novos:
+            ao_evento(replace(evento, registros=novos))
+
+    return repassar
+
+
+class LotesEmOrdem:
+    """Repassa lotes de registros de buscas concorrentes na ordem das buscas
+
+    Os lotes da primeira busca ainda em andamento saem na hora; os das seguintes ficam retidos
+    até as anteriores terminarem. Usado em um único loop de eventos, sem travas.
+    """
+
+    def __init__(self, total_buscas, entregar):
+        self._entregar = entregar
+        self._retidos = [[] for _ in range(total_buscas)]
+        self._concluidas = [False] * total_buscas
+        self._atual = 0
+
+    def lote(self, busca, registros):
+        if busca == self._atual:
+            self._entregar(registros)
+        else:
+            self._retidos[busca].append(registros)
+
+    def concluir(self, busca):
+        """Marca a busca como terminada e libera os lotes retidos das buscas que passam a ser a vez"""
+        self._concluidas[busca] = True
+        while self._atual < len(self._concluidas) and self._concluidas[self._atual]:
+            self._atual += 1
+            if self._atual < len(self._retidos):
+                for registros in self._retidos[self._atual]:
+                    self._entregar(registros)
+                self._retidos[self._atual] = []
@@ -0,0 +1,292 @@
+# ===== PLANILHA EXCEL DOS RESULTADOS =====
+# Gera o arquivo .xlsx com as abas de turmas, vagas, excedentes, departamentos
+# e estatísticas; compartilhado pelo botão de download do app e pela CLI.
+#
+# O modo streaming (padrão) usa um Workbook write-only: cada linha é gravada
+# já formatada e descartada, com memória constante. O modo por células monta a
+# planilha inteira e depois aplica aplicar_formatacao_excel; gera o mesmo visual.
+import io
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+COLUNAS_PLANILHA = [
+    'periodo', 'departamento', 'codigo_disciplina', 'nome_disciplina', 'turma', 'horarios',
+    'curso_vaga', 'vagas_reg', 'vagas_vest', 'inscritos_reg', 'inscritos_vest',
+    'vagas_disponiveis_reg', 'vagas_disponiveis_vest', 'excedentes', 'candidatos',
+    'total_vagas', 'total_inscritos', 'total_vagas_disponiveis',
+    'curso_origem_busca', 'url'
+]
+
+CABECALHOS_DEPARTAMENTO = [
+    'Período', 'Departamento', 'Código', 'Disciplina', 'Turma',
+    'Vagas Reg', 'Vagas Vest', 'Inscritos Reg', 'Inscritos Vest',
+    'Vagas Disp Reg', 'Vagas Disp Vest', 'Total Vagas', 'Total Inscritos', 'Total Vagas Disp'
+]
+
+LARGURAS_COLUNAS = {
+    'A': 12, 'B': 12, 'C': 18, 'D': 50, 'E': 10, 'F': 30,
+    'G': 30, 'H': 12, 'I': 12, 'J': 12, 'K': 12, 'L': 12,
+    'M': 12, 'N': 12, 'O': 12, 'P': 12, 'Q': 12, 'R': 12,
+    'S': 12, 'T': 12, 'U': 80
+}
+COLUNAS_CENTRALIZADAS = {1, 2, 3, 5, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20}
+# Colunas (1-based) lidas pela formatação em todas as abas: curso (G) e excedentes (N)
+COLUNA_CURSO = 7
+COLUNA_EXCEDENTES = 14
+
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(color="FFFFFF", bold=True, size=11)
+BORDA = Border(left=Side(style='thin'), right=Side(style='thin'),
+               top=Side(style='thin'), bottom=Side(style='thin'))
+ALINHAMENTOS = {
+    'centro': Alignment(horizontal='center', vertical='center', wrap_text=True),
+    'esquerda': Alignment(horizontal='left', vertical='center', wrap_text=True),
+}
+# Cores apenas para Quimica e Quimica Industrial
+CORES_CURSOS = {
+    'quimica': PatternFill(start_color="FFE6CC", end_color="FFE6CC", fill_type="solid"),
+    'quimica_industrial': PatternFill(start_color="E6F3FF", end_color="E6F3FF", fill_type="solid"),
+}
+FILL_EXCEDENTE = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
+FONT_EXCEDENTE = Font(color="CC0000", bold=True)
+
+
+def cor_curso(valor):
+    """Cor da linha pelo curso da coluna G: 'quimica', 'quimica_industrial' ou None"""
+    if not valor:
+        return None
+    curso_str = str(valor)
+    # Verifica se e exatamente Quimica (028) - nao pode ter Industrial nem Engenharia
+    if curso_str.startswith('028') or (curso_str.endswith('Química') and 'Industrial' not in curso_str and 'Engenharia' not in curso_str):
+        return 'quimica'
+    # Verifica se e exatamente Quimica Industrial (029)
+    if curso_str.startswith('029') or 'Química Industrial' in curso_str:
+        return 'quimica_industrial'
+    # Demais cursos ficam sem cor (fundo branco)
+    return None
+
+
+def destacar_excedente(valor):
+    return bool(valor) and isinstance(valor, (int, float)) and valor > 0
+
+
+def alinhamento_coluna(coluna):
+    return 'centro' if coluna in COLUNAS_CENTRALIZADAS else 'esquerda'
+
+
+def aplicar_formatacao_excel(workbook):
+    """Aplica formatação profissional ao Excel"""
+    for sheet_name in workbook.sheetnames:
+        ws = workbook[sheet_name]
+
+        for col, width in LARGURAS_COLUNAS.items():
+            ws.column_dimensions[col].width = width
+
+        for row in ws.iter_rows():
+            for cell in row:
+                if cell.value is not None:
+                    cell.border = BORDA
+                    if cell.row == 1:
+                        cell.fill = HEADER_FILL
+                        cell.font = HEADER_FONT
+                        cell.alignment = ALINHAMENTOS['centro']
+                    else:
+                        cell.alignment = ALINHAMENTOS[alinhamento_coluna(cell.column)]
+
+        # Aplicar cores apenas para Quimica (028) e Quimica Industrial (029)
+        if ws.max_row > 1:
+            for row in range(2, ws.max_row + 1):
+                cor = cor_curso(ws.cell(row=row, column=COLUNA_CURSO).value)
+                if cor:
+                    for col in range(1, ws.max_column + 1):
+                        ws.cell(row=row, column=col).fill = CORES_CURSOS[cor]
+
+                excedentes_cell = ws.cell(row=row, column=COLUNA_EXCEDENTES)
+                if destacar_excedente(excedentes_cell.value):
+                    excedentes_cell.fill = FILL_EXCEDENTE
+                    excedentes_cell.font = FONT_EXCEDENTE
+
+
+def _chave_estilo(numero_linha, coluna, valor, cor):
+    """Combinação de formatação de uma célula, na mesma regra de aplicar_formatacao_excel"""
+    if numero_linha == 1:
+        return 'cabecalho' if valor is not None else None
+    alinhamento = alinhamento_coluna(coluna) if valor is not None else None
+    excedente = coluna == COLUNA_EXCEDENTES and destacar_excedente(valor)
+    if alinhamento is None and cor is None and not excedente:
+        return None
+    return alinhamento, cor, excedente
+
+
+def _celula_modelo(ws, chave):
+    celula = WriteOnlyCell(ws)
+    if chave == 'cabecalho':
+        celula.border = BORDA
+        celula.fill = HEADER_FILL
+        celula.font = HEADER_FONT
+        celula.alignment = ALINHAMENTOS['centro']
+        return celula
+
+    alinhamento, cor, excedente = chave
+    if alinhamento:
+        celula.border = BORDA
+        celula.alignment = ALINHAMENTOS[alinhamento]
+    if cor:
+        celula.fill = CORES_CURSOS[cor]
+    if excedente:
+        celula.fill = FILL_EXCEDENTE
+        celula.font = FONT_EXCEDENTE
+    return celula
+
+
+def _escrever_streaming(workbook, abas):
+    """Grava cada linha já formatada em abas write-only, sem guardar as células"""
+    for nome, linhas in abas:
+        ws = workbook.create_sheet(nome)
+        for col, width in LARGURAS_COLUNAS.items():
+            ws.column_dimensions[col].width = width
+
+        # Uma célula por (coluna, estilo), reaproveitada a cada linha: o estilo é registrado
+        # uma vez e a linha é gravada no arquivo assim que ws.append retorna
+        modelos = {}
+        for numero_linha, valores in enumerate(linhas, 1):
+            cor = cor_curso(valores[COLUNA_CURSO - 1]) if numero_linha > 1 and len(valores) >= COLUNA_CURSO else None
+            linha = []
+            for coluna, valor in enumerate(valores, 1):
+                chave = _chave_estilo(numero_linha, coluna, valor, cor)
+                if chave is None:
+                    linha.append(valor)
+                    continue
+                celula = modelos.get((coluna, chave))
+                if celula is None:
+                    celula = modelos[(coluna, chave)] = _celula_modelo(ws, chave)
+                celula.value = valor
+                linha.append(celula)
+            ws.append(linha)
+
+
+def _escrever_celulas(workbook, abas):
+    """Grava célula a célula e formata a planilha inteira ao final"""
+    for nome, linhas in abas:
+        ws = workbook.create_sheet(nome)
+        for r_idx, row in enumerate(linhas, 1):
+            for c_idx, value in enumerate(row, 1):
+                ws.cell(row=r_idx, column=c_idx, value=value)
+
+    aplicar_formatacao_excel(workbook)
+
+
+COLUNAS_DEPARTAMENTO = [
+    'periodo', 'departamento', 'codigo_disciplina', 'nome_disciplina', 'turma',
+    'vagas_reg', 'vagas_vest', 'inscritos_reg', 'inscritos_vest',
+    'vagas_disponiveis_reg', 'vagas_disponiveis_vest',
+    'total_vagas', 'total_inscritos', 'total_vagas_disponiveis'
+]
+
+# Colunas da aba Estatísticas: (coluna da planilha, coluna somada)
+SOMAS_ESTATISTICAS = [
+    ('Total Vagas Reg', 'vagas_reg'),
+    ('Total Vagas Vest', 'vagas_vest'),
+    ('Total Inscritos Reg', 'inscritos_reg'),
+    ('Total Inscritos Vest', 'inscritos_vest'),
+    ('Total Excedentes', 'excedentes'),
+    ('Total Vagas Disp Reg', 'vagas_disponiveis_reg'),
+    ('Total Vagas Disp Vest', 'vagas_disponiveis_vest'),
+]
+CONTAGENS_ESTATISTICAS = [
+    ('Turmas com Vagas Reg', 'vagas_disponiveis_reg'),
+    ('Turmas com Vagas Vest', 'vagas_disponiveis_vest'),
+    ('Turmas com Excedentes', 'excedentes'),
+]
+TAXAS_ESTATISTICAS = [
+    ('Taxa Ocupação Reg (%)', 'Total Inscritos Reg', 'Total Vagas Reg'),
+    ('Taxa Ocupação Vest (%)', 'Total Inscritos Vest', 'Total Vagas Vest'),
+]
+
+
+def _linhas_departamento(df):
+    yield CABECALHOS_DEPARTAMENTO
+
+    # Uma ordenação estável no lugar de groupby + sort por grupo: mesma ordem (grupos por
+    # período e departamento, turmas por código e turma) e linhas sem departamento fora da aba
+    df = df[df['periodo'].notna() & df['departamento'].notna()]
+    df = df.sort_values(['periodo', 'departamento', 'codigo_disciplina', 'turma'], kind='stable')
+    yield from df[COLUNAS_DEPARTAMENTO].itertuples(index=False, name=None)
+
+
+def _linhas_estatisticas(df):
+    """Uma linha por período × curso, na ordem em que aparecem, numa única agregação agrupada"""
+    if df.empty:
+        return
+
+    indicadores = df[['periodo', 'curso_vaga']].copy()
+    for coluna_planilha, coluna in SOMAS_ESTATISTICAS:
+        indicadores[coluna_planilha] = df[coluna]
+    for coluna_planilha, coluna in CONTAGENS_ESTATISTICAS:
+        indicadores[coluna_planilha] = df[coluna] > 0
+    indicadores['Total Turmas'] = 1
+
+    stats = indicadores.groupby(['periodo', 'curso_vaga'], sort=False, observed=True).sum().reset_index()
+    # groupby(sort=False) segue a primeira ocorrência de cada par; a aba lista os cursos
+    # agrupados por período, na ordem em que os períodos aparecem
+    ordem_periodos = {periodo: ordem for ordem, periodo in enumerate(df['periodo'].unique())}
+    stats = stats.sort_values('periodo', key=lambda periodos: periodos.astype(object).map(ordem_periodos),
+                              kind='stable')
+
+    for coluna_taxa, inscritos, vagas in TAXAS_ESTATISTICAS:
+        stats[coluna_taxa] = (stats[inscritos] / stats[vagas] * 100).round(2).where(stats[vagas] > 0, 0)
+
+    stats = stats.rename(columns={'periodo': 'Período', 'curso_vaga': 'Curso'})[
+        ['Período', 'Curso', 'Total Turmas']
+        + [coluna for coluna, _ in CONTAGENS_ESTATISTICAS]
+        + [coluna for coluna, _ in SOMAS_ESTATISTICAS]
+        + [coluna for coluna, _, _ in TAXAS_ESTATISTICAS]
+    ]
+    yield from dataframe_to_rows(stats, index=False, header=True)
+
+
+def _abas_planilha(df):
+    """(nome, linhas) de cada aba, na ordem da planilha; as linhas são geradas sob demanda"""
+    yield 'Todas as Turmas', dataframe_to_rows(df, index=False, header=True)
+
+    for nome, coluna in (('Com Vagas Reg', 'vagas_disponiveis_reg'),
+                         ('Com Vagas Vest', 'vagas_disponiveis_vest'),
+                         ('Com Excedentes', 'excedentes')):
+        df_filtrado = df[df[coluna] > 0]
+        if not df_filtrado.empty:
+            yield nome, dataframe_to_rows(df_filtrado, index=False, header=True)
+
+    yield 'Por Departamento', _linhas_departamento(df)
+    yield 'Estatísticas', _linhas_estatisticas(df)
+
+
+def gerar_excel_completo(df, periodo_str, streaming=True):
+    """Gera Excel completo no formato do Colab
+
+    streaming=False monta a planilha célula a célula (referência para comparação).
+    """
+    if df.empty:
+        return None
+
+    # Cópia com as colunas da planilha: o DataFrame do chamador não é alterado, o que permite
+    # gerar o arquivo em segundo plano enquanto o app ainda lê o mesmo resultado
+    df = df.reindex(columns=COLUNAS_PLANILHA, fill_value='')
+
+    wb = Workbook(write_only=streaming)
+
+    if 'Sheet' in wb.sheetnames:
+        del wb['Sheet']
+
+    if streaming:
+        _escrever_streaming(wb, _abas_planilha(df))
+    else:
+        _escrever_celulas(wb, _abas_planilha(df))
+
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
+
+    return output
@@ -0,0 +1,94 @@
+# ===== EXPORTAÇÃO EM FORMATOS COLUNARES =====
+# Parquet, Arrow IPC e CSV do DataFrame de resultados, nas mesmas colunas da
+# planilha (COLUNAS_PLANILHA), para carregar em pandas/DuckDB sem abrir o
+# .xlsx. Contagens seguem int32 e rótulos repetidos viram colunas de
+# dicionário. Parquet e Arrow dependem do pyarrow; o CSV usa só o pandas.
+import io
+
+from consultor_uff.excel import COLUNAS_PLANILHA
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional, verificada ao exportar Parquet/Arrow
+    pa = pq = None
+
+# formato: (extensão, tipo MIME)
+FORMATOS_EXPORTACAO = {
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+    'csv': ('.csv', 'text/csv'),
+}
+FORMATOS_PYARROW = ('parquet', 'arrow')
+LINHAS_POR_BLOCO_CSV = 50000
+
+
+def formato_disponivel(formato):
+    """Indica se o formato pode ser gerado com os pacotes instalados"""
+    return formato in FORMATOS_EXPORTACAO and (formato not in FORMATOS_PYARROW or pa is not None)
+
+
+def tabela_exportacao(df):
+    """Cópia do resultado nas colunas da planilha, na mesma ordem; colunas ausentes ficam vazias"""
+    return df.reindex(columns=COLUNAS_PLANILHA, fill_value='')
+
+
+def tabela_arrow(df):
+    if pa is None:
+        raise RuntimeError("A exportação em Parquet/Arrow requer o pacote 'pyarrow' (pip install pyarrow)")
+    return pa.Table.from_pandas(tabela_exportacao(df), preserve_index=False)
+
+
+def gerar_parquet(df, compressao='zstd'):
+    """Parquet comprimido e tipado do resultado"""
+    tabela = tabela_arrow(df)
+    output = io.BytesIO()
+    pq.write_table(tabela, output, compression=compressao)
+    output.seek(0)
+    return output
+
+
+def gerar_arrow(df):
+    """Arquivo Arrow IPC do resultado, lido sem conversão por pyarrow/pandas/DuckDB"""
+    tabela = tabela_arrow(df)
+    output = io.BytesIO()
+    with pa.ipc.new_file(output, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    output.seek(0)
+    return output
+
+
+def iterar_csv(df, linhas_por_bloco=LINHAS_POR_BLOCO_CSV):
+    """CSV do resultado em blocos de texto (cabeçalho no primeiro), sem montar o arquivo inteiro"""
+    df = tabela_exportacao(df)
+    yield df.iloc[:0].to_csv(index=False)
+    for inicio in range(0, len(df), linhas_por_bloco):
+        yield df.iloc[inicio:inicio + linhas_por_bloco].to_csv(index=False, header=False)
+
+
+def escrever_csv(df, arquivo, linhas_por_bloco=LINHAS_POR_BLOCO_CSV):
+    """Grava o CSV do resultado em um arquivo de texto aberto, bloco a bloco"""
+    for bloco in iterar_csv(df, linhas_por_bloco):
+        arquivo.write(bloco)
+
+
+def gerar_csv(df):
+    output = io.BytesIO()
+    for bloco in iterar_csv(df):
+        output.write(bloco.encode('utf-8'))
+    output.seek(0)
+    return output
+
+
+GERADORES_EXPORTACAO = {
+    'parquet': gerar_parquet,
+    'arrow': gerar_arrow,
+    'csv': gerar_csv,
+}
+
+
+def gerar_exportacao(df, formato):
+    """BytesIO com o resultado no formato pedido (ver FORMATOS_EXPORTACAO)"""
+    if formato not in GERADORES_EXPORTACAO:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+    return GERADORES_EXPORTACAO[formato](df)
@@ -0,0 +1,130 @@
+# ===== EXTRATOR DE TURMAS COM LXML =====
+# Alternativa ao caminho BeautifulSoup para as páginas de turma: uma única
+# árvore lxml percorrida com XPath pré-compilado. Produz a mesma FichaTurma.
+import os
+
+from bs4 import UnicodeDammit
+from lxml import etree, html as lxml_html
+
+from consultor_uff.turma import (
+    DIAS_SEMANA, FichaTurma, formatar_horarios, interpretar_linha_vagas, interpretar_titulo
+)
+
+EXTRATORES = {
+    'bs4': 'BeautifulSoup (referência)',
+    'lxml': 'lxml + XPath compilado',
+}
+EXTRATOR_PADRAO = os.environ.get('CONSULTOR_UFF_EXTRATOR', 'bs4')
+
+# Mesmas buscas do caminho bs4: find('h1'), find_all de títulos, find_next e find_next_siblings
+XP_TITULO = etree.XPath('(//h1)[1]')
+XP_CABECALHOS = etree.XPath('//h2|//h3|//h4|//h5|//strong|//b')
+XP_PROXIMO_TABELA_OU_DIV = etree.XPath(
+    '(descendant::table|descendant::div|following::table|following::div)[1]'
+)
+XP_PROXIMA_TABELA = etree.XPath('(descendant::table|following::table)[1]')
+XP_TABELA_IRMA = etree.XPath('following-sibling::table[1]')
+XP_TABELAS = etree.XPath('//table')
+XP_LINHAS = etree.XPath('.//tr')
+XP_CELULAS = etree.XPath('.//td|.//th')
+# get_text do bs4 ignora comentários e o conteúdo de script/style/template
+XP_TEXTOS = etree.XPath('.//text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+
+
+def _texto(elemento):
+    """Equivalente a get_text(strip=True) do BeautifulSoup"""
+    return ''.join(parte.strip() for parte in XP_TEXTOS(elemento))
+
+
+def _decodificar(html_content):
+    if isinstance(html_content, str):
+        return html_content
+    try:
+        return html_content.decode('utf-8')
+    except UnicodeDecodeError:
+        return UnicodeDammit(html_content, is_html=True).unicode_markup
+
+
+def _extrair_horarios(cabecalhos):
+    for cabecalho in cabecalhos:
+        texto = _texto(cabecalho).lower()
+        if 'horários' in texto and 'turma' in texto:
+            proximo = XP_PROXIMO_TABELA_OU_DIV(cabecalho)
+            if proximo and proximo[0].tag == 'table':
+                tabela = proximo[0]
+            else:
+                tabela = next(iter(XP_PROXIMA_TABELA(cabecalho)), None)
+            if tabela is None:
+                return 'Não informado'
+
+            linhas = XP_LINHAS(tabela)
+            textos_colunas = []
+            if len(linhas) >= 2:
+                textos_colunas = [_texto(c) for c in XP_CELULAS(linhas[1])[:len(DIAS_SEMANA)]]
+            return formatar_horarios(textos_colunas)
+    return 'Não informado'
+
+
+def _localizar_tabela_vagas(arvore, cabecalhos):
+    for cabecalho in cabecalhos:
+        texto = _texto(cabecalho).lower()
+        if 'vagas' in texto and 'alocadas' in texto:
+            tabela = next(iter(XP_TABELA_IRMA(cabecalho)), None)
+            if tabela is None:
+                tabela = next(iter(XP_PROXIMA_TABELA(cabecalho)), None)
+            if tabela is not None:
+                return tabela
+            break
+
+    for tabela in XP_TABELAS(arvore):
+        texto_tabela = _texto(tabela).lower()
+        if 'vagas' in texto_tabela and ('reg' in texto_tabela or 'vest' in texto_tabela):
+            return tabela
+    return None
+
+
+def _extrair_vagas(arvore, cabecalhos, opcoes):
+    tabela_vagas = _localizar_tabela_vagas(arvore, cabecalhos)
+    if tabela_vagas is None:
+        return []
+
+    vagas_encontradas = []
+    for linha in XP_LINHAS(tabela_vagas):
+        colunas = XP_CELULAS(linha)
+        if len(colunas) >= 4:
+            vaga_info = interpretar_linha_vagas([_texto(c) for c in colunas], opcoes)
+            if vaga_info:
+                vagas_encontradas.append(vaga_info)
+    return vagas_encontradas
+
+
+def analisar_turma_lxml(html_content, opcoes):
+    """Extrai a FichaTurma da página com lxml; None se a página for inválida"""
+    try:
+        arvore = lxml_html.document_fromstring(_decodificar(html_content))
+    except (etree.ParserError, ValueError):
+        return None
+
+    titulo = XP_TITULO(arvore)
+    codigo_disciplina = nome_disciplina = turma = departamento = ''
+    if titulo:
+        codigo_disciplina, nome_disciplina, turma, departamento = interpretar_titulo(_texto(titulo[0]))
+
+    cabecalhos = XP_CABECALHOS(arvore)
+    try:
+        horarios = _extrair_horarios(cabecalhos)
+    except Exception:
+        horarios = 'Não informado'
+    try:
+        vagas = _extrair_vagas(arvore, cabecalhos, opcoes)
+    except Exception:
+        vagas = []
+
+    return FichaTurma(
+        codigo_disciplina=codigo_disciplina,
+        nome_disciplina=nome_disciplina,
+        turma=turma,
+        departamento=departamento,
+        horarios=horarios,
+        vagas=vagas
+    )
@@ -0,0 +1,72 @@
+# ===== FILTROS INDEXADOS DO RESULTADO =====
+# Índices montados uma vez por resultado para os filtros e ordenações das
+# tabelas do app: posições das linhas de cada curso e departamento, máscaras
+# dos filtros de vagas e ordenações prontas. Filtrar vira interseção de
+# posições, sem copiar nem varrer o DataFrame a cada interação.
+import numpy as np
+
+# filtro de vagas: (coluna, comparação com zero)
+FILTROS_VAGAS = {
+    'com_vagas': ('total_vagas_disponiveis', np.greater),
+    'sem_vagas': ('total_vagas_disponiveis', np.equal),
+    'com_excedentes': ('excedentes', np.greater),
+}
+# ordenação: (colunas, decrescente)
+ORDENACOES = {
+    'vagas_disponiveis': (['total_vagas_disponiveis'], True),
+    'inscritos': (['total_inscritos'], True),
+    'excedentes': (['excedentes'], True),
+    'codigo': (['codigo_disciplina', 'turma'], False),
+}
+
+
+class IndiceResultado:
+    """Posições das linhas do resultado por curso, departamento, filtro de vagas e ordenação"""
+
+    def __init__(self, df):
+        self.df = df
+        self.total = len(df)
+        # groupby(...).indices: valor -> posições (crescentes) das linhas; ausentes ficam de fora
+        self.posicoes_curso = df.groupby('curso_vaga', observed=True, sort=False).indices
+        self.posicoes_departamento = df.groupby('departamento', observed=True, sort=False).indices
+        self.mascaras_vagas = {
+            filtro: comparacao(df[coluna].to_numpy(), 0)
+            for filtro, (coluna, comparacao) in FILTROS_VAGAS.items()
+        }
+        # Ordenações estáveis: empates mantêm a ordem do resultado
+        self.ordens = {
+            ordenacao: df[colunas].reset_index(drop=True)
+            .sort_values(colunas, ascending=not decrescente, kind='stable').index.to_numpy()
+            for ordenacao, (colunas, decrescente) in ORDENACOES.items()
+        }
+
+    def posicoes(self, curso=None, departamento=None, vagas=None):
+        """Posições crescentes das linhas que passam nos filtros; None se nenhum filtro foi pedido"""
+        selecao = None
+        if curso is not None:
+            selecao = self.posicoes_curso.get(curso, np.empty(0, dtype=np.intp))
+        if departamento is not None:
+            linhas = self.posicoes_departamento.get(departamento, np.empty(0, dtype=np.intp))
+            selecao = linhas if selecao is None else np.intersect1d(selecao, linhas, assume_unique=True)
+        if vagas is not None:
+            mascara = self.mascaras_vagas[vagas]
+            selecao = np.flatnonzero(mascara) if selecao is None else selecao[mascara[selecao]]
+        return selecao
+
+    def ordenadas(self, ordenacao, posicoes=None, limite=None):
+        """Posições na ordem pedida, restritas a posicoes (se informadas), até limite linhas"""
+        ordem = self.ordens[ordenacao]
+        if posicoes is not None:
+            selecionadas = np.zeros(self.total, dtype=bool)
+            selecionadas[posicoes] = True
+            ordem = ordem[selecionadas[ordem]]
+        return ordem if limite is None else ordem[:limite]
+
+    def linhas(self, posicoes, colunas=None):
+        """Linhas do resultado nas posições dadas (todas se None), só com as colunas pedidas"""
+        if posicoes is None:
+            return self.df if colunas is None else self.df[colunas]
+        if colunas is None:
+            return self.df.iloc[posicoes]
+        # Uma única seleção de linhas e colunas: não copia as colunas que a tabela não mostra
+        return self.df.iloc[posicoes, self.df.columns.get_indexer(colunas)]
@@ -0,0 +1,136 @@
+# ===== HISTÓRICO DE CONSULTAS =====
+# Guarda, sem nunca sobrescrever, o resultado de cada consulta concluída com
+# seu horário, para acompanhar vagas e inscritos ao longo da inscrição.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from consultor_uff.registros import CAMPOS_NUMERICOS, CAMPOS_REGISTRO
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_HISTORICO_PADRAO = os.environ.get(
+    'CONSULTOR_UFF_HISTORICO',
+    os.path.join(os.path.expanduser('~'), '.local', 'share', 'consultor_uff', 'historico.sqlite3')
+)
+
+
+class HistoricoVagas:
+    """Séries históricas de vagas em SQLite, indexadas por (periodo, codigo_disciplina, turma, curso_vaga)"""
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or CAMINHO_HISTORICO_PADRAO
+        self._lock = threading.Lock()
+        self._conexao = self._conectar()
+
+    def _conectar(self):
+        """Abre o banco do histórico, caindo para memória se o disco não estiver disponível"""
+        try:
+            if self.caminho != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+            conexao = sqlite3.connect(self.caminho, check_same_thread=False, timeout=30)
+            if self.caminho != ':memory:':
+                conexao.execute('PRAGMA journal_mode=WAL')
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Histórico persistente indisponível em %s (%s); usando memória", self.caminho, e)
+            self.caminho = ':memory:'
+            conexao = sqlite3.connect(':memory:', check_same_thread=False)
+
+        colunas = ',\n'.join(
+            f"{campo} {'INTEGER' if campo in CAMPOS_NUMERICOS else 'TEXT'}" for campo in CAMPOS_REGISTRO
+        )
+        conexao.executescript(f'''
+            CREATE TABLE IF NOT EXISTS consultas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                registrado_em REAL NOT NULL,
+                parametros TEXT NOT NULL,
+                total_registros INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS instantaneos (
+                consulta_id INTEGER NOT NULL REFERENCES consultas(id),
+                registrado_em REAL NOT NULL,
+                {colunas}
+            );
+            CREATE INDEX IF NOT EXISTS idx_instantaneos_turma
+                ON instantaneos (periodo, codigo_disciplina, turma, curso_vaga, registrado_em);
+            CREATE INDEX IF NOT EXISTS idx_instantaneos_consulta ON instantaneos (consulta_id);
+        ''')
+        conexao.commit()
+        return conexao
+
+    def registrar(self, registros, parametros=None, registrado_em=None):
+        """Acrescenta o resultado de uma consulta concluída; retorna o id da consulta"""
+        registrado_em = registrado_em or time.time()
+        linhas = [
+            tuple(registro.get(campo) for campo in CAMPOS_REGISTRO)
+            for registro in registros
+        ]
+        marcadores = ', '.join('?' * (len(CAMPOS_REGISTRO) + 2))
+        with self._lock:
+            cursor = self._conexao.execute(
+                'INSERT INTO consultas (registrado_em, parametros, total_registros) VALUES (?, ?, ?)',
+                (registrado_em, json.dumps(parametros or {}, ensure_ascii=False), len(linhas))
+            )
+            consulta_id = cursor.lastrowid
+            self._conexao.executemany(
+                f'INSERT INTO instantaneos (consulta_id, registrado_em, {", ".join(CAMPOS_REGISTRO)}) '
+                f'VALUES ({marcadores})',
+                [(consulta_id, registrado_em) + linha for linha in linhas]
+            )
+            self._conexao.commit()
+        return consulta_id
+
+    def _consultar(self, sql, parametros=()):
+        with self._lock:
+            cursor = self._conexao.execute(sql, parametros)
+            nomes = [coluna[0] for coluna in cursor.description]
+            return [dict(zip(nomes, linha)) for linha in cursor.fetchall()]
+
+    def serie_turma(self, periodo, codigo_disciplina, turma=None, curso_vaga=None, campos=None):
+        """Série temporal de uma turma (e curso), em ordem cronológica, sem acessar a rede"""
+        campos = campos or CAMPOS_NUMERICOS
+        desconhecidos = set(campos) - set(CAMPOS_REGISTRO)
+        if desconhecidos:
+            raise ValueError(f"Campos desconhecidos: {sorted(desconhecidos)}")
+
+        condicoes = ['periodo = ?', 'codigo_disciplina = ?']
+        parametros = [periodo, codigo_disciplina]
+        if turma is not None:
+            condicoes.append('turma = ?')
+            parametros.append(turma)
+        if curso_vaga is not None:
+            condicoes.append('curso_vaga = ?')
+            parametros.append(curso_vaga)
+
+        return self._consultar(
+            f'SELECT registrado_em, turma, curso_vaga, {", ".join(campos)} FROM instantaneos '
+            f'WHERE {" AND ".join(condicoes)} ORDER BY registrado_em, turma, curso_vaga',
+            parametros
+        )
+
+    def consultas(self, limite=50):
+        """Consultas registradas, da mais recente para a mais antiga"""
+        linhas = self._consultar(
+            'SELECT id, registrado_em, parametros, total_registros FROM consultas ORDER BY id DESC LIMIT ?',
+            (limite,)
+        )
+        for linha in linhas:
+            linha['parametros'] = json.loads(linha['parametros'])
+        return linhas
+
+    def ultima_consulta(self, limite=500, **filtros):
+        """Consulta mais recente cujos parâmetros coincidem com os filtros (ex.: origem='coletor'); None se não houver"""
+        for consulta in self.consultas(limite):
+            if all(consulta['parametros'].get(chave) == valor for chave, valor in filtros.items()):
+                return consulta
+        return None
+
+    def registros_da_consulta(self, consulta_id):
+        """Registros de uma consulta, como gravados (mesmas chaves de montar_registros)"""
+        return self._consultar(
+            f'SELECT {", ".join(CAMPOS_REGISTRO)} FROM instantaneos WHERE consulta_id = ? ORDER BY rowid',
+            (consulta_id,)
+        )
@@ -0,0 +1,65 @@
+# ===== LIMITADOR DE TAXA POR HOST =====
+import threading
+import time
+
+
+class LimitadorTaxa:
+    """Token bucket thread-safe para espaçar requisições a um mesmo host"""
+
+    def __init__(self, taxa=5.0, capacidade=None):
+        if taxa <= 0:
+            raise ValueError("A taxa do limitador deve ser positiva")
+        self.taxa = float(taxa)
+        self.capacidade = float(capacidade if capacidade is not None else max(1.0, taxa))
+        self._tokens = self.capacidade
+        self._ultima_reposicao = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configurar(self, taxa=None, capacidade=None):
+        """Ajusta taxa e capacidade sem perder os tokens acumulados"""
+        with self._lock:
+            self._repor()
+            if taxa is not None:
+                if taxa <= 0:
+                    raise ValueError("A taxa do limitador deve ser positiva")
+                self.taxa = float(taxa)
+            if capacidade is not None:
+                self.capacidade = float(capacidade)
+            self._tokens = min(self._tokens, self.capacidade)
+
+    def _repor(self):
+        """Repõe tokens proporcionalmente ao tempo decorrido (chamar com lock)"""
+        agora = time.monotonic()
+        decorrido = agora - self._ultima_reposicao
+        if decorrido > 0:
+            self._tokens = min(self.capacidade, self._tokens + decorrido * self.taxa)
+            self._ultima_reposicao = agora
+
+    def reservar(self):
+        """Reserva um token e retorna quantos segundos esperar antes de usá-lo"""
+        with self._lock:
+            self._repor()
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.taxa
+
+    def adquirir(self):
+        """Bloqueia até que uma requisição possa ser feita"""
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+
+
+_limitadores = {}
+_limitadores_lock = threading.Lock()
+
+
+def obter_limitador(host, taxa=5.0, capacidade=None):
+    """Retorna o limitador compartilhado do host (taxa e capacidade valem só na criação)"""
+    with _limitadores_lock:
+        limitador = _limitadores.get(host)
+        if limitador is None:
+            limitador = LimitadorTaxa(taxa, capacidade)
+            _limitadores[host] = limitador
+        return limitador
@@ -0,0 +1,295 @@
+# ===== MOTOR DE CONSULTA ASSÍNCRONO =====
+# Alternativa ao laço síncrono do consultor: paginação e turmas rodam como
+# corrotinas sobre um único aiohttp.ClientSession com pool de conexões.
+import asyncio
+import functools
+import threading
+
+from consultor_uff.eventos import LotesEmOrdem, emissor
+from consultor_uff.paginacao import paginas_a_agendar, url_pagina
+from consultor_uff.registros import RegistrosTurmas
+from consultor_uff.turma import MapaTurmasConsulta, montar_registros
+from consultor_uff.validacao import formatar_periodo
+
+try:
+    import aiohttp
+except ImportError:  # dependência opcional, verificada ao criar o motor
+    aiohttp = None
+
+
+class MotorAsync:
+    """Executa consultas do ConsultorQuadroHorariosUFFDetalhado com asyncio"""
+
+    def __init__(self, consultor, max_concorrencia=6, timeout_tarefa=60, timeout_requisicao=30, trace_configs=None):
+        if aiohttp is None:
+            raise RuntimeError("O motor assíncrono requer o pacote 'aiohttp' (pip install aiohttp)")
+        self.consultor = consultor
+        self.max_concorrencia = max(1, int(max_concorrencia))
+        self.timeout_tarefa = timeout_tarefa
+        self.timeout_requisicao = timeout_requisicao
+        self.trace_configs = list(trace_configs or [])
+        self.cache = consultor.cache
+
+        self._sessao = None
+        self._semaforo = None
+        self._emitir = emissor()
+
+    def consultar_vagas_completas(self, periodos, cursos, departamentos, codigo_disciplina=None, opcoes=None,
+                                  mapa_turmas=None, ao_evento=None, deve_continuar=None):
+        """Consulta completa de vagas; mesma interface e resultado do motor síncrono"""
+        corrotina = self._consultar(periodos, cursos, departamentos, codigo_disciplina,
+                                    opcoes or self.consultor.opcoes_padrao,
+                                    mapa_turmas or MapaTurmasConsulta(),
+                                    ao_evento, deve_continuar)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(corrotina)
+
+        # Já existe um loop nesta thread (ex.: notebook): executa em thread dedicada
+        resultado = {}
+
+        def executar():
+            try:
+                resultado['valor'] = asyncio.run(corrotina)
+            except BaseException as e:
+                resultado['erro'] = e
+
+        thread = threading.Thread(target=executar, daemon=True)
+        thread.start()
+        thread.join()
+        if 'erro' in resultado:
+            raise resultado['erro']
+        return resultado['valor']
+
+    async def _consultar(self, periodos, cursos, departamentos, codigo_disciplina, opcoes, mapa_turmas,
+                         ao_evento, deve_continuar):
+        """Dispara todas as combinações período × curso × departamento em paralelo"""
+        deve_continuar = deve_continuar or (lambda: True)
+        self._emitir = emissor(ao_evento)
+
+        conector = aiohttp.TCPConnector(limit=self.max_concorrencia, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_requisicao)
+        cabecalhos = dict(self.consultor.session.headers)
+
+        async with aiohttp.ClientSession(connector=conector, headers=cabecalhos, timeout=timeout,
+                                         trace_configs=self.trace_configs) as sessao:
+            self._sessao = sessao
+            self._semaforo = asyncio.Semaphore(self.max_concorrencia)
+
+            combinacoes = [
+                (periodo, curso, depto)
+                for periodo in periodos
+                for curso in cursos
+                for depto in departamentos
+            ]
+            # Com vários períodos, cada um também tem seu andamento: [turmas encontradas, concluídas]
+            por_periodo = {periodo: [0, 0] for periodo in periodos} if len(periodos) > 1 else {}
+            progresso = {'turmas_total': 0, 'turmas_concluidas': 0, 'cancelado': False, 'periodos': por_periodo}
+
+            def turma_concluida(periodo):
+                progresso['turmas_concluidas'] += 1
+                fracao = min(1.0, progresso['turmas_concluidas'] / max(progresso['turmas_total'], 1))
+                # Como no motor síncrono, a contagem de turmas é detalhe da busca; a consulta só avança a barra
+                self._emitir('progresso', fracao=fracao)
+                self._emitir(
+                    'progresso',
+                    f"📋 Processando turma {progresso['turmas_concluidas']}/{progresso['turmas_total']}",
+                    fracao, nivel='busca'
+                )
+                if periodo in por_periodo:
+                    contagem = por_periodo[periodo]
+                    contagem[1] += 1
+                    self._emitir('progresso', f"📅 {formatar_periodo(periodo)} · turma {contagem[1]}/{contagem[0]}",
+                                 min(1.0, contagem[1] / max(contagem[0], 1)), nivel='periodo', periodo=periodo)
+                if not deve_continuar():
+                    progresso['cancelado'] = True
+                return not progresso['cancelado']
+
+            # As combinações correm juntas, mas seus lotes de registros saem na ordem das combinações,
+            # a mesma de _mesclar: entre registros repetidos, o parcial e o final são o mesmo
+            lotes = LotesEmOrdem(len(combinacoes), lambda registros: self._emitir('registros', registros=registros))
+
+            # Mesmas mensagens de consulta do motor síncrono: uma por busca com um período,
+            # uma por período concluído com vários
+            buscas_restantes = {periodo: len(cursos) * len(departamentos) for periodo in periodos}
+            periodos_concluidos = []
+            if por_periodo:
+                self._emitir('progresso', f"📅 {len(periodos)} períodos em paralelo")
+
+            async def buscar(k, periodo, curso, depto):
+                if por_periodo:
+                    self._emitir('progresso', f"📅 {formatar_periodo(periodo)} | 🔍 {curso} | 🏫 {depto or 'Todos'}",
+                                 nivel='periodo', periodo=periodo)
+                else:
+                    self._emitir('progresso', f"🔍 {curso} | 📅 {periodo} | 🏫 {depto or 'Todos'}")
+                try:
+                    return await self._buscar_turmas(curso, periodo, depto, codigo_disciplina, opcoes, mapa_turmas,
+                                                     progresso, turma_concluida,
+                                                     lambda registros: lotes.lote(k, registros))
+                finally:
+                    lotes.concluir(k)
+                    buscas_restantes[periodo] -= 1
+                    if por_periodo and not buscas_restantes[periodo]:
+                        periodos_concluidos.append(periodo)
+                        self._emitir('fim', nivel='periodo', periodo=periodo)
+                        self._emitir('progresso', f"📅 {len(periodos_concluidos)}/{len(periodos)} períodos concluídos")
+
+            tarefas = [
+                asyncio.create_task(buscar(k, periodo, curso, depto))
+                for k, (periodo, curso, depto) in enumerate(combinacoes)
+            ]
+            try:
+                resultados = await asyncio.gather(*tarefas)
+            finally:
+                for tarefa in tarefas:
+                    tarefa.cancel()
+            self._emitir('fim', nivel='busca')
+
+        self._sessao = None
+        return self._mesclar(resultados)
+
+    def _mesclar(self, resultados):
+        """Deduplica na ordem das combinações, como o motor síncrono"""
+        todas_turmas = RegistrosTurmas()
+        for turmas in resultados:
+            todas_turmas.adicionar_varios(turmas)
+        return todas_turmas.como_lista()
+
+    def _avisar(self, mensagem):
+        self._emitir('aviso', mensagem)
+
+    async def _baixar(self, url, revalidar=False):
+        """Baixa uma página respeitando semáforo, limitador do host e cache persistente"""
+        # O cache é SQLite em disco: leituras e gravações numa thread, sem parar as demais corrotinas
+        entrada = await asyncio.to_thread(self.cache.obter, url)
+        if entrada and not revalidar and self.cache.esta_fresca(entrada):
+            return entrada.conteudo
+
+        async with self._semaforo:
+            espera = self.consultor.limitador.reservar()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            # O prazo só começa com a vaga do semáforo e o token do limitador em mãos: a espera na
+            # fila (taxa × tamanho da consulta) não conta contra timeout_tarefa
+            try:
+                conteudo, cabecalhos_resposta = await asyncio.wait_for(self._requisitar(url, entrada),
+                                                                       timeout=self.timeout_tarefa)
+            except asyncio.TimeoutError:
+                self._avisar(f"⚠️ Tempo esgotado ao acessar {url}")
+                return None
+            except Exception as e:
+                self._avisar(f"⚠️ Erro ao acessar {url}: {e}")
+                return None
+
+        if conteudo is None:
+            return (await asyncio.to_thread(self.cache.renovar, entrada, cabecalhos_resposta)).conteudo
+        await asyncio.to_thread(self.cache.salvar, url, conteudo, cabecalhos_resposta)
+        return conteudo
+
+    async def _requisitar(self, url, entrada):
+        """GET condicional: (conteúdo, cabeçalhos); conteúdo None se o servidor respondeu 304"""
+        cabecalhos = entrada.cabecalhos_condicionais() if entrada else {}
+        async with self._sessao.get(url, headers=cabecalhos) as resposta:
+            if entrada and resposta.status == 304:
+                return None, resposta.headers
+            resposta.raise_for_status()
+            return await resposta.read(), resposta.headers
+
+    async def _buscar_pagina(self, url_inicial, numero):
+        """Baixa e analisa uma página de resultados"""
+        conteudo = await self._baixar(url_pagina(url_inicial, numero))
+        if not conteudo:
+            return [], False, None
+        if self.consultor.processos_analise:
+            return await asyncio.to_thread(self.consultor.analisar_pagina_listagem, conteudo)
+        return self.consultor.analisar_pagina_listagem(conteudo)
+
+    async def _baixar_e_analisar(self, link, opcoes, mapa_turmas):
+        conteudo = await self._baixar(link, revalidar=mapa_turmas.incremental)
+        if not conteudo:
+            return None
+        if mapa_turmas.incremental:
+            analisar = functools.partial(self.consultor.analisar_pagina_turma_incremental, link, conteudo, opcoes,
+                                         mapa_turmas)
+        else:
+            analisar = functools.partial(self.consultor.analisar_pagina_turma, conteudo, opcoes)
+        # Modo pipeline: a espera pelo pool de processos fica numa thread e o loop segue baixando.
+        # O modo incremental também vai para uma thread: lê e grava a análise guardada no SQLite
+        if self.consultor.processos_analise or mapa_turmas.incremental:
+            return await asyncio.to_thread(analisar)
+        return analisar()
+
+    async def _processar_turma(self, link, curso_nome, periodo, departamento, opcoes, mapa_turmas):
+        ficha = await mapa_turmas.obter_async(link, curso_nome,
+                                              lambda url: self._baixar_e_analisar(url, opcoes, mapa_turmas))
+        return montar_registros(ficha, link, curso_nome, periodo, departamento, opcoes)
+
+    async def _buscar_turmas(self, curso_nome, periodo, departamento, codigo_disciplina, opcoes, mapa_turmas,
+                             progresso, turma_concluida, entregar_lote):
+        """Equivalente assíncrono de buscar_turmas_detalhadas"""
+        msg = f"🔍 Buscando turmas de {curso_nome} - Período {periodo}"
+        if codigo_disciplina:
+            msg += f" - Disciplina {codigo_disciplina}"
+        elif departamento and departamento != 'TODOS':
+            msg += f" - Depto {departamento}"
+        self._emitir('info', msg)
+
+        id_curso = self.consultor.ids_cursos.get(curso_nome)
+        if not id_curso:
+            return []
+
+        url_busca = self.consultor.construir_url_busca(id_curso, departamento, periodo, codigo_disciplina)
+
+        async def processar(i, link):
+            # timeout_tarefa vale para cada requisição (ver _baixar), não para a espera na fila
+            return i, await self._processar_turma(link, curso_nome, periodo, departamento, opcoes, mapa_turmas)
+
+        async def pagina(numero):
+            return numero, await self._buscar_pagina(url_busca, numero)
+
+        # Páginas e turmas correm juntas: as turmas da primeira página começam
+        # enquanto as demais páginas anunciadas ainda estão sendo baixadas
+        resultados = []
+        links_vistos = set()
+        maior_pagina = 1
+        paginas = {asyncio.create_task(pagina(1))}
+        turmas = set()
+        try:
+            while (paginas or turmas) and not progresso['cancelado']:
+                feitas, _ = await asyncio.wait(paginas | turmas, return_when=asyncio.FIRST_COMPLETED)
+                for tarefa in feitas:
+                    if tarefa in paginas:
+                        paginas.discard(tarefa)
+                        numero, (links_pagina, tem_proxima, total_paginas) = tarefa.result()
+                        for seguinte in paginas_a_agendar(numero, maior_pagina, bool(links_pagina), tem_proxima,
+                                                          total_paginas):
+                            paginas.add(asyncio.create_task(pagina(seguinte)))
+                            maior_pagina = seguinte
+
+                        novos = [link for link in links_pagina if link not in links_vistos]
+                        links_vistos.update(novos)
+                        progresso['turmas_total'] += len(novos)
+                        if periodo in progresso['periodos']:
+                            progresso['periodos'][periodo][0] += len(novos)
+                        for link in novos:
+                            resultados.append(None)
+                            turmas.add(asyncio.create_task(processar(len(resultados) - 1, link)))
+                        continue
+
+                    turmas.discard(tarefa)
+                    i, registros = tarefa.result()
+                    resultados[i] = registros
+                    if registros:
+                        entregar_lote(registros)
+                    if not turma_concluida(periodo):
+                        break
+        finally:
+            for tarefa in paginas | turmas:
+                tarefa.cancel()
+
+        if not resultados and not progresso['cancelado']:
+            self._avisar(f"ℹ️ Nenhuma turma encontrada para {curso_nome} no período {periodo}")
+            return []
+
+        return [registro for registros in resultados if registros for registro in registros]
@@ -0,0 +1,55 @@
+# ===== OPÇÕES POR CONSULTA =====
+from dataclasses import dataclass
+
+# Códigos numéricos usados na tabela de vagas alocadas de cada turma
+CODIGOS_CURSOS = {
+    'Química': '028',
+    'Química Industrial': '029',
+    'Engenharia Química': '027',
+    'Farmácia': '015'
+}
+
+
+@dataclass(frozen=True)
+class OpcoesConsulta:
+    """Filtros de curso de uma consulta, passados a cada chamada do consultor"""
+    cursos_selecionados: tuple = ('Química', 'Química Industrial')
+    apenas_cursos_quimica: bool = True
+    mostrar_outros_cursos: bool = False
+
+    def __post_init__(self):
+        # Aceita listas vindas da interface mantendo a instância imutável e hashable
+        object.__setattr__(self, 'cursos_selecionados', tuple(self.cursos_selecionados or ()))
+
+    @property
+    def codigos_cursos_filtro(self):
+        """Códigos de curso para filtro baseado nos cursos selecionados"""
+        return [CODIGOS_CURSOS[curso] for curso in self.cursos_selecionados if curso in CODIGOS_CURSOS]
+
+    def incluir_curso(self, codigo_curso):
+        """Indica se as vagas do curso devem entrar no resultado"""
+        if self.mostrar_outros_cursos:
+            return True
+        if self.apenas_cursos_quimica:
+            # Comparacao exata: codigo do curso deve estar na lista de codigos permitidos
+            return codigo_curso.zfill(3) in self.codigos_cursos_filtro
+        return True
+
+
+@dataclass(frozen=True)
+class AjustesConsulta:
+    """Concorrência, paralelismo e prazos de uma consulta, fixos do início ao fim dela"""
+    max_concorrencia: int = 6
+    periodos_paralelos: int = 4
+    processos_analise: int = 0
+    timeout_tarefa: float = 60
+
+    def __post_init__(self):
+        # Valores vindos de sliders/configuração normalizados uma vez, mantendo a instância imutável
+        object.__setattr__(self, 'max_concorrencia', max(1, int(self.max_concorrencia)))
+        object.__setattr__(self, 'periodos_paralelos', max(1, int(self.periodos_paralelos)))
+        object.__setattr__(self, 'processos_analise', max(0, int(self.processos_analise)))
+
+
+# Sem filtro de curso: usada para guardar análises reaproveitáveis por qualquer consulta
+OPCOES_SEM_FILTRO = OpcoesConsulta(mostrar_outros_cursos=True)
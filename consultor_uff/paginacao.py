@@ -0,0 +1,17 @@
+# ===== PAGINAÇÃO DOS RESULTADOS DE BUSCA =====
+# A primeira página anuncia o número da última na ul.pagination; as demais
+# são agendadas de uma vez. Sem essa informação, segue página a página.
+
+
+def url_pagina(url_inicial, numero):
+    """URL da página de resultados de número indicado"""
+    return f"{url_inicial}&page={numero}" if numero > 1 else url_inicial
+
+
+def paginas_a_agendar(numero, maior_agendada, tem_links, tem_proxima, total_anunciado=None):
+    """Páginas a buscar depois que a página `numero` chegou"""
+    # Só a maior página agendada estende o plano: a primeira agenda até o total
+    # anunciado; se a última ainda indicar próxima, avança uma página por vez
+    if not tem_links or not tem_proxima or numero < maior_agendada:
+        return range(0)
+    return range(maior_agendada + 1, max(total_anunciado or 0, numero + 1) + 1)
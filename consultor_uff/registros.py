@@ -0,0 +1,53 @@
+# ===== ARMAZENAMENTO DE REGISTROS DE TURMAS =====
+
+# Campos que identificam um registro único no resultado da consulta
+CAMPOS_CHAVE = ('periodo', 'codigo_disciplina', 'turma', 'curso_vaga')
+# Contagens e totais de um registro (INTEGER no histórico, int32 na tabela de resultados)
+CAMPOS_NUMERICOS = [
+    'vagas_reg', 'vagas_vest', 'inscritos_reg', 'inscritos_vest', 'excedentes', 'candidatos',
+    'vagas_disponiveis_reg', 'vagas_disponiveis_vest', 'total_vagas', 'total_inscritos',
+    'total_vagas_disponiveis',
+]
+# Mesma ordem das chaves de montar_registros
+CAMPOS_REGISTRO = [
+    'periodo', 'departamento', 'codigo_disciplina', 'nome_disciplina', 'turma', 'horarios',
+    'curso_origem_busca', 'curso_vaga', *CAMPOS_NUMERICOS, 'url',
+]
+
+
+def chave_registro(registro):
+    """Chave de deduplicação de um registro de turma"""
+    return (registro['periodo'], registro['codigo_disciplina'], registro['turma'], registro['curso_vaga'])
+
+
+class RegistrosTurmas:
+    """Registros deduplicados por (periodo, codigo_disciplina, turma, curso_vaga) em ordem de inserção"""
+
+    def __init__(self, registros=None):
+        self._registros = {}
+        if registros:
+            self.adicionar_varios(registros)
+
+    def adicionar(self, registro):
+        """Adiciona o registro se a chave ainda não existe; o primeiro sempre prevalece"""
+        chave = chave_registro(registro)
+        if chave in self._registros:
+            return False
+        self._registros[chave] = registro
+        return True
+
+    def adicionar_varios(self, registros):
+        """Adiciona vários registros e retorna quantos eram novos"""
+        return sum(1 for registro in registros if self.adicionar(registro))
+
+    def __contains__(self, registro):
+        return chave_registro(registro) in self._registros
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __iter__(self):
+        return iter(self._registros.values())
+
+    def como_lista(self):
+        return list(self._registros.values())
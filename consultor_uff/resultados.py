@@ -0,0 +1,104 @@
+# ===== TABELA DE RESULTADOS =====
+# DataFrame montado a partir dos registros da consulta ou do histórico.
+#
+# Os registros chegam como dicts (montar_registros) e são acumulados em colunas
+# compactas: contagens em int32 e rótulos repetidos (período, curso, horários,
+# URL...) como códigos de categoria, sem um dict por linha nem strings repetidas.
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from consultor_uff.registros import CAMPOS_REGISTRO
+from consultor_uff.turma import calcular_colunas_derivadas
+
+# Contagens lidas da tabela de vagas; as demais colunas numéricas derivam delas
+COLUNAS_CONTAGEM = ['vagas_reg', 'vagas_vest', 'inscritos_reg', 'inscritos_vest', 'excedentes', 'candidatos']
+# Rótulos com poucos valores distintos, guardados como categorias (em ordem alfabética)
+COLUNAS_CATEGORICAS = ['periodo', 'departamento', 'horarios', 'curso_origem_busca', 'curso_vaga', 'url']
+# Textos quase únicos por turma: listas com a mesma string reaproveitada entre os cursos da turma
+COLUNAS_TEXTO = ['codigo_disciplina', 'nome_disciplina', 'turma']
+
+
+def _inteiro(valor):
+    """Contagem como int; valores ausentes ou inválidos viram 0"""
+    if type(valor) is int:
+        return valor
+    try:
+        return int(float(valor))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+class RegistrosColunares:
+    """Registros de turma acumulados direto em colunas tipadas, na ordem de inserção"""
+
+    def __init__(self, registros=None):
+        self._contagens = {coluna: array('i') for coluna in COLUNAS_CONTAGEM}
+        self._codigos = {coluna: array('i') for coluna in COLUNAS_CATEGORICAS}
+        self._categorias = {coluna: {} for coluna in COLUNAS_CATEGORICAS}
+        self._textos = {coluna: [] for coluna in COLUNAS_TEXTO}
+        self._internadas = {}
+        self._tamanho = 0
+        if registros:
+            self.adicionar_varios(registros)
+
+    def adicionar(self, registro):
+        for coluna, valores in self._contagens.items():
+            valores.append(_inteiro(registro.get(coluna)))
+        for coluna, codigos in self._codigos.items():
+            valor = registro.get(coluna)
+            categorias = self._categorias[coluna]
+            codigo = categorias.get(valor)
+            if codigo is None:
+                # None/NaN ficam como ausentes (-1), como no DataFrame montado a partir dos dicts
+                codigo = -1 if valor is None or valor != valor else categorias.setdefault(valor, len(categorias))
+            codigos.append(codigo)
+        for coluna, valores in self._textos.items():
+            valor = registro.get(coluna)
+            valores.append(self._internadas.setdefault(valor, valor) if isinstance(valor, str) else valor)
+        self._tamanho += 1
+
+    def adicionar_varios(self, registros):
+        for registro in registros:
+            self.adicionar(registro)
+
+    def __len__(self):
+        return self._tamanho
+
+    def _categorica(self, coluna):
+        """Coluna categórica com as categorias em ordem alfabética (ordenar segue a ordem do texto)"""
+        categorias = self._categorias[coluna]
+        ordenadas = sorted(categorias, key=str)
+        # posicoes[código de inserção] = código na ordem alfabética; a última posição leva -1 em -1
+        posicoes = np.full(len(ordenadas) + 1, -1, dtype=np.int32)
+        posicoes[[categorias[valor] for valor in ordenadas]] = np.arange(len(ordenadas), dtype=np.int32)
+        codigos = posicoes[np.frombuffer(self._codigos[coluna], dtype=np.intc)]
+        return pd.Categorical.from_codes(codigos, categories=ordenadas)
+
+    def como_dataframe(self):
+        """DataFrame nas colunas de montar_registros, com contagens int32 e colunas derivadas calculadas"""
+        contagens = {
+            coluna: np.frombuffer(valores, dtype=np.intc).astype(np.int32)
+            for coluna, valores in self._contagens.items()
+        }
+        # Uma passada vetorizada sobre as colunas inteiras, com a mesma regra aplicada a cada
+        # linha da tabela de vagas; também corrige registros antigos do histórico
+        numericas = {**contagens, **calcular_colunas_derivadas(**contagens)}
+
+        colunas = {}
+        for coluna in CAMPOS_REGISTRO:
+            if coluna in numericas:
+                colunas[coluna] = numericas[coluna]
+            elif coluna in self._codigos:
+                colunas[coluna] = self._categorica(coluna)
+            else:
+                colunas[coluna] = self._textos[coluna]
+        return pd.DataFrame(colunas)
+
+
+def montar_dataframe_resultado(dados):
+    """DataFrame de resultados a partir dos registros (dicts ou RegistrosColunares), com excedentes e totais calculados"""
+    if not isinstance(dados, RegistrosColunares):
+        dados = RegistrosColunares(dados)
+    return dados.como_dataframe()
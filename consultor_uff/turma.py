@@ -0,0 +1,346 @@
+# ===== FICHA DE TURMA E MONTAGEM DE REGISTROS =====
+# A página de uma turma é analisada uma única vez (FichaTurma); os registros
+# de cada curso que a listou são montados a partir da ficha.
+import asyncio
+import hashlib
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field, replace
+
+from consultor_uff.opcoes import OpcoesConsulta
+
+DIAS_SEMANA = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
+
+# Nomes usados quando a tabela de vagas traz só o código do curso
+NOMES_CONHECIDOS = {
+    '028': 'Química',
+    '029': 'Química Industrial',
+    '027': 'Engenharia Química',
+    '015': 'Farmácia',
+    '025': 'Física',
+    '020': 'Matemática',
+    '041': 'Engenharia de Telecomunicações',
+    '042': 'Engenharia de Produção',
+    '043': 'Engenharia Civil',
+    '044': 'Engenharia Mecânica',
+    '045': 'Engenharia Elétrica',
+}
+
+# Padrões do título (h1): índices dos grupos (turma, código, nome) de cada um
+PADROES_TITULO = [
+    (re.compile(r'Turma\s+(\S+)\s+de\s+(\S+)\s+-\s+(.+)'), (1, 2, 3)),
+    (re.compile(r'(\S+)\s+-\s+(.+)\s+-\s+Turma\s+(\S+)'), (3, 1, 2)),
+    (re.compile(r'(.+?)\s*-\s*Turma\s+(\S+)'), (None, 1, 2)),
+]
+RE_TURMA = re.compile(r'Turma\s+(\S+)')
+RE_CURSO_VAGA = re.compile(r'^(\d{3})\s*-\s*(.+)$')
+RE_CODIGO_CURSO = re.compile(r'\b(\d{3})\b')
+RE_SEPARADOR_INICIAL = re.compile(r'^[\s\-]+')
+RE_NUMERO = re.compile(r'\b(\d+)\b')
+
+# Trechos que mudam a cada resposta sem mudar a turma (tokens CSRF do Rails)
+RE_TRECHOS_VOLATEIS = re.compile(
+    rb'<meta[^>]+name="csrf-(?:token|param)"[^>]*>|<input[^>]+name="authenticity_token"[^>]*>'
+)
+# Entra na impressão: mudar a análise invalida as fichas guardadas
+VERSAO_ANALISE = 1
+
+# Campos de cada vaga na forma compacta da ficha; as colunas derivadas são recalculadas ao montá-la
+CAMPOS_VAGA_COMPACTA = ('curso', 'vagas_reg', 'vagas_vest', 'inscritos_reg', 'inscritos_vest', 'excedentes',
+                        'candidatos')
+
+
+@dataclass
+class FichaTurma:
+    """Dados extraídos da página de uma turma, independentes do curso que a listou"""
+    codigo_disciplina: str = ''
+    nome_disciplina: str = ''
+    turma: str = ''
+    departamento: str = ''
+    horarios: str = 'Não informado'
+    vagas: list = field(default_factory=list)
+
+    def filtrada(self, opcoes):
+        """Cópia da ficha só com as vagas dos cursos aceitos pelas opções"""
+        vagas = [vaga for vaga in self.vagas if opcoes.incluir_curso(vaga['curso'].split(' - ')[0])]
+        return replace(self, vagas=vagas)
+
+    def como_dict(self):
+        return asdict(self)
+
+    def como_tupla(self):
+        """Forma compacta da ficha, barata de transferir entre processos (ver ficha_de_tupla)"""
+        return (
+            self.codigo_disciplina, self.nome_disciplina, self.turma, self.departamento, self.horarios,
+            tuple(tuple(vaga[campo] for campo in CAMPOS_VAGA_COMPACTA) for vaga in self.vagas)
+        )
+
+
+def ficha_de_tupla(tupla):
+    """FichaTurma a partir de FichaTurma.como_tupla(); None continua None"""
+    if tupla is None:
+        return None
+    *campos, vagas = tupla
+    return FichaTurma(*campos, vagas=[montar_vaga(*vaga) for vaga in vagas])
+
+
+def impressao_pagina(conteudo):
+    """Impressão digital do conteúdo de uma página de turma, ignorando trechos voláteis"""
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode('utf-8')
+    resumo = hashlib.sha1(f"v{VERSAO_ANALISE}:".encode())
+    resumo.update(RE_TRECHOS_VOLATEIS.sub(b'', conteudo))
+    return resumo.hexdigest()
+
+
+def interpretar_titulo(texto_titulo):
+    """Extrai (codigo_disciplina, nome_disciplina, turma, departamento) do título da página"""
+    codigo_disciplina = ''
+    nome_disciplina = ''
+    turma = ''
+
+    for padrao, (grupo_turma, grupo_codigo, grupo_nome) in PADROES_TITULO:
+        match = padrao.search(texto_titulo)
+        if match:
+            turma = match.group(grupo_turma) if grupo_turma else ''
+            codigo_disciplina = match.group(grupo_codigo)
+            nome_disciplina = match.group(grupo_nome)
+            break
+
+    if not codigo_disciplina:
+        partes = texto_titulo.split(' - ')
+        if len(partes) >= 2:
+            primeira_parte = partes[0]
+            if 'Turma' in primeira_parte:
+                turma_match = RE_TURMA.search(primeira_parte)
+                if turma_match:
+                    turma = turma_match.group(1)
+                    segunda_parte = partes[1]
+                    if len(segunda_parte.split()) > 1:
+                        partes_codigo = segunda_parte.split()
+                        codigo_disciplina = partes_codigo[0]
+                        nome_disciplina = ' '.join(partes_codigo[1:])
+
+    departamento = codigo_disciplina[:3] if len(codigo_disciplina) >= 3 else ''
+    return codigo_disciplina, nome_disciplina, turma, departamento
+
+
+def _positivo(valor):
+    return valor * (valor > 0)
+
+
+def calcular_colunas_derivadas(vagas_reg, vagas_vest, inscritos_reg, inscritos_vest, excedentes, candidatos):
+    """Excedentes corrigidos, vagas disponíveis e totais a partir das contagens da tabela de vagas
+
+    Só aritmética e comparações: vale para os números de uma linha e, de uma vez, para as
+    colunas inteiras do DataFrame de resultados (montar_dataframe_resultado).
+    """
+    # Sem excedentes informados, os candidatos além das vagas regulares contam como excedentes
+    excedentes = excedentes + ((excedentes == 0) & (vagas_reg > 0) & (candidatos > vagas_reg)) * (candidatos - vagas_reg)
+    return {
+        'excedentes': excedentes,
+        'vagas_disponiveis_reg': _positivo(vagas_reg - inscritos_reg),
+        'vagas_disponiveis_vest': _positivo(vagas_vest - inscritos_vest),
+        'total_vagas': vagas_reg + vagas_vest,
+        'total_inscritos': inscritos_reg + inscritos_vest,
+        'total_vagas_disponiveis': _positivo((vagas_reg - inscritos_reg) + (vagas_vest - inscritos_vest)),
+    }
+
+
+def formatar_horarios(textos_colunas):
+    """Formata as células da linha de horários como 'Dia: horário | ...'"""
+    horarios = []
+    for dia, texto in zip(DIAS_SEMANA, textos_colunas):
+        if texto and texto not in DIAS_SEMANA:
+            horarios.append(f"{dia}: {texto}")
+    return ' | '.join(horarios) if horarios else 'Não informado'
+
+
+def interpretar_linha_vagas(textos_colunas, opcoes):
+    """Converte as células de uma linha da tabela de vagas; None se não for linha de curso ou for filtrada"""
+    # A primeira coluna geralmente contém "código - nome do curso", ex.: "028 - Química"
+    primeira_coluna = textos_colunas[0]
+    match_curso = RE_CURSO_VAGA.match(primeira_coluna)
+
+    if match_curso:
+        codigo_curso = match_curso.group(1)
+        nome_curso = match_curso.group(2).strip()
+    else:
+        # Tentar extrair código de 3 dígitos de outra forma
+        codigo_match = RE_CODIGO_CURSO.search(primeira_coluna)
+        if not codigo_match:
+            return None
+        codigo_curso = codigo_match.group(1)
+        # Verificar se há nome após o código
+        resto = primeira_coluna.replace(codigo_curso, '').strip()
+        resto = RE_SEPARADOR_INICIAL.sub('', resto).strip()
+        if resto and not resto.isdigit():
+            nome_curso = resto
+        else:
+            nome_curso = NOMES_CONHECIDOS.get(codigo_curso, f"Curso {codigo_curso}")
+
+    # Extrair números das demais colunas (vagas, inscritos, etc.)
+    numeros = [int(n) for texto in textos_colunas[1:] for n in RE_NUMERO.findall(texto)]
+    if len(numeros) < 4:
+        return None
+
+    vagas_reg, vagas_vest, inscritos_reg, inscritos_vest = numeros[:4]
+    excedentes = 0
+    candidatos = 0
+    if len(numeros) >= 6:
+        excedentes = numeros[4]
+        candidatos = numeros[5]
+
+    # Aplicar filtros - usa comparacao exata de codigos
+    if not opcoes.incluir_curso(codigo_curso):
+        return None
+
+    return montar_vaga(f"{codigo_curso} - {nome_curso}", vagas_reg, vagas_vest, inscritos_reg, inscritos_vest,
+                       excedentes, candidatos)
+
+
+def montar_vaga(curso, vagas_reg, vagas_vest, inscritos_reg, inscritos_vest, excedentes, candidatos):
+    """Vaga alocada de um curso com as colunas derivadas (reaplicar a regra dos excedentes não a altera)"""
+    return {
+        'curso': curso,
+        'vagas_reg': vagas_reg,
+        'vagas_vest': vagas_vest,
+        'inscritos_reg': inscritos_reg,
+        'inscritos_vest': inscritos_vest,
+        'candidatos': candidatos,
+        **calcular_colunas_derivadas(vagas_reg, vagas_vest, inscritos_reg, inscritos_vest, excedentes, candidatos)
+    }
+
+
+def montar_registros(ficha, url_turma, curso_origem, periodo, departamento_busca=None, opcoes=None):
+    """Monta os registros de uma turma atribuídos ao curso de origem da busca"""
+    if ficha is None:
+        return []
+
+    opcoes = opcoes or OpcoesConsulta()
+
+    if departamento_busca and departamento_busca != 'TODOS' and ficha.departamento != departamento_busca:
+        return []
+
+    if not ficha.vagas:
+        if opcoes.apenas_cursos_quimica and not opcoes.mostrar_outros_cursos:
+            return []
+
+        registro_basico = {
+            'periodo': periodo,
+            'departamento': ficha.departamento,
+            'codigo_disciplina': ficha.codigo_disciplina,
+            'nome_disciplina': ficha.nome_disciplina,
+            'turma': ficha.turma,
+            'horarios': ficha.horarios,
+            'curso_origem_busca': curso_origem,
+            'curso_vaga': curso_origem,
+            'vagas_reg': 0,
+            'vagas_vest': 0,
+            'inscritos_reg': 0,
+            'inscritos_vest': 0,
+            'excedentes': 0,
+            'candidatos': 0,
+            'vagas_disponiveis_reg': 0,
+            'vagas_disponiveis_vest': 0,
+            'total_vagas': 0,
+            'total_inscritos': 0,
+            'total_vagas_disponiveis': 0,
+            'url': url_turma
+        }
+        return [registro_basico]
+
+    registros = []
+    for vaga in ficha.vagas:
+        registro = {
+            'periodo': periodo,
+            'departamento': ficha.departamento,
+            'codigo_disciplina': ficha.codigo_disciplina,
+            'nome_disciplina': ficha.nome_disciplina,
+            'turma': ficha.turma,
+            'horarios': ficha.horarios,
+            'curso_origem_busca': curso_origem,
+            'curso_vaga': vaga['curso'],
+            'vagas_reg': vaga['vagas_reg'],
+            'vagas_vest': vaga['vagas_vest'],
+            'inscritos_reg': vaga['inscritos_reg'],
+            'inscritos_vest': vaga['inscritos_vest'],
+            'excedentes': vaga['excedentes'],
+            'candidatos': vaga['candidatos'],
+            'vagas_disponiveis_reg': vaga['vagas_disponiveis_reg'],
+            'vagas_disponiveis_vest': vaga['vagas_disponiveis_vest'],
+            'total_vagas': vaga['total_vagas'],
+            'total_inscritos': vaga['total_inscritos'],
+            'total_vagas_disponiveis': vaga['total_vagas_disponiveis'],
+            'url': url_turma
+        }
+        registros.append(registro)
+
+    return registros
+
+
+class MapaTurmasConsulta:
+    """Registro de URLs de turma de uma consulta: cada página é baixada e analisada uma vez"""
+
+    def __init__(self, incremental=False):
+        self._fichas = {}
+        self._cursos = {}
+        self._lock = threading.Lock()
+        self.buscas = 0
+        self.reaproveitadas = 0
+
+        # Atualização incremental: só reanalisa páginas cuja impressão mudou desde a última consulta
+        self.incremental = incremental
+        self.alteradas = 0
+        self.novas = 0
+        self.inalteradas = 0
+
+    def _registrar(self, url, curso):
+        """Anota o curso que listou a URL e indica se esta chamada é a primeira (com lock)"""
+        cursos = self._cursos.setdefault(url, [])
+        if curso not in cursos:
+            cursos.append(curso)
+        if url in self._fichas:
+            self.reaproveitadas += 1
+            return False
+        self.buscas += 1
+        return True
+
+    def obter(self, url, curso, analisar):
+        """Retorna a ficha da URL, chamando analisar(url) só na primeira vez (thread-safe)"""
+        with self._lock:
+            primeira = self._registrar(url, curso)
+            if primeira:
+                self._fichas[url] = Future()
+            futuro = self._fichas[url]
+
+        if primeira:
+            try:
+                futuro.set_result(analisar(url))
+            except BaseException as e:
+                futuro.set_exception(e)
+        return futuro.result()
+
+    async def obter_async(self, url, curso, analisar):
+        """Equivalente assíncrono de obter; analisar(url) é uma corrotina"""
+        with self._lock:
+            if self._registrar(url, curso):
+                self._fichas[url] = asyncio.ensure_future(analisar(url))
+            tarefa = self._fichas[url]
+        # shield: cancelar um dos cursos não cancela a análise compartilhada
+        return await asyncio.shield(tarefa)
+
+    def registrar_impressao(self, anterior, atual):
+        """Contabiliza a comparação da impressão atual de uma página com a guardada"""
+        with self._lock:
+            if anterior is None:
+                self.novas += 1
+            elif anterior != atual:
+                self.alteradas += 1
+            else:
+                self.inalteradas += 1
+
+    def cursos_da_url(self, url):
+        """Cursos de origem que listaram a URL, na ordem em que a pediram"""
+        return list(self._cursos.get(url, []))
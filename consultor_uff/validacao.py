@@ -0,0 +1,70 @@
+# ===== VALIDAÇÃO E FORMATAÇÃO DOS PARÂMETROS =====
+# Períodos ("2025.2" na interface, "20252" nas buscas), siglas de
+# departamento e códigos de disciplina informados pelo usuário.
+import re
+
+# Maior intervalo de períodos aceito numa consulta (10 anos)
+MAX_PERIODOS_INTERVALO = 20
+
+
+def formatar_periodo(periodo):
+    """Formata período para exibição"""
+    if '.' in periodo:
+        return periodo
+    elif len(periodo) == 5:
+        return f"{periodo[:4]}.{periodo[4]}"
+    return periodo
+
+
+def validar_periodo(periodo):
+    """Valida formato do período"""
+    if '.' in periodo:
+        partes = periodo.split('.')
+        if len(partes) == 2 and partes[0].isdigit() and partes[1].isdigit():
+            ano = int(partes[0])
+            semestre = int(partes[1])
+            if 2000 <= ano <= 2100 and semestre in [1, 2]:
+                return True
+    return False
+
+
+def validar_departamento(depto):
+    """Valida formato do departamento"""
+    if depto == 'TODOS' or depto == '':
+        return True
+    if len(depto) == 3 and depto.isalpha():
+        return True
+    return False
+
+
+def validar_codigo_disciplina(codigo):
+    """Valida formato do código de disciplina (3 letras + 5 números)"""
+    if not codigo:
+        return False
+    codigo = codigo.strip().upper()
+    # Padrão: 3 letras seguidas de 5 números (ex: GQI00061)
+    padrao = r'^[A-Z]{3}\d{5}$'
+    return bool(re.match(padrao, codigo))
+
+
+def intervalo_periodos(inicio, fim):
+    """Períodos de inicio a fim ('2022.1', '2026.1'), em ordem cronológica; vazio se algum for inválido"""
+    if not (validar_periodo(inicio) and validar_periodo(fim)):
+        return []
+    primeiro, ultimo = sorted(tuple(int(parte) for parte in periodo.split('.')) for periodo in (inicio, fim))
+    return [
+        f"{ano}.{semestre}"
+        for ano in range(primeiro[0], ultimo[0] + 1)
+        for semestre in (1, 2)
+        if primeiro <= (ano, semestre) <= ultimo
+    ]
+
+
+def descrever_periodos(periodos):
+    """'2025.2' para um período, '2022.1 a 2026.1' para um intervalo contínuo e a lista nos demais casos"""
+    formatados = [formatar_periodo(periodo) for periodo in periodos]
+    if not formatados:
+        return 'N/A'
+    if len(formatados) > 2 and formatados == intervalo_periodos(formatados[0], formatados[-1]):
+        return f"{formatados[0]} a {formatados[-1]}"
+    return ', '.join(formatados)
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+# Servidor falso do quadro de horários, compartilhado com os benchmarks
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from consultor_uff.turma import calcular_colunas_derivadas
+
+
+@pytest.fixture
+def registros():
+    """Registros de turma como os de montar_registros: dois cursos, três departamentos, com e sem vagas"""
+    registros = []
+    for i in range(12):
+        contagens = {
+            'vagas_reg': [0, 5, 10, 20][i % 4],
+            'vagas_vest': [0, 2, 5][i % 3],
+            'inscritos_reg': (i * 7) % 23,
+            'inscritos_vest': (i * 3) % 5,
+            'excedentes': [0, 0, 4][i % 3],
+            'candidatos': (i * 11) % 31,
+        }
+        registros.append({
+            'periodo': '20261' if i < 8 else '20252',
+            'departamento': ['GQI', 'GFQ', 'GQA'][i % 3],
+            'codigo_disciplina': f"{['GQI', 'GFQ', 'GQA'][i % 3]}000{i // 2:02d}",
+            'nome_disciplina': f"Disciplina {i // 2}",
+            'turma': ['A1', 'B1'][i % 2],
+            'horarios': ['Segunda: 08:00-10:00', 'Não informado'][i % 2],
+            'curso_origem_busca': 'Química',
+            'curso_vaga': ['Química', 'Química Industrial', '015 - Farmácia'][i % 3],
+            **contagens,
+            **{coluna: int(valor) for coluna, valor in calcular_colunas_derivadas(**contagens).items()},
+            'url': f"https://app.uff.br/graduacao/quadrodehorarios/turmas/{i // 2}",
+        })
+    return registros
@@ -0,0 +1,82 @@
+# Cache HTTP persistente: TTL por classe de URL, GET condicional e poda por idade
+import pytest
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+from consultor_uff import cache_http
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+URL_TURMA = 'https://app.uff.br/graduacao/quadrodehorarios/turmas/100'
+URL_LISTAGEM = 'https://app.uff.br/graduacao/quadrodehorarios/?q[curso]=1'
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(30, 20), latencia=0, jitter=0).iniciar_em_thread()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def consultar(servidor, cache):
+    consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor.base_url, cache_http=cache,
+                                                    requisicoes_por_segundo=1000)
+    return consultor.consultar_vagas_completas(['20252'], ['Química'], [None],
+                                               opcoes=OpcoesConsulta(mostrar_outros_cursos=True),
+                                               ao_evento=lambda evento: None)
+
+
+def test_ttl_de_turma_nao_passa_de_cinco_minutos():
+    cache = CacheHTTP(':memory:')
+    assert cache.ttl_para(URL_TURMA) <= 300
+    assert cache.ttl_para(URL_LISTAGEM) <= 300
+
+
+def test_entrada_expira_pelo_ttl_da_classe(monkeypatch):
+    cache = CacheHTTP(':memory:', ttl_listagem=10, ttl_turma=60)
+    agora = 1_000_000.0
+    monkeypatch.setattr(cache_http.time, 'time', lambda: agora)
+    turma = cache.salvar(URL_TURMA, b'<html/>', {'ETag': '"v1"'})
+    listagem = cache.salvar(URL_LISTAGEM, b'<html/>', {})
+
+    agora += 30
+    assert cache.esta_fresca(turma)
+    assert not cache.esta_fresca(listagem)
+    assert cache.obter(URL_TURMA).cabecalhos_condicionais() == {'If-None-Match': '"v1"'}
+
+
+def test_dentro_do_ttl_nao_consulta_o_servidor(servidor):
+    cache = CacheHTTP(':memory:')
+    primeira = consultar(servidor, cache)
+    requisicoes = servidor.contadores['requisicoes']
+
+    assert consultar(servidor, cache) == primeira
+    assert servidor.contadores['requisicoes'] == requisicoes
+
+
+def test_depois_do_ttl_revalida_com_get_condicional(servidor):
+    cache = CacheHTTP(':memory:', ttl_listagem=0, ttl_turma=0)
+    primeira = consultar(servidor, cache)
+    requisicoes = servidor.contadores['requisicoes']
+
+    assert consultar(servidor, cache) == primeira
+    revalidacoes = servidor.contadores['requisicoes'] - requisicoes
+    assert revalidacoes == requisicoes
+    assert servidor.contadores['nao_modificadas'] == revalidacoes
+
+
+def test_poda_remove_paginas_e_analises_antigas(monkeypatch):
+    cache = CacheHTTP(':memory:', idade_maxima=3600)
+    agora = 1_000_000.0
+    monkeypatch.setattr(cache_http.time, 'time', lambda: agora)
+    cache.salvar(URL_TURMA, b'<html/>', {})
+    cache.salvar_analise(URL_TURMA, 'impressao', {'vagas': 1})
+
+    agora += 1800
+    cache.salvar(URL_LISTAGEM, b'<html/>', {})
+    assert cache.podar() == 0
+
+    agora += 1801
+    assert cache.podar() == 2
+    assert cache.obter(URL_TURMA) is None
+    assert cache.obter_analise(URL_TURMA) is None
+    assert cache.obter(URL_LISTAGEM) is not None
@@ -0,0 +1,115 @@
+# Linha de comando contra o servidor falso: formatos de saída, códigos de saída e interrupção por SIGINT
+import csv
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import pytest
+from openpyxl import load_workbook
+
+from consultor_uff.cli import main
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def servidor():
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(30, 20), latencia=0, jitter=0).iniciar_em_thread()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def argumentos(servidor, saida, formato='jsonl'):
+    return ['2025.2', '--cursos', 'Química', 'Química Industrial', '--outros-cursos', '--formato', formato,
+            '--saida', str(saida), '--base-url', servidor.base_url, '--sem-cache', '--taxa', '1000', '-q']
+
+
+def ler_jsonl(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo]
+
+
+@pytest.fixture(scope='module')
+def referencia(servidor, tmp_path_factory):
+    caminho = tmp_path_factory.mktemp('cli') / 'vagas.jsonl'
+    assert main(argumentos(servidor, caminho)) == 0
+    registros = ler_jsonl(caminho)
+    assert registros
+    return registros
+
+
+def sem_endereco(registro):
+    return json.dumps(dict(registro, url=urlparse(registro['url']).path), sort_keys=True)
+
+
+def ler_saida(caminho, formato):
+    """(quantidade de registros, URLs) do arquivo gravado"""
+    if formato == 'csv':
+        with open(caminho, encoding='utf-8', newline='') as arquivo:
+            linhas = list(csv.DictReader(arquivo))
+        return len(linhas), {linha['url'] for linha in linhas}
+    if formato == 'xlsx':
+        aba = load_workbook(caminho, read_only=True)['Todas as Turmas']
+        linhas = list(aba.iter_rows(values_only=True))
+        coluna_url = linhas[0].index('url')
+        return len(linhas) - 1, {linha[coluna_url] for linha in linhas[1:]}
+    pytest.importorskip('pyarrow')
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    tabela = pq.read_table(caminho) if formato == 'parquet' else feather.read_table(caminho)
+    return tabela.num_rows, set(tabela.column('url').to_pylist())
+
+
+@pytest.mark.parametrize('formato', ['csv', 'xlsx', 'parquet', 'arrow'])
+def test_formatos_gravam_os_mesmos_registros(servidor, referencia, tmp_path, formato):
+    caminho = tmp_path / f"vagas.{formato}"
+
+    assert main(argumentos(servidor, caminho, formato)) == 0
+    assert ler_saida(caminho, formato) == (len(referencia), {registro['url'] for registro in referencia})
+
+
+def test_main_restaura_os_tratadores_de_sinal(servidor, tmp_path):
+    anterior = signal.getsignal(signal.SIGINT)
+    assert main(argumentos(servidor, tmp_path / 'vagas.jsonl')) == 0
+    assert signal.getsignal(signal.SIGINT) is anterior
+
+
+def test_periodo_invalido_e_erro_de_uso(capsys):
+    with pytest.raises(SystemExit) as saida:
+        main(['2025.3', '--sem-cache', '-q'])
+
+    assert saida.value.code == 2
+    assert 'período inválido: 2025.3' in capsys.readouterr().err
+
+
+def test_sigint_grava_o_parcial_e_sai_com_130(referencia, tmp_path):
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(30, 20), latencia=0.05, jitter=0).iniciar_em_thread()
+    caminho = tmp_path / 'vagas.jsonl'
+    try:
+        processo = subprocess.Popen(
+            [sys.executable, '-m', 'consultor_uff'] + argumentos(servidor, caminho)[:-1] + ['--concorrencia', '1'],
+            cwd=RAIZ, stderr=subprocess.PIPE, text=True
+        )
+        # Interrompe assim que as primeiras turmas forem gravadas
+        prazo = time.monotonic() + 30
+        while not (caminho.exists() and caminho.stat().st_size) and time.monotonic() < prazo:
+            time.sleep(0.02)
+        processo.send_signal(signal.SIGINT)
+        _, erros = processo.communicate(timeout=60)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    parcial = ler_jsonl(caminho)
+    assert processo.returncode == 130
+    assert '(consulta interrompida)' in erros
+    assert 0 < len(parcial) < len(referencia)
+    # Mesmas turmas da consulta completa; só o endereço do servidor muda na URL
+    assert {sem_endereco(registro) for registro in parcial} <= {sem_endereco(registro) for registro in referencia}
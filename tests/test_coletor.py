@@ -0,0 +1,30 @@
+# Coletor agendado: só coletas com dados chegam ao histórico
+from coletor_agendado import ColetorAgendado, TarefaColeta
+from consultor_uff import HistoricoVagas
+
+REGISTRO = {'periodo': '20261', 'codigo_disciplina': 'GQI00061', 'turma': 'A1', 'curso_vaga': 'Química',
+            'vagas_reg': 10, 'url': 'https://app.uff.br/graduacao/quadrodehorarios/turmas/1'}
+
+
+class ConsultorFixo:
+    """Devolve, a cada chamada, a próxima lista de registros programada"""
+
+    def __init__(self, *resultados):
+        self.resultados = list(resultados)
+
+    def consultar_vagas_completas(self, *args, **kwargs):
+        return self.resultados.pop(0)
+
+
+def test_coleta_vazia_nao_substitui_a_ultima_com_dados():
+    historico = HistoricoVagas(':memory:')
+    tarefa = TarefaColeta(nome='quimica', periodos=['20261'], cursos=['Química'])
+    coletor = ColetorAgendado(ConsultorFixo([REGISTRO], []), historico, [tarefa])
+
+    coletor.executar_tarefa(tarefa)
+    coletor.executar_tarefa(tarefa)
+
+    consultas = historico.consultas()
+    assert len(consultas) == 1
+    assert consultas[0]['total_registros'] == 1
+    assert historico.registros_da_consulta(consultas[0]['id'])[0]['turma'] == 'A1'
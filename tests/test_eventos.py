@@ -0,0 +1,39 @@
+# Entrega dos eventos e lotes de registros da consulta
+from consultor_uff.eventos import EventoConsulta, LotesEmOrdem, entregar_sem_repeticao
+
+
+def registro(turma, curso_origem_busca):
+    return {'periodo': '20261', 'codigo_disciplina': 'GQI00061', 'turma': turma, 'curso_vaga': 'Química',
+            'curso_origem_busca': curso_origem_busca}
+
+
+def test_lotes_de_buscas_seguintes_esperam_as_anteriores():
+    entregues = []
+    lotes = LotesEmOrdem(3, entregues.append)
+
+    lotes.lote(1, ['b1'])
+    lotes.lote(0, ['a1'])
+    lotes.lote(2, ['c1'])
+    assert entregues == [['a1']]
+
+    lotes.concluir(2)
+    assert entregues == [['a1']]
+    lotes.concluir(0)
+    assert entregues == [['a1'], ['b1']]
+    lotes.lote(1, ['b2'])
+    assert entregues == [['a1'], ['b1'], ['b2']]
+    lotes.concluir(1)
+    assert entregues == [['a1'], ['b1'], ['b2'], ['c1']]
+
+
+def test_entregar_sem_repeticao_descarta_registros_ja_entregues():
+    eventos = []
+    repassar = entregar_sem_repeticao(eventos.append)
+
+    repassar(EventoConsulta('registros', registros=(registro('A1', 'Química'), registro('B1', 'Química'))))
+    repassar(EventoConsulta('registros', registros=(registro('A1', 'Química Industrial'),)))
+    repassar(EventoConsulta('progresso', fracao=0.5))
+
+    assert [evento.tipo for evento in eventos] == ['registros', 'progresso']
+    assert [r['curso_origem_busca'] for r in eventos[0].registros] == ['Química', 'Química']
+    assert entregar_sem_repeticao(None) is None
@@ -0,0 +1,86 @@
+# Planilha Excel: modos streaming e célula a célula equivalentes; linhas de Por Departamento e Estatísticas
+from openpyxl import load_workbook
+
+from consultor_uff.excel import (CABECALHOS_DEPARTAMENTO, COLUNAS_PLANILHA, _linhas_departamento,
+                                 _linhas_estatisticas, gerar_excel_completo)
+from consultor_uff.resultados import montar_dataframe_resultado
+from consultor_uff.turma import calcular_colunas_derivadas
+
+
+def valores_por_aba(arquivo):
+    """{aba: linhas de valores}, na ordem das abas da planilha"""
+    planilha = load_workbook(arquivo)
+    return {nome: [list(linha) for linha in planilha[nome].iter_rows(values_only=True)]
+            for nome in planilha.sheetnames}
+
+
+def test_streaming_e_celulas_geram_a_mesma_planilha(registros):
+    df = montar_dataframe_resultado(registros)
+
+    streaming = valores_por_aba(gerar_excel_completo(df, '2026.1', streaming=True))
+    celulas = valores_por_aba(gerar_excel_completo(df, '2026.1', streaming=False))
+
+    assert list(streaming) == list(celulas) == [
+        'Todas as Turmas', 'Com Vagas Reg', 'Com Vagas Vest', 'Com Excedentes', 'Por Departamento', 'Estatísticas'
+    ]
+    for nome in celulas:
+        assert streaming[nome] == celulas[nome], nome
+    assert len(celulas['Todas as Turmas']) == len(registros) + 1
+
+
+def test_dataframe_vazio_nao_gera_planilha(registros):
+    df = montar_dataframe_resultado(registros).iloc[0:0]
+    assert gerar_excel_completo(df, '2026.1', streaming=True) is None
+    assert gerar_excel_completo(df, '2026.1', streaming=False) is None
+
+
+def registro(periodo, departamento, codigo, turma, curso, vagas_reg, vagas_vest, inscritos_reg, inscritos_vest,
+             excedentes=0):
+    contagens = dict(vagas_reg=vagas_reg, vagas_vest=vagas_vest, inscritos_reg=inscritos_reg,
+                     inscritos_vest=inscritos_vest, excedentes=excedentes, candidatos=0)
+    return {'periodo': periodo, 'departamento': departamento, 'codigo_disciplina': codigo,
+            'nome_disciplina': f"Disciplina {codigo}", 'turma': turma, 'curso_vaga': curso,
+            **contagens, **calcular_colunas_derivadas(**contagens)}
+
+
+def quadro_fora_de_ordem():
+    """Períodos, departamentos e turmas embaralhados; uma turma sem departamento e uma repetida em dois cursos"""
+    return montar_dataframe_resultado([
+        registro('20261', 'GQI', 'GQI00002', 'B1', 'Química', 10, 5, 12, 3),
+        registro('20261', 'GFQ', 'GFQ00001', 'A1', 'Química', 20, 0, 5, 0, excedentes=2),
+        registro('20261', 'GQI', 'GQI00002', 'A1', 'Química Industrial', 8, 2, 4, 2),
+        registro('20252', 'GQI', 'GQI00001', 'A1', 'Química', 0, 0, 0, 0),
+        registro('20261', 'GQI', 'GQI00001', 'A1', 'Química', 6, 0, 6, 0, excedentes=1),
+        registro('20261', None, 'GQA00001', 'A1', 'Química', 4, 0, 1, 0),
+        registro('20261', 'GQI', 'GQI00001', 'A1', 'Química Industrial', 6, 0, 2, 0),
+    ]).reindex(columns=COLUNAS_PLANILHA, fill_value='')
+
+
+def test_linhas_por_departamento():
+    assert list(_linhas_departamento(quadro_fora_de_ordem())) == [
+        CABECALHOS_DEPARTAMENTO,
+        ('20252', 'GQI', 'GQI00001', 'Disciplina GQI00001', 'A1', 0, 0, 0, 0, 0, 0, 0, 0, 0),
+        ('20261', 'GFQ', 'GFQ00001', 'Disciplina GFQ00001', 'A1', 20, 0, 5, 0, 15, 0, 20, 5, 15),
+        # Mesma disciplina e turma em dois cursos: ficam na ordem de entrada
+        ('20261', 'GQI', 'GQI00001', 'Disciplina GQI00001', 'A1', 6, 0, 6, 0, 0, 0, 6, 6, 0),
+        ('20261', 'GQI', 'GQI00001', 'Disciplina GQI00001', 'A1', 6, 0, 2, 0, 4, 0, 6, 2, 4),
+        ('20261', 'GQI', 'GQI00002', 'Disciplina GQI00002', 'A1', 8, 2, 4, 2, 4, 0, 10, 6, 4),
+        ('20261', 'GQI', 'GQI00002', 'Disciplina GQI00002', 'B1', 10, 5, 12, 3, 0, 2, 15, 15, 0),
+    ]
+
+
+def test_linhas_de_estatisticas():
+    linhas = list(_linhas_estatisticas(quadro_fora_de_ordem()))
+
+    assert linhas[0] == [
+        'Período', 'Curso', 'Total Turmas', 'Turmas com Vagas Reg', 'Turmas com Vagas Vest', 'Turmas com Excedentes',
+        'Total Vagas Reg', 'Total Vagas Vest', 'Total Inscritos Reg', 'Total Inscritos Vest', 'Total Excedentes',
+        'Total Vagas Disp Reg', 'Total Vagas Disp Vest', 'Taxa Ocupação Reg (%)', 'Taxa Ocupação Vest (%)',
+    ]
+    # Períodos e cursos na ordem em que aparecem; sem vagas, a taxa de ocupação é zero
+    assert linhas[1:] == [
+        ['20261', 'Química', 4, 2, 1, 2, 40, 5, 24, 3, 3, 18, 2, 60.0, 60.0],
+        ['20261', 'Química Industrial', 2, 2, 0, 0, 14, 2, 6, 2, 0, 8, 0, 42.86, 100.0],
+        ['20252', 'Química', 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ]
+    assert list(_linhas_estatisticas(quadro_fora_de_ordem().iloc[0:0])) == []
@@ -0,0 +1,53 @@
+# Exportação em Parquet, Arrow IPC e CSV: o arquivo lido de volta tem o resultado da planilha
+import io
+
+import pandas as pd
+import pytest
+
+from consultor_uff.excel import COLUNAS_PLANILHA
+from consultor_uff.exportacao import escrever_csv, formato_disponivel, gerar_exportacao, tabela_exportacao
+from consultor_uff.resultados import montar_dataframe_resultado
+
+
+@pytest.fixture
+def df(registros):
+    return montar_dataframe_resultado(registros)
+
+
+def comparar_com_a_planilha(lido, df):
+    esperado = tabela_exportacao(df)
+    assert list(lido.columns) == COLUNAS_PLANILHA
+    for coluna in COLUNAS_PLANILHA:
+        assert lido[coluna].astype(object).tolist() == esperado[coluna].astype(object).tolist(), coluna
+
+
+def test_csv_ida_e_volta(df):
+    lido = pd.read_csv(gerar_exportacao(df, 'csv'), dtype={'periodo': str})
+    comparar_com_a_planilha(lido, df)
+
+
+def test_csv_em_blocos_igual_ao_inteiro(df):
+    arquivo = io.StringIO()
+    escrever_csv(df, arquivo, linhas_por_bloco=5)
+    assert arquivo.getvalue().encode('utf-8') == gerar_exportacao(df, 'csv').getvalue()
+
+
+@pytest.mark.parametrize('formato', ['parquet', 'arrow'])
+def test_formatos_colunares_ida_e_volta(df, formato):
+    pytest.importorskip('pyarrow')
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    arquivo = gerar_exportacao(df, formato)
+    tabela = pq.read_table(arquivo) if formato == 'parquet' else feather.read_table(arquivo)
+    lido = tabela.to_pandas()
+
+    comparar_com_a_planilha(lido, df)
+    assert str(tabela.schema.field('vagas_reg').type) == 'int32'
+    assert str(tabela.schema.field('curso_vaga').type).startswith('dictionary')
+
+
+def test_formato_desconhecido(df):
+    assert not formato_disponivel('xml')
+    with pytest.raises(ValueError):
+        gerar_exportacao(df, 'xml')
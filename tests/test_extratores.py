@@ -0,0 +1,81 @@
+# Extratores bs4 e lxml: mesma FichaTurma e mesmos registros para as mesmas páginas
+import pytest
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta, montar_registros
+from consultor_uff.extrator_lxml import analisar_turma_lxml
+from servidor_falso import QuadroFalso
+
+OPCOES = [
+    OpcoesConsulta(),
+    OpcoesConsulta(mostrar_outros_cursos=True),
+    OpcoesConsulta(cursos_selecionados=['Química Industrial']),
+    OpcoesConsulta(apenas_cursos_quimica=False),
+]
+
+TABELA_VAGAS = (
+    '<table><tr><th>Curso</th><th>Vagas Reg.</th><th>Vagas Vest.</th><th>Inscritos Reg.</th>'
+    '<th>Inscritos Vest.</th><th>Excedentes</th><th>Candidatos</th></tr>'
+    '<tr><td>028 - Química</td><td>10</td><td>5</td><td>12</td><td>3</td><td>0</td><td>15</td></tr>'
+    '<tr><td>029 - Química Industrial</td><td>8</td><td>2</td><td>4</td><td>2</td><td>1</td><td>6</td></tr>'
+    '<tr><td>015 - Farmácia</td><td>6</td><td>0</td><td>7</td><td>0</td><td>2</td><td>9</td></tr>'
+    '<tr><td>Total</td><td>24</td><td>7</td><td>23</td><td>5</td></tr>'
+    '</table>'
+)
+PAGINAS_LIMITE = {
+    'sem_h1': f'<html><body><h3>Vagas alocadas</h3>{TABELA_VAGAS}</body></html>',
+    'sem_tabela_de_vagas': (
+        '<html><body><h1>Turma A1 de GQI00061 - Química Geral</h1><h3>Horários da turma</h3>'
+        '<table><tr><th>Seg</th><th>Ter</th></tr><tr><td>08:00-10:00</td><td></td></tr></table></body></html>'
+    ),
+    'vagas_sem_titulo': f'<html><body><h1>Turma B1 de GFQ00012 - Físico-Química</h1>{TABELA_VAGAS}</body></html>',
+    'titulo_em_strong': (
+        '<html><body><h1>Turma C1 de GQA00005 - Química Analítica</h1>'
+        f'<div><strong>Vagas alocadas</strong></div><div>{TABELA_VAGAS}</div></body></html>'
+    ),
+    'vazia': '<html><body></body></html>',
+}
+
+
+@pytest.fixture(scope='module')
+def consultores():
+    return {
+        nome: ConsultorQuadroHorariosUFFDetalhado(extrator=nome, cache_http=CacheHTTP(':memory:'))
+        for nome in ('bs4', 'lxml')
+    }
+
+
+def paginas_do_servidor_falso():
+    quadro = QuadroFalso(turmas_por_busca=40, sobreposicao=0.5)
+    ids = quadro.turmas_da_busca('28', '20252') + quadro.turmas_da_busca('29', '20252')
+    return [quadro.pagina_turma(id_turma).encode('utf-8') for id_turma in dict.fromkeys(ids)]
+
+
+@pytest.mark.parametrize('opcoes', OPCOES)
+def test_paginas_do_servidor_falso_dao_o_mesmo_resultado(consultores, opcoes):
+    for pagina in paginas_do_servidor_falso():
+        fichas = {nome: consultor.analisar_pagina_turma(pagina, opcoes) for nome, consultor in consultores.items()}
+        assert fichas['lxml'] == fichas['bs4']
+        assert fichas['bs4'].codigo_disciplina
+        assert (montar_registros(fichas['lxml'], 'url', 'Química', '20252', opcoes=opcoes)
+                == montar_registros(fichas['bs4'], 'url', 'Química', '20252', opcoes=opcoes))
+
+
+@pytest.mark.parametrize('nome', PAGINAS_LIMITE)
+@pytest.mark.parametrize('opcoes', OPCOES)
+def test_paginas_limite_dao_o_mesmo_resultado(consultores, nome, opcoes):
+    pagina = PAGINAS_LIMITE[nome]
+    referencia = consultores['bs4'].analisar_pagina_turma(pagina, opcoes)
+
+    assert analisar_turma_lxml(pagina, opcoes) == referencia
+    assert analisar_turma_lxml(pagina.encode('utf-8'), opcoes) == referencia
+
+
+def test_filtro_de_outros_cursos(consultores):
+    pagina = PAGINAS_LIMITE['vagas_sem_titulo']
+    for consultor in consultores.values():
+        cursos = [vaga['curso'] for vaga in consultor.analisar_pagina_turma(pagina, OpcoesConsulta()).vagas]
+        todos = [vaga['curso'] for vaga in
+                 consultor.analisar_pagina_turma(pagina, OpcoesConsulta(mostrar_outros_cursos=True)).vagas]
+        assert cursos == ['028 - Química', '029 - Química Industrial']
+        assert todos == ['028 - Química', '029 - Química Industrial', '015 - Farmácia']
+    assert consultores['bs4'].analisar_pagina_turma(PAGINAS_LIMITE['sem_tabela_de_vagas'], OpcoesConsulta()).vagas == []
@@ -0,0 +1,49 @@
+# Índices de filtro e ordenação do resultado, comparados aos filtros do pandas
+import numpy as np
+import pytest
+
+from consultor_uff.filtros import FILTROS_VAGAS, ORDENACOES, IndiceResultado
+from consultor_uff.resultados import montar_dataframe_resultado
+
+
+@pytest.fixture
+def df(registros):
+    return montar_dataframe_resultado(registros)
+
+
+def filtrar_com_pandas(df, curso=None, departamento=None, vagas=None):
+    mascara = np.ones(len(df), dtype=bool)
+    if curso is not None:
+        mascara &= (df['curso_vaga'] == curso).to_numpy()
+    if departamento is not None:
+        mascara &= (df['departamento'] == departamento).to_numpy()
+    if vagas is not None:
+        coluna, comparacao = FILTROS_VAGAS[vagas]
+        mascara &= comparacao(df[coluna].to_numpy(), 0)
+    return np.flatnonzero(mascara)
+
+
+@pytest.mark.parametrize('curso', [None, 'Química', '015 - Farmácia', 'Inexistente'])
+@pytest.mark.parametrize('departamento', [None, 'GQI', 'GFQ'])
+@pytest.mark.parametrize('vagas', [None, *FILTROS_VAGAS])
+def test_posicoes_iguais_ao_filtro_do_pandas(df, curso, departamento, vagas):
+    posicoes = IndiceResultado(df).posicoes(curso, departamento, vagas)
+
+    if curso is departamento is vagas is None:
+        assert posicoes is None
+    else:
+        assert posicoes.tolist() == filtrar_com_pandas(df, curso, departamento, vagas).tolist()
+
+
+@pytest.mark.parametrize('ordenacao', ORDENACOES)
+def test_ordenacao_estavel_restrita_aos_filtros(df, ordenacao):
+    indice = IndiceResultado(df)
+    colunas, decrescente = ORDENACOES[ordenacao]
+    posicoes = indice.posicoes(departamento='GQI')
+
+    esperado = df.iloc[posicoes].sort_values(colunas, ascending=not decrescente, kind='stable')
+    obtido = indice.linhas(indice.ordenadas(ordenacao, posicoes, limite=3), colunas=['codigo_disciplina', 'turma'])
+
+    assert obtido.index.tolist() == esperado.index[:3].tolist()
+    assert list(obtido.columns) == ['codigo_disciplina', 'turma']
+    assert indice.linhas(None) is df
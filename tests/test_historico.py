@@ -0,0 +1,44 @@
+# Histórico de consultas: séries por turma e resultados gravados
+import pytest
+
+from consultor_uff import HistoricoVagas
+
+
+@pytest.fixture
+def historico():
+    return HistoricoVagas(':memory:')
+
+
+def test_registros_da_consulta_voltam_como_gravados(historico, registros):
+    consulta_id = historico.registrar(registros, parametros={'origem': 'app', 'periodos': ['20261']})
+
+    assert historico.registros_da_consulta(consulta_id) == registros
+    consulta, = historico.consultas()
+    assert consulta['id'] == consulta_id
+    assert consulta['total_registros'] == len(registros)
+    assert consulta['parametros'] == {'origem': 'app', 'periodos': ['20261']}
+
+
+def test_serie_da_turma_em_ordem_cronologica(historico, registros):
+    registro = registros[0]
+    for momento, inscritos in [(200.0, 7), (100.0, 3), (300.0, 9)]:
+        historico.registrar([dict(registro, inscritos_reg=inscritos)], registrado_em=momento)
+    historico.registrar([registros[2]], registrado_em=150.0)
+
+    serie = historico.serie_turma(registro['periodo'], registro['codigo_disciplina'], registro['turma'],
+                                  campos=['inscritos_reg'])
+
+    assert [(linha['registrado_em'], linha['inscritos_reg']) for linha in serie] == [
+        (100.0, 3), (200.0, 7), (300.0, 9)
+    ]
+    with pytest.raises(ValueError):
+        historico.serie_turma(registro['periodo'], registro['codigo_disciplina'], campos=['senha'])
+
+
+def test_ultima_consulta_filtrada_pelos_parametros(historico, registros):
+    historico.registrar(registros, parametros={'origem': 'coletor', 'tarefa': 'quimica'})
+    ultima_do_coletor = historico.registrar(registros[:2], parametros={'origem': 'coletor', 'tarefa': 'quimica'})
+    historico.registrar(registros[:1], parametros={'origem': 'app'})
+
+    assert historico.ultima_consulta(origem='coletor', tarefa='quimica')['id'] == ultima_do_coletor
+    assert historico.ultima_consulta(origem='cli') is None
@@ -0,0 +1,82 @@
+# Atualização incremental: mesmos registros da consulta completa, reanalisando só as turmas que mudaram
+import json
+
+import pytest
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+OPCOES = OpcoesConsulta(mostrar_outros_cursos=True)
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(30, 20), latencia=0, jitter=0).iniciar_em_thread()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+class ConsultorContandoAnalises(ConsultorQuadroHorariosUFFDetalhado):
+    """Conta as páginas de turma efetivamente analisadas"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.analises = 0
+
+    def analisar_pagina_turma(self, html_content, opcoes=None):
+        self.analises += 1
+        return super().analisar_pagina_turma(html_content, opcoes)
+
+
+def resumo(alteradas, novas, inalteradas):
+    return (f"🔄 {alteradas} turmas mudaram desde a última atualização "
+            f"({novas} novas, {inalteradas} reaproveitadas sem reanálise)")
+
+
+def conjunto(registros):
+    return {json.dumps(registro, sort_keys=True) for registro in registros}
+
+
+@pytest.mark.parametrize('motor', ['sync', 'async'])
+def test_atualizacao_reanalisa_so_as_turmas_alteradas(servidor, monkeypatch, motor):
+    consultor = ConsultorContandoAnalises(base_url=servidor.base_url, motor=motor, cache_http=CacheHTTP(':memory:'),
+                                          requisicoes_por_segundo=1000)
+    mensagens = []
+
+    def atualizar():
+        consultor.analises = 0
+        return consultor.consultar_vagas_completas(['20252'], ['Química', 'Química Industrial'], [None],
+                                                   opcoes=OPCOES, incremental=True,
+                                                   ao_evento=lambda evento: mensagens.append(evento.mensagem))
+
+    fria = atualizar()
+    urls = sorted({registro['url'] for registro in fria})
+    assert consultor.analises == len(urls)
+    assert resumo(0, len(urls), 0) in mensagens
+
+    # Nada mudou: os registros saem das análises guardadas
+    mensagens.clear()
+    assert conjunto(atualizar()) == conjunto(fria)
+    assert consultor.analises == 0
+    assert resumo(0, 0, len(urls)) in mensagens
+
+    # Três turmas mudam no servidor: só elas são reanalisadas
+    alteradas = {url.rsplit('/', 1)[-1] for url in urls[:3]}
+    pagina_turma = servidor.quadro.pagina_turma
+    monkeypatch.setattr(servidor.quadro, 'pagina_turma', lambda id_turma: (
+        pagina_turma(id_turma).replace('- Disciplina', '- Disciplina Revisada') if id_turma in alteradas
+        else pagina_turma(id_turma)
+    ))
+    mensagens.clear()
+    atualizada = atualizar()
+    assert consultor.analises == 3
+    assert resumo(3, 0, len(urls) - 3) in mensagens
+
+    completa = ConsultorQuadroHorariosUFFDetalhado(
+        base_url=servidor.base_url, motor=motor, cache_http=CacheHTTP(':memory:'), requisicoes_por_segundo=1000
+    ).consultar_vagas_completas(['20252'], ['Química', 'Química Industrial'], [None], opcoes=OPCOES,
+                                ao_evento=lambda evento: None)
+    assert conjunto(atualizada) == conjunto(completa)
+    assert conjunto(atualizada) != conjunto(fria)
+    assert {registro['url'] for registro in atualizada if 'Revisada' in registro['nome_disciplina']} == set(urls[:3])
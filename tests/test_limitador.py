@@ -0,0 +1,47 @@
+# Limitador de taxa por host (token bucket)
+import pytest
+
+from consultor_uff import limitador as modulo
+from consultor_uff.limitador import LimitadorTaxa, obter_limitador
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio monotônico controlado pelo teste"""
+    agora = [100.0]
+    monkeypatch.setattr(modulo.time, 'monotonic', lambda: agora[0])
+    return agora
+
+
+def test_rajada_ate_a_capacidade_e_depois_espaca_pela_taxa(relogio):
+    limitador = LimitadorTaxa(taxa=4, capacidade=2)
+
+    assert [limitador.reservar() for _ in range(2)] == [0.0, 0.0]
+    assert limitador.reservar() == pytest.approx(0.25)
+    assert limitador.reservar() == pytest.approx(0.5)
+
+    relogio[0] += 10
+    assert limitador.reservar() == 0.0
+
+
+def test_configurar_muda_a_taxa_sem_perder_tokens(relogio):
+    limitador = LimitadorTaxa(taxa=2, capacidade=4)
+    limitador.reservar()
+
+    limitador.configurar(taxa=10)
+    assert [limitador.reservar() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limitador.reservar() == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        limitador.configurar(taxa=0)
+
+
+def test_taxa_deve_ser_positiva():
+    with pytest.raises(ValueError):
+        LimitadorTaxa(taxa=0)
+
+
+def test_limitador_compartilhado_por_host():
+    primeiro = obter_limitador('teste-limitador.invalid', taxa=3)
+    assert obter_limitador('teste-limitador.invalid', taxa=50) is primeiro
+    assert primeiro.taxa == 3
+    assert obter_limitador('outro-teste-limitador.invalid') is not primeiro
@@ -0,0 +1,95 @@
+# Mapa de turmas da consulta: turma listada por vários cursos é baixada e analisada uma vez
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+from consultor_uff.turma import MapaTurmasConsulta
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+URL = 'https://app.uff.br/graduacao/quadrodehorarios/turmas/1'
+
+
+def test_chamadas_simultaneas_compartilham_a_mesma_analise():
+    mapa = MapaTurmasConsulta()
+    liberar = threading.Event()
+    chamadas = []
+
+    def analisar(url):
+        chamadas.append(url)
+        liberar.wait(5)
+        return object()
+
+    cursos = ['Química', 'Química Industrial', 'Química', 'Farmácia']
+    with ThreadPoolExecutor(max_workers=len(cursos)) as executor:
+        futuros = [executor.submit(mapa.obter, URL, curso, analisar) for curso in cursos]
+        # Todas as chamadas entram no mapa antes de a primeira análise terminar
+        while mapa.buscas + mapa.reaproveitadas < len(cursos):
+            time.sleep(0.01)
+        assert not any(futuro.done() for futuro in futuros)
+        liberar.set()
+        fichas = [futuro.result() for futuro in futuros]
+
+    assert chamadas == [URL]
+    assert all(ficha is fichas[0] for ficha in fichas)
+    assert (mapa.buscas, mapa.reaproveitadas) == (1, 3)
+    assert mapa.cursos_da_url(URL) == ['Química', 'Química Industrial', 'Farmácia']
+
+
+def test_erro_da_analise_chega_a_todos_os_cursos():
+    mapa = MapaTurmasConsulta()
+
+    def analisar(url):
+        raise ValueError(url)
+
+    for curso in ('Química', 'Química Industrial'):
+        with pytest.raises(ValueError):
+            mapa.obter(URL, curso, analisar)
+    assert (mapa.buscas, mapa.reaproveitadas) == (1, 1)
+
+
+def test_obter_async_compartilha_a_mesma_tarefa():
+    mapa = MapaTurmasConsulta()
+    chamadas = []
+
+    async def analisar(url):
+        chamadas.append(url)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def consultar():
+        return await asyncio.gather(*(mapa.obter_async(URL, curso, analisar)
+                                      for curso in ('Química', 'Química Industrial', 'Farmácia')))
+
+    fichas = asyncio.run(consultar())
+
+    assert chamadas == [URL]
+    assert fichas[0] is fichas[1] is fichas[2]
+    assert (mapa.buscas, mapa.reaproveitadas) == (1, 2)
+
+
+@pytest.mark.parametrize('motor', ['sync', 'async'])
+def test_cursos_sobrepostos_baixam_cada_turma_uma_vez(motor):
+    quadro = QuadroFalso(turmas_por_busca=40, por_pagina=20, sobreposicao=0.5)
+    servidor = ServidorQuadroFalso(quadro=quadro, latencia=0, jitter=0).iniciar_em_thread()
+    notas = []
+    try:
+        consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor.base_url, motor=motor,
+                                                        cache_http=CacheHTTP(':memory:'),
+                                                        requisicoes_por_segundo=1000)
+        consultor.consultar_vagas_completas(['20252'], ['Química', 'Química Industrial'], [None],
+                                            opcoes=OpcoesConsulta(mostrar_outros_cursos=True),
+                                            ao_evento=lambda evento: notas.append(evento.mensagem))
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    listadas = quadro.turmas_da_busca('28', '20252') + quadro.turmas_da_busca('29', '20252')
+    distintas = len(set(listadas))
+    assert distintas < len(listadas)
+    assert servidor.contadores['turmas'] == distintas
+    assert (f"♻️ {len(listadas) - distintas} downloads de turma economizados "
+            f"({distintas} páginas de turma baixadas e analisadas uma única vez)") in notas
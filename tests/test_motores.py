@@ -0,0 +1,154 @@
+# Motores síncrono e assíncrono contra o servidor falso do quadro de horários
+import json
+import threading
+
+import pytest
+
+from consultor_uff import AjustesConsulta, CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+from consultor_uff.cli import exibir_evento
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+OPCOES = OpcoesConsulta(mostrar_outros_cursos=True)
+
+
+@pytest.fixture
+def servidor_lento():
+    # 60 turmas + 3 listagens a 10 req/s: a fila passa de taxa × timeout_tarefa (3 s)
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(60, 20), latencia=0.01, jitter=0).iniciar_em_thread()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def consultar(servidor, motor, **parametros):
+    consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor.base_url, motor=motor,
+                                                    cache_http=CacheHTTP(':memory:'), **parametros)
+    avisos = []
+    registros = consultor.consultar_vagas_completas(
+        ['20252'], ['Química'], [None], opcoes=OPCOES,
+        ao_evento=lambda evento: avisos.append(evento.mensagem) if evento.tipo == 'aviso' else None
+    )
+    return {json.dumps(registro, sort_keys=True) for registro in registros}, avisos
+
+
+def test_fila_maior_que_taxa_vezes_timeout_nao_perde_turmas(servidor_lento):
+    sincrono, _ = consultar(servidor_lento, 'sync', requisicoes_por_segundo=10)
+    assincrono, avisos = consultar(servidor_lento, 'async', requisicoes_por_segundo=10, timeout_tarefa=3)
+
+    assert len({json.loads(registro)['url'] for registro in sincrono}) == 60
+    assert assincrono == sincrono
+    assert not avisos
+
+
+def test_ajustes_por_consulta_nao_alteram_o_consultor_compartilhado(servidor_lento):
+    consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor_lento.base_url, cache_http=CacheHTTP(':memory:'),
+                                                    requisicoes_por_segundo=1000)
+    semaforo = consultor._requisicoes
+
+    def consultar_sem_cache(ajustes=None):
+        consultor.cache.limpar()
+        registros = consultor.consultar_vagas_completas(['20252'], ['Química'], [None], opcoes=OPCOES,
+                                                        ao_evento=lambda evento: None, ajustes=ajustes)
+        return {json.dumps(registro, sort_keys=True) for registro in registros}
+
+    referencia = consultar_sem_cache()
+    ajustes = AjustesConsulta(max_concorrencia=2, periodos_paralelos=1, processos_analise=1, timeout_tarefa=5)
+    try:
+        assert consultar_sem_cache(ajustes) == referencia
+        assert consultar_sem_cache(AjustesConsulta(processos_analise=0)) == referencia
+        # O pool de um número de processos sobrevive às consultas com outros ajustes
+        pool = consultor._pools_analise[1]
+        assert consultar_sem_cache(ajustes) == referencia
+        assert consultor._pools_analise == {1: pool}
+    finally:
+        consultor.encerrar_pool_analise()
+
+    assert consultor.ajustes == AjustesConsulta()
+    assert consultor._requisicoes is semaforo
+    assert (consultor.max_concorrencia, consultor.processos_analise, consultor.timeout_tarefa) == (6, 0, 60)
+
+
+def test_com_ajustes_compartilha_sessao_cache_e_limitador():
+    consultor = ConsultorQuadroHorariosUFFDetalhado(cache_http=CacheHTTP(':memory:'))
+    ajustado = consultor.com_ajustes(AjustesConsulta(max_concorrencia=2))
+
+    assert consultor.com_ajustes(AjustesConsulta()) is consultor
+    assert ajustado.session is consultor.session
+    assert ajustado.cache is consultor.cache
+    assert ajustado.limitador is consultor.limitador
+    assert ajustado._pools_analise is consultor._pools_analise
+    assert ajustado._requisicoes is not consultor._requisicoes
+    assert ajustado._requisicoes._value == 2
+    assert consultor._requisicoes._value == 6
+    assert AjustesConsulta(max_concorrencia=0, processos_analise=-1).max_concorrencia == 1
+
+
+@pytest.mark.parametrize('motor', ['sync', 'async'])
+def test_registros_parciais_seguem_a_precedencia_do_resultado_final(motor):
+    # Metade das turmas aparece nas buscas dos dois cursos; vale a da primeira busca
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(40, 10, sobreposicao=0.5), latencia=0.02,
+                                   jitter=0.02).iniciar_em_thread()
+    try:
+        consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor.base_url, motor=motor,
+                                                        cache_http=CacheHTTP(':memory:'),
+                                                        requisicoes_por_segundo=1000)
+        parciais = []
+        registros = consultor.consultar_vagas_completas(
+            ['20252'], ['Química Industrial', 'Química'], [None], opcoes=OPCOES,
+            ao_evento=lambda evento: parciais.extend(evento.registros) if evento.tipo == 'registros' else None
+        )
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    assert {registro['curso_origem_busca'] for registro in registros} == {'Química Industrial', 'Química'}
+    assert len(parciais) == len(registros)
+    assert ({json.dumps(registro, sort_keys=True) for registro in parciais}
+            == {json.dumps(registro, sort_keys=True) for registro in registros})
+
+
+@pytest.mark.parametrize('periodos', [['20252'], ['20251', '20252']])
+def test_motores_mostram_as_mesmas_linhas_na_linha_de_comando(servidor_lento, periodos, capsys):
+    def linhas(motor):
+        consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor_lento.base_url, motor=motor,
+                                                        cache_http=CacheHTTP(':memory:'),
+                                                        requisicoes_por_segundo=1000)
+        consultor.consultar_vagas_completas(periodos, ['Química', 'Química Industrial'], [None], opcoes=OPCOES,
+                                           ao_evento=exibir_evento)
+        return sorted(capsys.readouterr().err.splitlines())
+
+    assert linhas('async') == linhas('sync')
+
+
+class CacheRegistrandoThreads(CacheHTTP):
+    """CacheHTTP que anota em que thread cada leitura ou gravação de página/análise foi feita"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = []
+
+    def _anotar(metodo):
+        def anotado(self, *args, **kwargs):
+            self.threads.append((metodo.__name__, threading.current_thread()))
+            return metodo(self, *args, **kwargs)
+        return anotado
+
+    obter = _anotar(CacheHTTP.obter)
+    salvar = _anotar(CacheHTTP.salvar)
+    renovar = _anotar(CacheHTTP.renovar)
+    obter_analise = _anotar(CacheHTTP.obter_analise)
+    salvar_analise = _anotar(CacheHTTP.salvar_analise)
+
+
+def test_motor_async_nao_acessa_o_sqlite_no_loop_de_eventos(servidor_lento):
+    cache = CacheRegistrandoThreads(':memory:', ttl_listagem=0, ttl_turma=0)
+    consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor_lento.base_url, motor='async', cache_http=cache,
+                                                    requisicoes_por_segundo=1000)
+    for incremental in (False, True, True):
+        consultor.consultar_vagas_completas(['20252'], ['Química'], [None], opcoes=OPCOES, incremental=incremental,
+                                           ao_evento=lambda evento: None)
+
+    # asyncio.run executa o loop na thread principal
+    assert {metodo for metodo, _ in cache.threads} == {'obter', 'salvar', 'renovar', 'obter_analise',
+                                                         'salvar_analise'}
+    assert all(thread is not threading.main_thread() for _, thread in cache.threads)
@@ -0,0 +1,92 @@
+# Paginação das buscas: número da última página lido da ul.pagination e páginas agendadas a partir dele
+import pytest
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+from consultor_uff.paginacao import paginas_a_agendar, url_pagina
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+LINHA_TURMA = '<tr><td>GQI00061</td><td><a href="/graduacao/quadrodehorarios/turmas/{0}">Turma {0}</a></td></tr>'
+
+
+def pagina_de_busca(paginacao, turmas=('1', '2')):
+    linhas = ''.join(LINHA_TURMA.format(id_turma) for id_turma in turmas)
+    return f'<html><body><table class="table"><tbody>{linhas}</tbody></table>{paginacao}</body></html>'
+
+
+@pytest.fixture(scope='module')
+def consultor():
+    return ConsultorQuadroHorariosUFFDetalhado(cache_http=CacheHTTP(':memory:'))
+
+
+def test_url_pagina():
+    assert url_pagina('https://quadro/?q=1', 1) == 'https://quadro/?q=1'
+    assert url_pagina('https://quadro/?q=1', 3) == 'https://quadro/?q=1&page=3'
+
+
+def test_pagina_unica_sem_paginacao(consultor):
+    links, tem_proxima, ultima = consultor.analisar_pagina_listagem(pagina_de_busca(''))
+
+    assert sorted(links) == [f"https://app.uff.br/graduacao/quadrodehorarios/turmas/{i}" for i in '12']
+    assert (tem_proxima, ultima) == (False, None)
+    assert list(paginas_a_agendar(1, 1, bool(links), tem_proxima, ultima)) == []
+
+
+def test_busca_sem_resultados_nao_agenda_paginas(consultor):
+    links, tem_proxima, ultima = consultor.analisar_pagina_listagem(pagina_de_busca('', turmas=()))
+
+    assert links == []
+    assert list(paginas_a_agendar(1, 1, bool(links), tem_proxima, ultima)) == []
+
+
+@pytest.mark.parametrize('pagina, ultima, reticencias', [(1, 10, True), (5, 10, True), (10, 10, True), (2, 2, False)])
+def test_janela_do_will_paginate_com_reticencias(consultor, pagina, ultima, reticencias):
+    html = pagina_de_busca(QuadroFalso._paginacao(pagina, ultima))
+    assert ('&hellip;' in html) == reticencias
+
+    links, tem_proxima, anunciada = consultor.analisar_pagina_listagem(html)
+
+    assert anunciada == ultima
+    assert tem_proxima == (pagina < ultima)
+
+
+def test_primeira_pagina_agenda_ate_a_ultima_anunciada(consultor):
+    _, tem_proxima, ultima = consultor.analisar_pagina_listagem(pagina_de_busca(QuadroFalso._paginacao(1, 10)))
+
+    assert list(paginas_a_agendar(1, 1, True, tem_proxima, ultima)) == list(range(2, 11))
+    # Páginas já agendadas não estendem o plano, nem a última
+    assert list(paginas_a_agendar(4, 10, True, True, 10)) == []
+    assert list(paginas_a_agendar(10, 10, True, False, 10)) == []
+
+
+def test_so_li_next_avanca_uma_pagina_por_vez(consultor):
+    proxima = '<ul class="pagination"><li class="next"><a rel="next" href="#">Próxima &rarr;</a></li></ul>'
+    fim = '<ul class="pagination"><li class="next disabled"><a href="#">Próxima &rarr;</a></li></ul>'
+
+    _, tem_proxima, ultima = consultor.analisar_pagina_listagem(pagina_de_busca(proxima))
+    assert (tem_proxima, ultima) == (True, None)
+    assert list(paginas_a_agendar(1, 1, True, tem_proxima, ultima)) == [2]
+    assert list(paginas_a_agendar(2, 2, True, tem_proxima, ultima)) == [3]
+
+    _, tem_proxima, ultima = consultor.analisar_pagina_listagem(pagina_de_busca(fim))
+    assert (tem_proxima, ultima) == (False, None)
+    assert list(paginas_a_agendar(3, 3, True, tem_proxima, ultima)) == []
+
+
+@pytest.mark.parametrize('motor', ['sync', 'async'])
+def test_cada_pagina_da_busca_e_baixada_uma_vez(motor):
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(turmas_por_busca=190, por_pagina=20), latencia=0,
+                                   jitter=0).iniciar_em_thread()
+    try:
+        consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor.base_url, motor=motor,
+                                                        cache_http=CacheHTTP(':memory:'),
+                                                        requisicoes_por_segundo=1000)
+        registros = consultor.consultar_vagas_completas(['20252'], ['Química'], [None],
+                                                        opcoes=OpcoesConsulta(mostrar_outros_cursos=True),
+                                                        ao_evento=lambda evento: None)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    assert servidor.contadores['listagens'] == 10
+    assert servidor.contadores['turmas'] == 190
+    assert len({registro['url'] for registro in registros}) == 190
@@ -0,0 +1,84 @@
+# Intervalos de períodos: virada de ano, ordem invertida, limite de tamanho e consulta paralela por período
+import json
+
+import pytest
+
+from consultor_uff import CacheHTTP, ConsultorQuadroHorariosUFFDetalhado, OpcoesConsulta
+from consultor_uff.cli import expandir_periodos, main
+from consultor_uff.validacao import MAX_PERIODOS_INTERVALO, descrever_periodos, intervalo_periodos
+from servidor_falso import QuadroFalso, ServidorQuadroFalso
+
+PERIODOS = ['20242', '20251', '20252']
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorQuadroFalso(quadro=QuadroFalso(30, 20), latencia=0, jitter=0).iniciar_em_thread()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_intervalo_atravessa_a_virada_do_ano():
+    assert intervalo_periodos('2024.2', '2025.1') == ['2024.2', '2025.1']
+    assert intervalo_periodos('2022.1', '2026.1') == [
+        '2022.1', '2022.2', '2023.1', '2023.2', '2024.1', '2024.2', '2025.1', '2025.2', '2026.1'
+    ]
+    assert intervalo_periodos('2025.1', '2025.1') == ['2025.1']
+    assert expandir_periodos('2024.2-2025.1') == ['20242', '20251']
+
+
+def test_intervalo_invertido_sai_em_ordem_cronologica():
+    assert intervalo_periodos('2025.1', '2024.1') == ['2024.1', '2024.2', '2025.1']
+    assert expandir_periodos('20252-20242') == PERIODOS
+
+
+def test_periodo_invalido_da_intervalo_vazio():
+    assert intervalo_periodos('2024.3', '2025.1') == []
+    assert intervalo_periodos('2024.1', '20251') == []
+    assert expandir_periodos('2024.1-2025.3') is None
+
+
+def test_descrever_periodos():
+    assert descrever_periodos([]) == 'N/A'
+    assert descrever_periodos(['20252']) == '2025.2'
+    assert descrever_periodos(['20242', '20251']) == '2024.2, 2025.1'
+    assert descrever_periodos(PERIODOS) == '2024.2 a 2025.2'
+    assert descrever_periodos(['2024.1', '2025.1', '2025.2']) == '2024.1, 2025.1, 2025.2'
+    assert descrever_periodos(list(reversed(PERIODOS))) == '2025.2, 2025.1, 2024.2'
+
+
+def test_cli_recusa_intervalo_acima_do_maximo(capsys):
+    assert len(intervalo_periodos('2016.1', '2025.2')) == MAX_PERIODOS_INTERVALO
+    assert len(intervalo_periodos('2015.2', '2025.2')) == MAX_PERIODOS_INTERVALO + 1
+
+    with pytest.raises(SystemExit) as saida:
+        main(['2015.2-2025.2', '--sem-cache', '-q'])
+
+    assert saida.value.code == 2
+    assert f"máximo {MAX_PERIODOS_INTERVALO}" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('motor', ['sync', 'async'])
+def test_periodos_em_paralelo_igual_a_um_periodo_por_vez(servidor, motor):
+    def consultar(periodos, periodos_paralelos):
+        consultor = ConsultorQuadroHorariosUFFDetalhado(base_url=servidor.base_url, motor=motor,
+                                                        cache_http=CacheHTTP(':memory:'),
+                                                        requisicoes_por_segundo=1000,
+                                                        periodos_paralelos=periodos_paralelos)
+        return consultor.consultar_vagas_completas(periodos, ['Química', 'Química Industrial'], [None],
+                                                   opcoes=OpcoesConsulta(mostrar_outros_cursos=True),
+                                                   ao_evento=lambda evento: None)
+
+    paralelos = consultar(PERIODOS, periodos_paralelos=4)
+    um_por_vez = [consultar([periodo], periodos_paralelos=1) for periodo in PERIODOS]
+
+    def conjunto(registros):
+        return {json.dumps(registro, sort_keys=True) for registro in registros}
+
+    assert len(paralelos) == sum(len(registros) for registros in um_por_vez)
+    assert conjunto(paralelos) == set().union(*(conjunto(registros) for registros in um_por_vez))
+    # Os registros seguem a ordem dos períodos, cada período num bloco
+    ordem = [registro['periodo'] for registro in paralelos]
+    assert list(dict.fromkeys(ordem)) == PERIODOS
+    assert ordem == sorted(ordem, key=PERIODOS.index)
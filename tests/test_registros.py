@@ -0,0 +1,14 @@
+# Deduplicação dos registros de turma
+from consultor_uff.registros import RegistrosTurmas, chave_registro
+
+
+def test_primeiro_registro_de_cada_chave_prevalece(registros):
+    repetido = dict(registros[0], curso_origem_busca='Química Industrial', vagas_reg=99)
+    turmas = RegistrosTurmas(registros[:3])
+
+    assert not turmas.adicionar(repetido)
+    assert repetido in turmas
+    assert turmas.adicionar_varios(registros) == len(registros) - 3
+    assert turmas.como_lista() == registros
+    assert [chave_registro(registro) for registro in turmas] == [chave_registro(registro) for registro in registros]
+
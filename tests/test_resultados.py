@@ -0,0 +1,36 @@
+# Tabela de resultados acumulada em colunas tipadas
+import numpy as np
+import pandas as pd
+
+from consultor_uff.resultados import RegistrosColunares, montar_dataframe_resultado
+
+
+def test_colunas_iguais_as_do_dataframe_de_dicts(registros):
+    df = montar_dataframe_resultado(registros)
+    referencia = pd.DataFrame(registros)
+
+    assert list(df.columns) == list(referencia.columns)
+    for coluna in df.columns:
+        assert df[coluna].astype(object).tolist() == referencia[coluna].tolist(), coluna
+    assert df['vagas_reg'].dtype == np.int32
+    assert isinstance(df['curso_vaga'].dtype, pd.CategoricalDtype)
+    assert list(df['curso_vaga'].cat.categories) == sorted(set(referencia['curso_vaga']))
+
+
+def test_acumular_aos_lotes_da_o_mesmo_resultado(registros):
+    colunares = RegistrosColunares()
+    for inicio in range(0, len(registros), 5):
+        colunares.adicionar_varios(registros[inicio:inicio + 5])
+
+    assert len(colunares) == len(registros)
+    pd.testing.assert_frame_equal(montar_dataframe_resultado(colunares), montar_dataframe_resultado(registros))
+
+
+def test_contagens_invalidas_viram_zero_e_derivadas_sao_recalculadas(registros):
+    registro = dict(registros[1], inscritos_reg=None, inscritos_vest='x', total_inscritos=1000)
+    df = montar_dataframe_resultado([registro])
+
+    assert df.loc[0, 'inscritos_reg'] == 0
+    assert df.loc[0, 'inscritos_vest'] == 0
+    assert df.loc[0, 'total_inscritos'] == 0
+    assert df.loc[0, 'vagas_disponiveis_reg'] == registro['vagas_reg']